@@ -0,0 +1,100 @@
+# Indeks agregat jarak per tanggal (Fenwick tree / binary indexed tree).
+# Kunci = ordinal tanggal, sehingga total 7/28/365 hari, bulan berjalan dan rentang bebas
+# dijawab dalam O(log n) tanpa membaca ulang riwayat.
+from array import array
+from datetime import date, timedelta
+
+
+def ke_tanggal(t):
+    if isinstance(t, date):
+        return t
+    return date.fromisoformat(t)
+
+
+class IndeksJarak:
+    def __init__(self, data=()):
+        # data: iterable (tanggal, total_km) - biasanya dari tabel total harian
+        self.awal = None  # ordinal tanggal di posisi 0
+        self.nilai = array("d")  # total per hari (mentah), untuk membangun ulang pohon
+        self.pohon = array("d", [0.0])
+        data = [(ke_tanggal(t).toordinal(), km) for t, km in data]
+        if data:
+            lo, hi = min(o for o, _ in data), max(o for o, _ in data)
+            self.awal = lo
+            self.nilai = array("d", bytes(8 * (hi - lo + 1)))
+            for o, km in data:
+                self.nilai[o - lo] += km
+            self._bangun(len(self.nilai))
+
+    @classmethod
+    def dari_array(cls, awal, nilai, pohon):
+        # Dari snapshot: pohon sudah jadi, tidak perlu dibangun ulang
+        indeks = cls()
+        indeks.awal, indeks.nilai, indeks.pohon = awal, nilai, pohon
+        return indeks
+
+    def _bangun(self, kapasitas):
+        # Bangun pohon dari nilai mentah dalam O(n)
+        n = len(self.nilai)
+        if kapasitas > n:
+            self.nilai.extend(array("d", bytes(8 * (kapasitas - n))))
+        n = len(self.nilai)
+        pohon = array("d", [0.0]) + self.nilai
+        for i in range(1, n + 1):
+            j = i + (i & -i)
+            if j <= n:
+                pohon[j] += pohon[i]
+        self.pohon = pohon
+
+    def tambah(self, tanggal, km):
+        o = ke_tanggal(tanggal).toordinal()
+        if self.awal is None:
+            self.awal = o
+        if o < self.awal:
+            # Tanggal lebih lama dari data pertama: geser basis lalu bangun ulang
+            geser = self.awal - o
+            self.nilai = array("d", bytes(8 * geser)) + self.nilai
+            self.awal = o
+            self._bangun(len(self.nilai))
+        i = o - self.awal
+        if i >= len(self.nilai):
+            # Kapasitas digandakan agar penambahan hari baru tetap amortized O(log n)
+            self._bangun(max(i + 1, 2 * len(self.nilai), 64))
+        self.nilai[i] += km
+        i += 1
+        n = len(self.pohon) - 1
+        while i <= n:
+            self.pohon[i] += km
+            i += i & -i
+
+    def _prefix(self, i):
+        # Jumlah nilai[0..i-1]
+        s = 0.0
+        i = min(i, len(self.pohon) - 1)
+        while i > 0:
+            s += self.pohon[i]
+            i -= i & -i
+        return s
+
+    def jumlah(self, dari, sampai):
+        # Total jarak pada rentang tanggal [dari, sampai], inklusif
+        if self.awal is None:
+            return 0.0
+        a = max(ke_tanggal(dari).toordinal() - self.awal, 0)
+        b = ke_tanggal(sampai).toordinal() - self.awal + 1
+        if b <= a:
+            return 0.0
+        return self._prefix(b) - self._prefix(a)
+
+    def rolling(self, hari, sampai=None):
+        # Total `hari` hari terakhir sampai tanggal `sampai` (default hari ini)
+        sampai = ke_tanggal(sampai or date.today())
+        return self.jumlah(sampai - timedelta(days=hari - 1), sampai)
+
+    def bulan_berjalan(self, sampai=None):
+        sampai = ke_tanggal(sampai or date.today())
+        return self.jumlah(sampai.replace(day=1), sampai)
+
+    def tahun_berjalan(self, sampai=None):
+        sampai = ke_tanggal(sampai or date.today())
+        return self.jumlah(sampai.replace(month=1, day=1), sampai)
@@ -0,0 +1,252 @@
+# Mesin analisis lari tanpa Tk.
+# Dipakai oleh RunningApp.analyze (satu lari) dan oleh CLI batch (jutaan baris sekaligus).
+import argparse
+import csv
+import math
+import os
+import sys
+import time
+from array import array
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:  # numpy opsional, fallback ke modul array bawaan
+    np = None
+
+FAKTOR_KALORI = 1.036
+KOLOM_INPUT = ["tanggal", "jarak", "waktu", "berat", "target"]
+
+
+def validasi(jarak, waktu, berat, target=None):
+    # Lempar ValueError jika input tidak valid, sama seperti aturan di tab Input
+    j, w, b = float(jarak), float(waktu), float(berat)
+    t = float(target) if target is not None and str(target).strip() else None
+    if not all(map(math.isfinite, (j, w, b) if t is None else (j, w, b, t))):
+        raise ValueError("input harus berupa angka (bukan nan/inf)")
+    if min(j, w, b) <= 0:
+        raise ValueError("jarak, waktu dan berat harus > 0")
+    if t is not None and t <= 0:
+        raise ValueError("target harus > 0")
+    return j, w, b, t
+
+
+def pilih_target(target, target_tersimpan, target_terakhir):
+    # Aturan target harian (GUI dan server): target yang diisi berlaku dan disimpan untuk hari itu;
+    # jika kosong, pakai target yang sudah tersimpan hari itu, lalu target terakhir (ikut disimpan).
+    # -> (target berlaku, target yang perlu disimpan untuk hari itu atau None)
+    if target is not None:
+        return target, target
+    if target_tersimpan is not None:
+        return target_tersimpan, None
+    if target_terakhir:
+        return target_terakhir, target_terakhir
+    return 0, None
+
+
+def hitung(jarak, waktu, berat):
+    # Pace (menit/km), kecepatan (km/jam), kalori untuk satu lari
+    return waktu / jarak, (jarak / waktu) * 60, jarak * berat * FAKTOR_KALORI
+
+
+def progres(total, target):
+    # Sisa jarak dan persentase capaian target harian
+    sisa = target - total
+    persen = (total / target) * 100 if target > 0 else 0
+    return sisa, persen
+
+
+def _kolom(nilai):
+    if np is not None:
+        return np.asarray(nilai, dtype=np.float64)
+    return nilai if isinstance(nilai, array) else array("d", nilai)
+
+
+def hitung_batch(jarak, waktu, berat):
+    # Versi kolom dari hitung(): semua lari dihitung dalam satu lintasan
+    j, w, b = _kolom(jarak), _kolom(waktu), _kolom(berat)
+    if np is not None:
+        return {"pace": w / j, "speed": (j / w) * 60, "kal": j * b * FAKTOR_KALORI}
+    return {
+        "pace": array("d", [y / x for x, y in zip(j, w)]),
+        "speed": array("d", [(x / y) * 60 for x, y in zip(j, w)]),
+        "kal": array("d", [x * z * FAKTOR_KALORI for x, z in zip(j, b)]),
+    }
+
+
+def isi_target(target):
+    # Target kosong (0/NaN) memakai target terakhir yang diisi, seperti di GUI
+    if np is not None:
+        t = np.asarray(target, dtype=np.float64)
+        ada = np.nan_to_num(t) > 0
+        idx = np.where(ada, np.arange(len(t)), -1)
+        np.maximum.accumulate(idx, out=idx)
+        return np.where(idx >= 0, t[idx], 0.0)
+    hasil, terakhir = array("d"), 0.0
+    for x in target:
+        if x == x and x > 0:
+            terakhir = x
+        hasil.append(terakhir)
+    return hasil
+
+
+def total_harian(tanggal, jarak, target=None):
+    # Kelompokkan per tanggal: total jarak, target hari itu, sisa dan persentase
+    if target is None:
+        target = [0.0] * len(jarak)
+    target = isi_target(target)
+    if np is not None:
+        hari, inv = np.unique(np.asarray(tanggal), return_inverse=True)
+        total = np.bincount(inv, weights=_kolom(jarak), minlength=len(hari))
+        tgt = np.zeros(len(hari))
+        tgt[inv] = target  # indeks berulang: nilai terakhir per hari yang menang
+        persen = np.divide(total * 100, tgt, out=np.zeros_like(total), where=tgt > 0)
+        return {"tanggal": hari, "total": total, "target": tgt,
+                "sisa": tgt - total, "persen": persen}
+    per_hari = {}
+    for tgl, x, t in zip(tanggal, jarak, target):
+        total, _ = per_hari.get(tgl, (0.0, 0.0))
+        per_hari[tgl] = (total + x, t)
+    hari = sorted(per_hari)
+    total = array("d", [per_hari[h][0] for h in hari])
+    tgt = array("d", [per_hari[h][1] for h in hari])
+    pr = [progres(x, t) for x, t in zip(total, tgt)]
+    return {"tanggal": hari, "total": total, "target": tgt,
+            "sisa": array("d", [p[0] for p in pr]),
+            "persen": array("d", [p[1] for p in pr])}
+
+
+def _indeks_kolom(header):
+    header = [h.strip().lower() for h in header]
+    try:
+        idx = [header.index(k) for k in KOLOM_INPUT[:4]]
+    except ValueError:
+        raise ValueError(f"header CSV harus memuat {', '.join(KOLOM_INPUT[:4])}")
+    return idx + [header.index("target") if "target" in header else None]
+
+
+def _target_baris(teks):
+    # Target kosong atau 0 di CSV berarti "tanpa target": isi_target memakai target terakhir
+    if teks is None or not teks.strip() or float(teks) == 0:
+        return None
+    return teks
+
+
+def _baca_baris(reader, idx):
+    it, ij, iw, ib, itg = idx
+    tanggal, jarak, waktu, berat, target = [], array("d"), array("d"), array("d"), array("d")
+    dilewati = 0
+    for row in reader:
+        try:
+            t = _target_baris(row[itg]) if itg is not None and itg < len(row) else None
+            j, w, b, t = validasi(row[ij], row[iw], row[ib], t)
+            tgl = date.fromisoformat(row[it].strip()).isoformat()
+        except (ValueError, IndexError):
+            dilewati += 1
+            continue
+        tanggal.append(tgl)
+        jarak.append(j)
+        waktu.append(w)
+        berat.append(b)
+        target.append(t or 0.0)
+    return {"tanggal": tanggal, "jarak": jarak, "waktu": waktu,
+            "berat": berat, "target": target}, dilewati
+
+
+def baca_csv(path):
+    # CSV dengan header: tanggal,jarak,waktu,berat[,target]; tanggal YYYY-MM-DD
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        return _baca_baris(reader, _indeks_kolom(next(reader)))
+
+
+def potong_csv(path, n):
+    # Bagi isi CSV (tanpa header) menjadi n rentang byte yang berakhir di batas baris
+    ukuran = os.path.getsize(path)
+    with open(path, "rb") as f:
+        header = next(csv.reader([f.readline().decode("utf-8")]))
+        batas = [f.tell()]
+        for i in range(1, n):
+            f.seek(max(batas[0] + (ukuran - batas[0]) * i // n, batas[-1]))
+            f.readline()
+            batas.append(min(f.tell(), ukuran))
+    batas.append(ukuran)
+    return header, [(a, b) for a, b in zip(batas, batas[1:]) if b > a]
+
+
+def analisis_potongan(path, header, awal, akhir):
+    # Baca dan hitung satu rentang byte CSV; dijalankan di process pool
+    with open(path, "rb") as f:
+        f.seek(awal)
+        baris = f.read(akhir - awal).decode("utf-8").splitlines()
+    data, dilewati = _baca_baris(csv.reader(baris), _indeks_kolom(header))
+    return data, hitung_batch(data["jarak"], data["waktu"], data["berat"]), dilewati
+
+
+def gabung(bagian):
+    # Sambungkan kolom dari beberapa potongan (urutan dipertahankan)
+    hasil = {}
+    for k in bagian[0]:
+        kolom = [b[k] for b in bagian]
+        if np is not None and isinstance(kolom[0], np.ndarray):
+            hasil[k] = np.concatenate(kolom)
+        else:
+            hasil[k] = kolom[0][:0]
+            for x in kolom:
+                hasil[k].extend(x)
+    return hasil
+
+
+def tulis_csv(path, kolom, urutan):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(urutan)
+        # tolist() jauh lebih cepat daripada iterasi skalar numpy satu per satu
+        w.writerows(zip(*(kolom[k].tolist() if hasattr(kolom[k], "tolist") else kolom[k]
+                          for k in urutan)))
+
+
+def simpan_db(path, data, hasil, harian):
+    from penyimpanan import RiwayatDB
+    db = RiwayatDB(path)
+    target = isi_target(data["target"])
+    kolom = [data["tanggal"], data["jarak"], data["waktu"],
+             hasil["pace"], hasil["speed"], hasil["kal"], target]
+    kolom = [k.tolist() if hasattr(k, "tolist") else k for k in kolom]
+    tg, j, w, p, s, k, t = kolom
+    db.tambah_banyak(
+        zip(tg, ["00:00"] * len(j), j, w, p, s, k, t),
+        ((h, x) for h, x in zip(list(harian["tanggal"]), harian["target"].tolist()) if x > 0))
+    db.close()
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Analisis batch data lari (pace, kecepatan, kalori, progres harian)")
+    p.add_argument("input", help="CSV dengan kolom tanggal,jarak,waktu,berat[,target]")
+    p.add_argument("-o", "--output", help="CSV hasil per lari")
+    p.add_argument("--harian", help="CSV ringkasan per tanggal")
+    p.add_argument("--db", help="simpan hasil ke database riwayat (SQLite) dalam satu transaksi")
+    args = p.parse_args(argv)
+
+    mulai = time.perf_counter()
+    data, dilewati = baca_csv(args.input)
+    hasil = hitung_batch(data["jarak"], data["waktu"], data["berat"])
+    harian = total_harian(data["tanggal"], data["jarak"], data["target"])
+    durasi = time.perf_counter() - mulai
+
+    if args.output:
+        tulis_csv(args.output, {**data, **hasil},
+                  ["tanggal", "jarak", "waktu", "berat", "pace", "speed", "kal"])
+    if args.harian:
+        tulis_csv(args.harian, harian, ["tanggal", "total", "target", "sisa", "persen"])
+    if args.db:
+        simpan_db(args.db, data, hasil, harian)
+
+    n = len(data["jarak"])
+    print(f"{n} lari, {len(harian['tanggal'])} hari dianalisis dalam {durasi:.2f} detik"
+          f" ({dilewati} baris tidak valid dilewati)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
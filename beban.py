@@ -0,0 +1,131 @@
+# Model beban latihan inkremental: ATL (beban akut, 7 hari), CTL (beban kronis, 42 hari)
+# dan TSB (form = CTL - ATL) per atlet, sebagai rata-rata bergerak eksponensial.
+# Setiap lari memperbarui status dalam O(1); status disimpan sebagai checkpoint sehingga saat
+# startup hanya lari setelah checkpoint yang perlu diputar ulang.
+import math
+from datetime import date
+
+from agregat import ke_tanggal
+
+HARI_ATL = 7
+HARI_CTL = 42
+PACE_AMBANG = 5.5  # menit/km, pace ambang laktat acuan untuk faktor intensitas
+
+K_ATL = math.exp(-1 / HARI_ATL)
+K_CTL = math.exp(-1 / HARI_CTL)
+
+# Template minggu: (latihan, tipe, porsi beban mingguan, faktor intensitas)
+TEMPLATE = [
+    ("Lari Ringan", "Pemanasan", 0.15, 0.75),
+    ("Interval Run", "Kecepatan", 0.20, 1.00),
+    ("Recovery", "Pemulihan", 0.08, 0.65),
+    ("Long Run", "Daya tahan", 0.30, 0.80),
+    ("Cross Training", "Variasi", 0.10, 0.70),
+    ("Tempo Run", "Konsistensi", 0.17, 0.90),
+    ("Rest Day", "Pemulihan total", 0.0, 0.0),
+]
+
+# Jadwal awal saat riwayat belum cukup untuk membaca beban (CTL kecil)
+JADWAL_DASAR = [
+    ("Lari Ringan", "30 menit", "Pemanasan"),
+    ("Interval Run", "45 menit", "Kecepatan"),
+    ("Recovery", "20 menit", "Pemulihan"),
+    ("Long Run", "60 menit", "Daya tahan"),
+    ("Cross Training", "40 menit", "Variasi"),
+    ("Tempo Run", "50 menit", "Konsistensi"),
+    ("Rest Day", "-", "Pemulihan total")
+]
+
+CTL_MINIMUM = 5.0
+
+
+def skor_beban(waktu, pace):
+    # Mirip rTSS: 100 poin = satu jam di pace ambang
+    faktor = PACE_AMBANG / pace
+    return (waktu / 60) * faktor * faktor * 100
+
+
+def kondisi(tsb):
+    # (label, faktor beban minggu depan)
+    if tsb < -25:
+        return "Kelelahan", 0.7
+    if tsb < -10:
+        return "Latihan berat", 0.9
+    if tsb <= 5:
+        return "Optimal", 1.05
+    return "Segar", 1.1
+
+
+class ModelBeban:
+    def __init__(self, atlet=None, id_terakhir=0):
+        # atlet -> [ordinal tanggal terakhir, atl, ctl]
+        self.atlet = atlet or {}
+        self.id_terakhir = id_terakhir
+
+    @classmethod
+    def dari_dict(cls, d):
+        if not d:
+            return cls()
+        return cls({k: list(v) for k, v in d["atlet"].items()}, d["id_terakhir"])
+
+    def ke_dict(self):
+        return {"atlet": self.atlet, "id_terakhir": self.id_terakhir}
+
+    def tambah(self, atlet, tanggal, waktu, pace, id_lari=None):
+        # O(1): luruhkan status ke tanggal lari lalu tambahkan bebannya.
+        # Lari yang lebih lama dari status (impor mundur) diluruhkan ke tanggal status.
+        o = ke_tanggal(tanggal).toordinal()
+        beban = skor_beban(waktu, pace)
+        s = self.atlet.get(atlet)
+        if s is None:
+            s = self.atlet[atlet] = [o, 0.0, 0.0]
+        terakhir, atl, ctl = s
+        if o >= terakhir:
+            jarak = o - terakhir
+            atl = atl * K_ATL ** jarak + beban * (1 - K_ATL)
+            ctl = ctl * K_CTL ** jarak + beban * (1 - K_CTL)
+            terakhir = o
+        else:
+            jarak = terakhir - o
+            atl += beban * (1 - K_ATL) * K_ATL ** jarak
+            ctl += beban * (1 - K_CTL) * K_CTL ** jarak
+        s[:] = [terakhir, atl, ctl]
+        if id_lari is not None:
+            self.id_terakhir = max(self.id_terakhir, id_lari)
+
+    def perbarui_dari_db(self, db, atlet="default"):
+        # Putar ulang hanya lari yang tersimpan setelah checkpoint
+        for id_lari, tanggal, _, waktu, pace in db.lari_sejak(self.id_terakhir):
+            self.tambah(atlet, tanggal, waktu, pace, id_lari)
+
+    def status(self, atlet, tanggal=None):
+        # (atl, ctl, tsb) pada tanggal tertentu (default hari ini), tanpa mengubah status
+        s = self.atlet.get(atlet)
+        if s is None:
+            return 0.0, 0.0, 0.0
+        terakhir, atl, ctl = s
+        jarak = max(ke_tanggal(tanggal or date.today()).toordinal() - terakhir, 0)
+        atl, ctl = atl * K_ATL ** jarak, ctl * K_CTL ** jarak
+        return atl, ctl, ctl - atl
+
+    def rencana(self, atlet, tanggal=None):
+        # Jadwal Senin-Minggu dari status beban: total beban minggu = 7 x CTL x faktor kondisi
+        atl, ctl, tsb = self.status(atlet, tanggal)
+        if ctl < CTL_MINIMUM:
+            return list(JADWAL_DASAR)
+        label, faktor = kondisi(tsb)
+        mingguan = 7 * ctl * faktor
+        hasil = []
+        for latihan, tipe, porsi, intensitas in TEMPLATE:
+            if porsi == 0:
+                hasil.append((latihan, "-", tipe))
+                continue
+            if label == "Kelelahan" and intensitas >= 0.9:
+                # Terlalu lelah untuk sesi cepat: ganti dengan lari ringan. Porsi beban ikut turun
+                # dengan kuadrat intensitas agar sesi pengganti tidak lebih lama dari sesi cepatnya
+                porsi *= (0.7 / intensitas) ** 2
+                latihan, tipe, intensitas = "Lari Ringan", "Pemulihan aktif", 0.7
+            menit = mingguan * porsi / (intensitas * intensitas * 100 / 60)
+            menit = min(max(5 * round(menit / 5), 15), 180)
+            hasil.append((latihan, f"{menit} menit", tipe))
+        return hasil
@@ -0,0 +1,257 @@
+# Benchmark yang bisa diulang: jalur hitung, penyimpanan (insert + lookup) dan render tab.
+# Data lari sintetis (seed tetap) dibuat untuk setiap ukuran, hasil ditulis sebagai JSON.
+#
+#   python benchmark.py -o hasil.json                      # 1k, 100k, 1M lari
+#   python benchmark.py --ukuran 1000 --bandingkan base.json  # gagal (exit 1) jika ada regresi
+#
+# Render tab butuh display X. Tanpa DISPLAY, Xvfb lokal dijalankan otomatis jika terpasang;
+# jika tidak ada, benchmark render dilewati dan dicatat di JSON.
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import analisis
+from agregat import IndeksJarak
+from penyimpanan import RiwayatDB
+from rekaman import Riwayat
+
+LARI_PER_HARI = 3
+DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def data_sintetis(n, seed=42):
+    # n lari, LARI_PER_HARI per tanggal, berakhir hari ini
+    rnd = random.Random(seed)
+    hari = max(n // LARI_PER_HARI, 1)
+    awal = date.today() - timedelta(days=hari - 1)
+    tanggal = [(awal + timedelta(days=i // LARI_PER_HARI)).isoformat() for i in range(n)]
+    jarak = [round(rnd.uniform(2, 21), 2) for _ in range(n)]
+    waktu = [round(j * rnd.uniform(4.5, 7.5), 1) for j in jarak]
+    berat = [round(rnd.uniform(55, 85), 1) for _ in range(n)]
+    target = [rnd.choice((5.0, 10.0, 15.0)) if i % 50 == 0 else 0.0 for i in range(n)]
+    return {"tanggal": tanggal, "jarak": jarak, "waktu": waktu, "berat": berat, "target": target}
+
+
+def ukur(fn, ulang):
+    # Median dan minimum dari beberapa pengulangan (detik)
+    durasi = []
+    for _ in range(ulang):
+        t0 = time.perf_counter()
+        fn()
+        durasi.append(time.perf_counter() - t0)
+    return {"median": statistics.median(durasi), "min": min(durasi), "ulang": ulang}
+
+
+def isi_db(path, data):
+    hasil = analisis.hitung_batch(data["jarak"], data["waktu"], data["berat"])
+    harian = analisis.total_harian(data["tanggal"], data["jarak"], data["target"])
+    analisis.simpan_db(path, data, hasil, harian)
+
+
+def bench_hitung(data, ulang):
+    n = len(data["jarak"])
+    kecil = min(n, 100_000)
+    return {
+        "hitung_batch": ukur(lambda: analisis.hitung_batch(data["jarak"], data["waktu"], data["berat"]), ulang),
+        "total_harian": ukur(lambda: analisis.total_harian(data["tanggal"], data["jarak"], data["target"]), ulang),
+        # Jalur satu-per-satu seperti tombol Analisis (dibatasi 100k agar tetap singkat)
+        f"hitung_skalar_{kecil}": ukur(lambda: [analisis.hitung(j, w, b) for j, w, b in
+                                                zip(data["jarak"][:kecil], data["waktu"][:kecil],
+                                                    data["berat"][:kecil])], ulang),
+    }
+
+
+def bench_penyimpanan(data, folder, ulang):
+    hasil = {}
+    path = os.path.join(folder, "bench.db")
+
+    def insert():
+        for ext in ("", "-wal", "-shm"):
+            if os.path.exists(path + ext):
+                os.remove(path + ext)
+        isi_db(path, data)
+
+    hasil["insert_massal"] = ukur(insert, max(1, ulang // 2))
+
+    db = RiwayatDB(path)
+    rnd = random.Random(7)
+    tanggal = [rnd.choice(data["tanggal"]) for _ in range(1000)]
+    hasil["lookup_total_harian_x1000"] = ukur(lambda: [db.total_jarak(t) for t in tanggal], ulang)
+    hasil["lookup_lari_tanggal_x1000"] = ukur(lambda: [len(Riwayat(db.lari)[t]) for t in tanggal], ulang)
+    hasil["halaman_riwayat"] = ukur(lambda: db.ringkasan_tanggal(n=100), ulang)
+    hasil["simpan_lari"] = ukur(lambda: db.simpan_lari(data["tanggal"][-1], {
+        "time": "07:00", "jarak": 5.0, "waktu": 30.0, "pace": 6.0, "speed": 10.0, "kal": 300.0, "target": 0.0}), ulang)
+    hasil["bangun_indeks"] = ukur(lambda: IndeksJarak(db.total_per_tanggal()), ulang)
+    indeks = IndeksJarak(db.total_per_tanggal())
+    hasil["rekap_rolling_x1000"] = ukur(lambda: [(indeks.rolling(7), indeks.rolling(365)) for _ in range(1000)], ulang)
+    db.close()
+    return hasil
+
+
+def mulai_display():
+    # Pakai DISPLAY yang ada, atau jalankan Xvfb lokal; None jika tidak ada display sama sekali
+    if os.environ.get("DISPLAY"):
+        return None, None
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        return None, "tidak ada DISPLAY dan Xvfb tidak terpasang"
+    display = ":97"
+    proc = subprocess.Popen([xvfb, display, "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(0.5)
+    os.environ["DISPLAY"] = display
+    return proc, None
+
+
+def muat_app():
+    # run-analyzer-pro.py bukan nama modul yang valid, jadi dimuat lewat path
+    spec = importlib.util.spec_from_file_location("run_analyzer_pro", os.path.join(DIR, "run-analyzer-pro.py"))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def bench_render(data, folder, ulang):
+    path = os.path.join(folder, "render.db")
+    for ext in ("", "-wal", "-shm", ".snap"):
+        if os.path.exists(path + ext):
+            os.remove(path + ext)
+    isi_db(path, data)
+    os.environ["RUN_ANALYZER_DB"] = path
+    mod = muat_app()
+
+    def startup():
+        # Sampai frame pertama: konstruktor + satu putaran event (tab Input tergambar)
+        t0 = time.perf_counter()
+        app = mod.RunningApp()
+        app.update()
+        return app, {"median": time.perf_counter() - t0, "min": time.perf_counter() - t0, "ulang": 1}
+
+    # Startup pertama membangun agregat dari SQLite; on_close menulis snapshot untuk startup kedua
+    app, tanpa_snapshot = startup()
+    app.on_close()
+    app, dengan_snapshot = startup()
+    app.withdraw()
+    for key, val in (("jarak", "5"), ("waktu", "30"), ("berat", "65"), ("target_jarak", "10")):
+        app.vars[key].set(val)
+
+    def render(fn):
+        def jalan():
+            fn()
+            app.update_idletasks()
+        return jalan
+
+    def tab(nama):
+        # Tandai kotor lalu tampilkan tab; termasuk biaya render lazy saat tab dibuka
+        def jalan():
+            app.dirty.add(nama)
+            app.notebook.select(app.tabs[nama])
+            app.render_visible()
+        return jalan
+
+    hasil = {"startup_tanpa_snapshot": tanpa_snapshot, "startup_snapshot": dengan_snapshot,
+             "analyze_pertama": ukur(render(app.analyze), 1),
+             "analyze": ukur(render(app.analyze), ulang)}
+    for nama in ("Hasil", "Gizi", "Jadwal", "Tren", "History"):
+        hasil[f"tab_{nama}"] = ukur(render(tab(nama)), ulang)
+    hasil["toggle_theme"] = ukur(render(app.toggle_theme), ulang)
+    app.on_close()
+    return hasil
+
+
+def jalankan(ukuran, ulang, render=True):
+    hasil = {}
+    catatan = {}
+    xvfb, alasan = mulai_display() if render else (None, "dimatikan lewat --tanpa-render")
+    try:
+        with tempfile.TemporaryDirectory() as folder:
+            for n in ukuran:
+                data = data_sintetis(n)
+                # Ukuran besar diulang lebih sedikit agar suite tetap selesai dalam hitungan menit
+                u = ulang if n <= 100_000 else max(1, ulang // 3)
+                print(f"[{n}] hitung...", file=sys.stderr)
+                for k, v in bench_hitung(data, u).items():
+                    hasil[f"hitung/{k}/{n}"] = v
+                print(f"[{n}] penyimpanan...", file=sys.stderr)
+                for k, v in bench_penyimpanan(data, folder, u).items():
+                    hasil[f"penyimpanan/{k}/{n}"] = v
+                if alasan is None:
+                    print(f"[{n}] render...", file=sys.stderr)
+                    for k, v in bench_render(data, folder, u).items():
+                        hasil[f"render/{k}/{n}"] = v
+        if alasan is not None:
+            catatan["render"] = f"dilewati: {alasan}"
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+    return {
+        "meta": {
+            "waktu": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": analisis.np.__version__ if analisis.np is not None else None,
+            "ukuran": ukuran,
+            "ulang": ulang,
+        },
+        "catatan": catatan,
+        "hasil": hasil,
+    }
+
+
+def bandingkan(hasil, baseline, ambang):
+    # Regresi = median baru lebih lambat dari baseline melebihi ambang (relatif)
+    regresi = []
+    for nama, base in baseline["hasil"].items():
+        baru = hasil["hasil"].get(nama)
+        if baru is None:
+            continue
+        rasio = baru["median"] / base["median"] if base["median"] > 0 else 1.0
+        status = "REGRESI" if rasio > 1 + ambang else "ok"
+        print(f"{status:8} {nama:55} {base['median'] * 1e3:10.2f} ms -> {baru['median'] * 1e3:10.2f} ms"
+              f" ({rasio:.2f}x)", file=sys.stderr)
+        if status == "REGRESI":
+            regresi.append(nama)
+    return regresi
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Benchmark analisis, penyimpanan dan render Run Analyzer Pro")
+    p.add_argument("--ukuran", default="1000,100000,1000000", help="jumlah lari sintetis, dipisah koma")
+    p.add_argument("--ulang", type=int, default=5, help="pengulangan per benchmark (median dilaporkan)")
+    p.add_argument("-o", "--output", help="tulis hasil JSON ke file (default: stdout)")
+    p.add_argument("--bandingkan", metavar="BASELINE", help="JSON hasil sebelumnya untuk deteksi regresi")
+    p.add_argument("--ambang", type=float, default=0.2, help="toleransi perlambatan relatif (default 0.2 = 20%%)")
+    p.add_argument("--tanpa-render", action="store_true", help="lewati benchmark render tab")
+    args = p.parse_args(argv)
+
+    ukuran = [int(x) for x in args.ukuran.split(",") if x.strip()]
+    hasil = jalankan(ukuran, args.ulang, render=not args.tanpa_render)
+
+    teks = json.dumps(hasil, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(teks)
+    else:
+        print(teks)
+
+    if args.bandingkan:
+        with open(args.bandingkan, encoding="utf-8") as f:
+            regresi = bandingkan(hasil, json.load(f), args.ambang)
+        if regresi:
+            print(f"{len(regresi)} benchmark melambat lebih dari {args.ambang:.0%}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,349 @@
+# Ekspor riwayat secara streaming (per potongan, tanpa menampung seluruh output di memori) ke
+# CSV, JSON Lines atau format kolom biner, plus impor massal dari ketiga format tersebut.
+#
+#   python ekspor.py riwayat.csv                 # format dari ekstensi: .csv, .jsonl, .rac
+#   python ekspor.py harian.rac --harian         # total jarak + target per tanggal
+#   python ekspor.py riwayat.rac --impor --db lain.db
+#
+# Format kolom .rac (little-endian), bisa di-mmap langsung oleh job analitik:
+#   header : MAGIC (8 byte) | versi u32 | jumlah kolom u32 | jumlah baris u64
+#   kolom  : per kolom nama (16 byte utf-8, diisi \0) | typecode array (1 byte) | offset data u64
+#   data   : setiap kolom satu blok bersambung (n x ukuran tipe) mulai dari offset-nya (rata 8 byte)
+# tanggal disimpan sebagai ordinal hari (int32, date.fromordinal), time sebagai menit sejak 00:00,
+# target kosong sebagai NaN.
+import argparse
+import csv
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from datetime import date
+
+from penyimpanan import RiwayatDB
+from rekaman import ke_jam, ke_menit
+
+POTONGAN = 50_000
+
+MAGIC = b"RACOLS\0\0"
+VERSI = 1
+HEADER = struct.Struct("<8sIIQ")
+DESKRIPTOR = struct.Struct("<16scQ")
+
+# jenis -> (kolom [(nama, typecode)], query hitung, query data)
+JENIS = {
+    "lari": ([("tanggal", "i"), ("time", "H"), ("jarak", "d"), ("waktu", "d"), ("pace", "d"),
+              ("speed", "d"), ("kal", "d"), ("target", "d")],
+             "SELECT COUNT(*) FROM runs",
+             "SELECT tanggal, time, jarak, waktu, pace, speed, kal, target FROM runs ORDER BY id"),
+    "harian": ([("tanggal", "i"), ("total", "d"), ("target", "d")],
+               "SELECT COUNT(*) FROM harian",
+               "SELECT h.tanggal, h.total, t.target FROM harian h"
+               " LEFT JOIN targets t ON t.tanggal = h.tanggal ORDER BY h.tanggal"),
+}
+KOLOM_LARI = [nama for nama, _ in JENIS["lari"][0]]
+
+FORMAT = {".csv": "csv", ".jsonl": "jsonl", ".rac": "kolom"}
+
+
+class _Cache(dict):
+    # Konversi tanggal/jam: nilai unik jauh lebih sedikit dari jumlah baris
+    def __init__(self, fn):
+        super().__init__()
+        self.fn = fn
+
+    def __missing__(self, k):
+        v = self[k] = self.fn(k)
+        return v
+
+
+def format_dari(path):
+    fmt = FORMAT.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"format tidak dikenal untuk {path} (gunakan {', '.join(FORMAT)})")
+    return fmt
+
+
+def cocok(path):
+    # True jika file adalah hasil ekspor lari (CSV ekspor dikenali dari header-nya)
+    fmt = FORMAT.get(os.path.splitext(path)[1].lower())
+    if fmt != "csv":
+        return fmt is not None
+    with open(path, newline="", encoding="utf-8") as f:
+        return next(csv.reader(f), None) == KOLOM_LARI
+
+
+# --- ekspor ---
+
+def _potongan(cur, n, batal):
+    while True:
+        if batal is not None and batal.is_set():
+            raise InterruptedError("ekspor dibatalkan")
+        rows = cur.fetchmany(n)
+        if not rows:
+            return
+        yield rows
+
+
+def _tulis_csv(f, kolom, potongan):
+    w = csv.writer(f)
+    w.writerow([nama for nama, _ in kolom])
+    for rows in potongan:
+        w.writerows(rows)
+        yield len(rows)
+
+
+def _tulis_jsonl(f, kolom, potongan):
+    nama = [k for k, _ in kolom]
+    for rows in potongan:
+        f.writelines(json.dumps(dict(zip(nama, r))) + "\n" for r in rows)
+        yield len(rows)
+
+
+def _offset_kolom(kolom, n):
+    # Offset tiap blok kolom, dirapatkan ke kelipatan 8 byte
+    pos = HEADER.size + DESKRIPTOR.size * len(kolom)
+    offset = []
+    for _, tc in kolom:
+        pos = (pos + 7) // 8 * 8
+        offset.append(pos)
+        pos += n * array(tc).itemsize
+    return offset, pos
+
+
+def _tulis_kolom(f, kolom, n, potongan):
+    # Ruang setiap kolom dialokasikan di depan (n diketahui), lalu tiap potongan ditulis
+    # ke blok kolomnya masing-masing dengan seek
+    offset, ukuran = _offset_kolom(kolom, n)
+    f.write(HEADER.pack(MAGIC, VERSI, len(kolom), n))
+    for (nama, tc), off in zip(kolom, offset):
+        f.write(DESKRIPTOR.pack(nama.encode()[:16], tc.encode(), off))
+    f.truncate(ukuran)
+    ordinal = _Cache(lambda t: date.fromisoformat(t).toordinal())
+    menit = _Cache(ke_menit)
+    ditulis = 0
+    for rows in potongan:
+        if ditulis + len(rows) > n:
+            raise ValueError("jumlah baris berubah selama ekspor")
+        for i, ((nama, tc), nilai) in enumerate(zip(kolom, zip(*rows))):
+            if nama == "tanggal":
+                nilai = [ordinal[t] for t in nilai]
+            elif nama == "time":
+                nilai = [menit[t] for t in nilai]
+            elif nama == "target":
+                nilai = [math.nan if t is None else t for t in nilai]
+            a = array(tc, nilai)
+            if sys.byteorder != "little":
+                a.byteswap()
+            f.seek(offset[i] + ditulis * a.itemsize)
+            a.tofile(f)
+        ditulis += len(rows)
+        yield len(rows)
+    if ditulis != n:
+        raise ValueError("jumlah baris berubah selama ekspor")
+
+
+def ekspor(db, path, jenis="lari", progres=None, batal=None, potongan=POTONGAN):
+    # Tulis ke file sementara lalu rename; jika dibatalkan/gagal, file tujuan tidak tersentuh.
+    # Mengembalikan jumlah baris (0 jika dibatalkan).
+    fmt = format_dari(path)
+    kolom, sql_hitung, sql_data = JENIS[jenis]
+    sementara = path + ".tmp"
+    # Hitung dan baca dalam satu transaksi baca agar jumlah baris konsisten dengan isinya
+    db.conn.execute("BEGIN")
+    try:
+        n = db.conn.execute(sql_hitung).fetchone()[0]
+        rows = _potongan(db.conn.execute(sql_data), potongan, batal)
+        if fmt == "kolom":
+            f = open(sementara, "wb")
+        else:
+            f = open(sementara, "w", newline="", encoding="utf-8")
+        with f:
+            if fmt == "csv":
+                langkah = _tulis_csv(f, kolom, rows)
+            elif fmt == "jsonl":
+                langkah = _tulis_jsonl(f, kolom, rows)
+            else:
+                langkah = _tulis_kolom(f, kolom, n, rows)
+            selesai = 0
+            for k in langkah:
+                selesai += k
+                if progres is not None:
+                    progres(selesai, n)
+        os.replace(sementara, path)
+        return selesai
+    except InterruptedError:
+        return 0
+    finally:
+        db.conn.rollback()
+        if os.path.exists(sementara):
+            os.remove(sementara)
+
+
+# --- baca / impor ---
+
+def baca_kolom(path):
+    # {nama: array} dari file .rac; data disalin dari mmap per kolom (memcpy, tanpa parsing)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        magic, versi, jumlah, n = HEADER.unpack_from(mm)
+        if magic != MAGIC or versi != VERSI:
+            raise ValueError(f"{path} bukan file kolom Run Analyzer")
+        hasil = {}
+        with memoryview(mm) as mv:
+            for i in range(jumlah):
+                nama, tc, off = DESKRIPTOR.unpack_from(mm, HEADER.size + i * DESKRIPTOR.size)
+                a = array(tc.decode())
+                a.frombytes(mv[off:off + n * a.itemsize])
+                if sys.byteorder != "little":
+                    a.byteswap()
+                hasil[nama.rstrip(b"\0").decode()] = a
+    return hasil
+
+
+def _baris_teks(path, progres, potongan):
+    # Baris dibaca sebagai bytes agar progres bisa dihitung dari posisi file
+    total = os.path.getsize(path)
+    dibaca = 0
+    with open(path, "rb") as f:
+        for i, baris in enumerate(f):
+            dibaca += len(baris)
+            if progres is not None and i % potongan == 0:
+                progres(dibaca, total)
+            yield baris.decode("utf-8")
+    if progres is not None:
+        progres(total, total)
+
+
+def _per_potongan(baris, potongan):
+    hasil = []
+    for r in baris:
+        hasil.append(r)
+        if len(hasil) == potongan:
+            yield hasil
+            hasil = []
+    if hasil:
+        yield hasil
+
+
+# Pembaca lari: menghasilkan potongan berisi tuple (tanggal, time, jarak, waktu, pace, speed, kal, target)
+
+def _normalkan_lari(path):
+    # -> fungsi(nomor baris, nilai) yang memvalidasi satu lari dari CSV/JSONL. File yang disimpan
+    # ulang lewat spreadsheet bisa mengubah format (tanggal 1/2/2024, jam 07:00:00): tanggal harus
+    # YYYY-MM-DD, jam dinormalkan ke HH:MM, angka harus hingga, jarak/waktu > 0, target kosong -> 0
+    tanggal = _Cache(lambda t: date.fromisoformat(t.strip()).isoformat())
+    jam = _Cache(lambda j: ke_jam(ke_menit(j)))
+
+    def normal(nomor, nilai):
+        try:
+            tg, j, *angka, target = nilai
+            angka = [float(x) for x in angka]
+            target = 0.0 if target is None or target == "" else float(target)
+            if len(angka) != 5 or not all(map(math.isfinite, angka)) or not math.isfinite(target):
+                raise ValueError("angka tidak valid")
+            if min(angka[:2]) <= 0 or target < 0:
+                raise ValueError("jarak/waktu harus > 0 dan target >= 0")
+            return (tanggal[tg], jam[j], *angka, target)
+        except (TypeError, ValueError, AttributeError) as e:
+            raise ValueError(f"{path} baris {nomor}: {e}") from None
+
+    return normal
+
+
+def _lari_csv(path, progres, potongan):
+    r = csv.reader(_baris_teks(path, progres, potongan))
+    if next(r, None) != KOLOM_LARI:
+        raise ValueError(f"{path}: header harus {','.join(KOLOM_LARI)}")
+    normal = _normalkan_lari(path)
+    return _per_potongan((normal(i, row) for i, row in enumerate(r, 2)), potongan)
+
+
+def _lari_jsonl(path, progres, potongan):
+    normal = _normalkan_lari(path)
+
+    def baris():
+        for i, teks in enumerate(_baris_teks(path, progres, potongan), 1):
+            if not teks.strip():
+                continue
+            try:
+                d = json.loads(teks)
+                nilai = [d[k] for k in KOLOM_LARI]
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(f"{path} baris {i}: {e!r}") from None
+            yield normal(i, nilai)
+
+    return _per_potongan(baris(), potongan)
+
+
+def _lari_kolom(path, progres, potongan):
+    k = baca_kolom(path)
+    if list(k) != KOLOM_LARI:
+        raise ValueError(f"{path}: bukan ekspor data lari")
+    tanggal = _Cache(lambda o: date.fromordinal(o).isoformat())
+    jam = _Cache(ke_jam)
+    n = len(k["tanggal"])
+    for awal in range(0, n, potongan):
+        akhir = min(awal + potongan, n)
+        yield list(zip([tanggal[o] for o in k["tanggal"][awal:akhir]], [jam[m] for m in k["time"][awal:akhir]],
+                       *(k[nama][awal:akhir] for nama in KOLOM_LARI[2:])))
+        if progres is not None:
+            progres(akhir, n)
+
+
+def impor(path, db, progres=None, batal=None, potongan=POTONGAN):
+    # Impor massal hasil ekspor lari ke database dalam satu transaksi. Target harian dicatat untuk
+    # setiap tanggal yang larinya punya target (> 0); lari terakhir hari itu yang menentukan, sama
+    # seperti INSERT OR REPLACE saat target diisi di tab Input. Mengembalikan jumlah lari.
+    fmt = format_dari(path)
+    baca = {"csv": _lari_csv, "jsonl": _lari_jsonl, "kolom": _lari_kolom}[fmt]
+    targets = {}  # tanggal -> target; diisi sambil runs dialirkan, ditulis setelahnya
+    jumlah = 0
+
+    def lari():
+        nonlocal jumlah
+        for rows in baca(path, progres, potongan):
+            if batal is not None and batal.is_set():
+                raise InterruptedError("impor dibatalkan")
+            for r in rows:
+                if r[7] > 0:
+                    targets[r[0]] = r[7]
+            jumlah += len(rows)
+            yield from rows
+
+    try:
+        db.tambah_banyak(lari(), targets.items())
+    except InterruptedError:
+        return 0
+    return jumlah
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Ekspor/impor riwayat Run Analyzer Pro (CSV, JSON Lines, kolom biner .rac)")
+    p.add_argument("file", help="file tujuan ekspor (atau sumber dengan --impor); format dari ekstensi")
+    p.add_argument("--harian", action="store_true", help="ekspor total jarak dan target per tanggal, bukan per lari")
+    p.add_argument("--impor", action="store_true", help="impor massal file hasil ekspor lari ke database")
+    p.add_argument("--db", help="path database (default sama dengan aplikasi)")
+    args = p.parse_args(argv)
+
+    db = RiwayatDB(args.db)
+    mulai = time.perf_counter()
+    try:
+        if args.impor:
+            n = impor(args.file, db)
+            aksi = "diimpor dari"
+        else:
+            n = ekspor(db, args.file, "harian" if args.harian else "lari")
+            aksi = "diekspor ke"
+    finally:
+        db.close()
+    durasi = time.perf_counter() - mulai
+    print(f"{n} baris {aksi} {args.file} dalam {durasi:.2f} s ({n / durasi if durasi > 0 else 0:.0f} baris/s)",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+# Grafik tren di tk.Canvas.
+# Seri harian disimpan sebagai piramida multi-resolusi (setiap level merata-rata pasangan titik
+# level di bawahnya). Zoom/geser memilih level terhalus yang masih ringan untuk rentang terlihat,
+# lalu menipiskannya dengan LTTB (largest-triangle-three-buckets) - riwayat mentah tidak dibaca ulang.
+import tkinter as tk
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+from agregat import ke_tanggal
+
+MAKS_LEVEL = 2000  # titik maksimum dari piramida yang diberikan ke LTTB
+MAKS_TITIK = 300  # titik maksimum yang digambar per garis
+
+
+def lttb(x, y, n):
+    # Pilih n titik yang paling menjaga bentuk garis: di setiap bucket ambil titik yang membentuk
+    # segitiga terluas dengan titik terpilih sebelumnya dan rata-rata bucket berikutnya
+    m = len(x)
+    if n >= m or n < 3:
+        return list(x), list(y)
+    lebar = (m - 2) / (n - 2)
+    hx, hy = [x[0]], [y[0]]
+    a = 0
+    for i in range(n - 2):
+        mulai, akhir = int(i * lebar) + 1, int((i + 1) * lebar) + 1
+        berikut, batas = akhir, min(int((i + 2) * lebar) + 1, m)
+        k = batas - berikut
+        rx = sum(x[berikut:batas]) / k
+        ry = sum(y[berikut:batas]) / k
+        ax, ay = x[a], y[a]
+        luas, pilih = -1.0, mulai
+        for j in range(mulai, akhir):
+            l = abs((ax - rx) * (y[j] - ay) - (ax - x[j]) * (ry - ay))
+            if l > luas:
+                luas, pilih = l, j
+        hx.append(x[pilih])
+        hy.append(y[pilih])
+        a = pilih
+    hx.append(x[-1])
+    hy.append(y[-1])
+    return hx, hy
+
+
+class Piramida:
+    def __init__(self, x, y):
+        # level[0] = seri asli (x ordinal tanggal, terurut), level berikutnya separuh ukurannya
+        self.level = [(array("d", x), array("d", y))]
+        while len(self.level[-1][0]) > MAKS_LEVEL:
+            px, py = self.level[-1]
+            n = len(px) // 2 * 2
+            self.level.append((array("d", ((px[i] + px[i + 1]) / 2 for i in range(0, n, 2))),
+                               array("d", ((py[i] + py[i + 1]) / 2 for i in range(0, n, 2)))))
+
+    def ambil(self, x0, x1, n=MAKS_TITIK):
+        # Titik pada rentang [x0, x1] (plus satu titik di tiap sisi agar garis menyambung)
+        for px, py in self.level:
+            a = max(bisect_left(px, x0) - 1, 0)
+            b = min(bisect_right(px, x1) + 1, len(px))
+            if b - a <= MAKS_LEVEL:
+                break
+        return lttb(px[a:b], py[a:b], n)
+
+
+class SeriHarian:
+    # Total per hari (jarak, waktu, kalori) dan target berlaku, dalam kolom array terurut tanggal
+    def __init__(self, baris=()):
+        # baris: (tanggal, jarak, waktu, kal, target atau None), terurut tanggal
+        kolom = list(zip(*baris)) or [()] * 5
+        self.x = array("d", (ke_tanggal(t).toordinal() for t in kolom[0]))
+        self.jarak, self.waktu, self.kal = (array("d", k) for k in kolom[1:4])
+        self.target = array("d", self._isi_target(kolom[4]))
+        self._piramida = None
+
+    @classmethod
+    def dari_kolom(cls, x, jarak, waktu, kal, target):
+        # Dari snapshot: kolom array sudah jadi
+        seri = cls()
+        seri.x, seri.jarak, seri.waktu, seri.kal, seri.target = x, jarak, waktu, kal, target
+        return seri
+
+    @staticmethod
+    def _isi_target(target):
+        # Target berlaku sampai diganti, seperti target_terakhir di aplikasi
+        t = 0.0
+        for v in target:
+            if v is not None:
+                t = v
+            yield t
+
+    def _sisip(self, i, o, jarak, waktu, kal, target):
+        for kolom, v in ((self.x, o), (self.jarak, jarak), (self.waktu, waktu),
+                         (self.kal, kal), (self.target, target)):
+            kolom.insert(i, v)
+
+    def tambah(self, tanggal, jarak, waktu, kal, target):
+        o = ke_tanggal(tanggal).toordinal()
+        i = bisect_left(self.x, o)
+        if i < len(self.x) and self.x[i] == o:
+            self.jarak[i] += jarak
+            self.waktu[i] += waktu
+            self.kal[i] += kal
+            self.target[i] = target
+        else:
+            self._sisip(i, o, jarak, waktu, kal, target)
+        self._piramida = None
+
+    def __len__(self):
+        return len(self.x)
+
+    def piramida(self):
+        # Dibangun ulang (O(hari)) hanya setelah data berubah
+        if self._piramida is None:
+            pace = array("d", (w / j if j else 0.0 for j, w in zip(self.jarak, self.waktu)))
+            self._piramida = {"pace": Piramida(self.x, pace), "jarak": Piramida(self.x, self.jarak),
+                              "target": Piramida(self.x, self.target), "kal": Piramida(self.x, self.kal)}
+        return self._piramida
+
+
+class Grafik:
+    # Satu kanvas berisi satu atau beberapa garis. Roda mouse = zoom, seret = geser,
+    # klik ganda = tampilkan semua. on_rentang(x0, x1) dipanggil agar grafik lain ikut.
+    KIRI, ATAS, KANAN, BAWAH = 50, 22, 10, 20
+    MIN_HARI = 7
+
+    def __init__(self, parent, tema, judul, satuan, height=150, on_rentang=None):
+        self.judul = judul
+        self.satuan = satuan
+        self.on_rentang = on_rentang
+        self.seri = []  # [(Piramida, warna)]
+        self.batas = None  # (x0, x1) seluruh data
+        self.rentang = None  # (x0, x1) terlihat
+        self.canvas = c = tema.buat(tk.Canvas, parent, bg="card", height=height, highlightthickness=0)
+        c.bind("<Configure>", lambda e: self.gambar())
+        c.bind("<MouseWheel>", lambda e: self.zoom(e.x, 0.8 if e.delta > 0 else 1.25))
+        c.bind("<Button-4>", lambda e: self.zoom(e.x, 0.8))
+        c.bind("<Button-5>", lambda e: self.zoom(e.x, 1.25))
+        c.bind("<ButtonPress-1>", self.mulai_geser)
+        c.bind("<B1-Motion>", self.geser)
+        c.bind("<Double-Button-1>", lambda e: self.batas and self.atur_rentang(*self.batas))
+
+    def isi(self, seri, batas):
+        # Jika sebelumnya menampilkan semua data, tetap tampilkan semua (termasuk hari baru)
+        if self.rentang is None or self.rentang == self.batas:
+            self.rentang = batas
+        self.seri = seri
+        self.batas = batas
+        self.gambar()
+
+    def atur_rentang(self, x0, x1, sebar=True):
+        lo, hi = self.batas
+        lebar = min(max(x1 - x0, self.MIN_HARI), hi - lo or self.MIN_HARI)
+        x0 = min(max(x0, lo), hi - lebar) if hi - lo > lebar else lo
+        self.rentang = (x0, x0 + lebar)
+        self.gambar()
+        if sebar and self.on_rentang:
+            self.on_rentang(*self.rentang)
+
+    def _ke_x(self, px):
+        x0, x1 = self.rentang
+        w = max(self.canvas.winfo_width() - self.KIRI - self.KANAN, 1)
+        return x0 + (px - self.KIRI) / w * (x1 - x0)
+
+    def zoom(self, px, faktor):
+        if self.rentang is None:
+            return
+        x0, x1 = self.rentang
+        pusat = self._ke_x(px)
+        self.atur_rentang(pusat - (pusat - x0) * faktor, pusat + (x1 - pusat) * faktor)
+
+    def mulai_geser(self, e):
+        self._seret = (e.x, self.rentang)
+
+    def geser(self, e):
+        if self.rentang is None:
+            return
+        px, (x0, x1) = self._seret
+        w = max(self.canvas.winfo_width() - self.KIRI - self.KANAN, 1)
+        d = (px - e.x) / w * (x1 - x0)
+        self.atur_rentang(x0 + d, x1 + d)
+
+    def gambar(self):
+        c = self.canvas
+        c.delete("all")
+        w, h = c.winfo_width(), c.winfo_height()
+        c.create_text(self.KIRI, 4, text=f"{self.judul} ({self.satuan})", anchor="nw",
+                      fill="#888", font=("Arial", 9, "bold"))
+        if not self.seri or self.rentang is None or w <= self.KIRI + self.KANAN:
+            return
+        x0, x1 = self.rentang
+        n = min(MAKS_TITIK, max((w - self.KIRI - self.KANAN) // 2, 3))
+        garis = [(p.ambil(x0, x1, n), warna) for p, warna in self.seri]
+        ys = [v for (_, gy), _ in garis for v in gy]
+        if not ys:
+            return
+        y0, y1 = min(ys), max(ys)
+        if y1 - y0 < 1e-9:
+            y0, y1 = y0 - 1, y1 + 1
+        lx = (w - self.KIRI - self.KANAN) / ((x1 - x0) or 1)
+        ly = (h - self.ATAS - self.BAWAH) / (y1 - y0)
+        for (gx, gy), warna in garis:
+            koordinat = []
+            for x, y in zip(gx, gy):
+                koordinat += (self.KIRI + (x - x0) * lx, h - self.BAWAH - (y - y0) * ly)
+            if len(koordinat) >= 4:
+                c.create_line(koordinat, fill=warna, width=1.5)
+        # Sumbu: rentang nilai dan tanggal terlihat
+        for y, anchor in ((y1, "ne"), (y0, "se")):
+            c.create_text(self.KIRI - 5, h - self.BAWAH - (y - y0) * ly, text=f"{y:.1f}", anchor=anchor,
+                          fill="#888", font=("Arial", 8))
+        for x, anchor in ((x0, "nw"), (x1, "ne")):
+            c.create_text(self.KIRI + (x - x0) * lx, h - self.BAWAH + 3, anchor=anchor, fill="#888",
+                          text=date.fromordinal(int(round(x))).isoformat(), font=("Arial", 8))
@@ -0,0 +1,232 @@
+# Impor track GPS (GPX/TCX) secara streaming.
+# File dibaca dengan iterparse dan setiap titik langsung dibuang dari pohon XML, lalu titik
+# diproses per blok (haversine tervektor), sehingga memori tetap datar walau file ratusan MB.
+import argparse
+import math
+import os
+import sys
+import time
+from array import array
+from datetime import datetime
+from xml.etree.ElementTree import iterparse
+
+import analisis
+from analisis import np
+
+R_BUMI = 6371008.8  # meter
+UKURAN_BLOK = 8192
+AMBANG_BERGERAK = 0.5  # m/s; di bawah ini dianggap berhenti (tidak masuk moving time)
+EKSTENSI = (".gpx", ".tcx")
+
+
+def _nama(tag):
+    # "{namespace}trkpt" -> "trkpt"
+    return tag.rsplit("}", 1)[-1]
+
+
+def _waktu(teks):
+    return datetime.fromisoformat(teks.strip().replace("Z", "+00:00"))
+
+
+def baca_titik(path):
+    # Hasilkan (lat, lon, waktu) satu per satu, GPX (trkpt) maupun TCX (Trackpoint).
+    # Titik yang selesai dibaca dilepas dari induknya agar pohon XML tidak tumbuh.
+    lat = lon = t = None
+    induk = []
+    for event, el in iterparse(path, events=("start", "end")):
+        if event == "start":
+            induk.append(el)
+            continue
+        induk.pop()
+        nama = _nama(el.tag)
+        if nama in ("time", "Time"):
+            t = el.text
+        elif nama == "LatitudeDegrees":
+            lat = float(el.text)
+        elif nama == "LongitudeDegrees":
+            lon = float(el.text)
+        elif nama in ("trkpt", "Trackpoint"):
+            if nama == "trkpt":
+                lat, lon = float(el.get("lat")), float(el.get("lon"))
+            if lat is not None and t is not None:
+                yield lat, lon, _waktu(t)
+            lat = lon = t = None
+            el.clear()
+            if induk:
+                induk[-1].remove(el)
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    # Jarak (meter) antar pasangan titik, dihitung sekaligus untuk satu blok
+    if np is not None:
+        p1, p2 = np.radians(lat1), np.radians(lat2)
+        dp, dl = p2 - p1, np.radians(np.asarray(lon2) - np.asarray(lon1))
+        a = np.sin(dp / 2) ** 2 + np.cos(p1) * np.cos(p2) * np.sin(dl / 2) ** 2
+        return 2 * R_BUMI * np.arcsin(np.sqrt(a))
+    hasil = array("d")
+    for a1, o1, a2, o2 in zip(lat1, lon1, lat2, lon2):
+        p1, p2 = math.radians(a1), math.radians(a2)
+        a = (math.sin((p2 - p1) / 2) ** 2
+             + math.cos(p1) * math.cos(p2) * math.sin(math.radians(o2 - o1) / 2) ** 2)
+        hasil.append(2 * R_BUMI * math.asin(math.sqrt(a)))
+    return hasil
+
+
+class Track:
+    # Akumulator per file: jarak total, moving time dan waktu tiap km (split)
+    def __init__(self):
+        self.titik = 0
+        self.mulai = None
+        self.meter = 0.0
+        self.bergerak = 0.0  # detik
+        self.splits = []  # detik per km
+        self._km_terakhir = 0.0  # detik sejak mulai saat km terakhir tercapai
+        self._akhir = None  # (lat, lon, detik) titik terakhir blok sebelumnya
+
+    def blok(self, lat, lon, detik):
+        # Proses satu blok titik; titik terakhir blok sebelumnya disambung di depan
+        self.titik += len(lat)
+        if self._akhir is not None:
+            lat, lon, detik = ([self._akhir[0]] + lat, [self._akhir[1]] + lon, [self._akhir[2]] + detik)
+        self._akhir = (lat[-1], lon[-1], detik[-1])
+        if len(lat) < 2:
+            return
+        d = haversine(lat[:-1], lon[:-1], lat[1:], lon[1:])
+        if np is not None:
+            dt = np.diff(np.asarray(detik))
+            bergerak = (dt > 0) & (d > AMBANG_BERGERAK * dt)
+            self.bergerak += float(dt[bergerak].sum())
+            kum = self.meter + np.cumsum(d)
+        else:
+            dt = [b - a for a, b in zip(detik, detik[1:])]
+            self.bergerak += sum(x for x, y in zip(dt, d) if x > 0 and y > AMBANG_BERGERAK * x)
+            kum, s = array("d"), self.meter
+            for x in d:
+                s += x
+                kum.append(s)
+        self._split(kum, d, detik)
+        self.meter = float(kum[-1])
+
+    def _split(self, kum, d, detik):
+        # Waktu saat melewati setiap kelipatan 1000 m, diinterpolasi di dalam segmen
+        km = int(self.meter // 1000) + 1
+        i = 0
+        while km * 1000 <= kum[-1]:
+            target = km * 1000
+            if np is not None:
+                i = int(np.searchsorted(kum, target))
+            else:
+                while kum[i] < target:
+                    i += 1
+            frac = 1 - (kum[i] - target) / d[i] if d[i] > 0 else 1
+            t = detik[i] + frac * (detik[i + 1] - detik[i])
+            self.splits.append(t - self._km_terakhir)
+            self._km_terakhir = t
+            km += 1
+
+    def hasil(self):
+        return {
+            "jarak": self.meter / 1000,
+            "waktu": self.bergerak / 60,
+            "titik": self.titik,
+            "splits": self.splits,
+            "mulai": self.mulai,
+        }
+
+
+def baca_track(path):
+    tr = Track()
+    lat, lon, detik = [], [], []
+    for a, o, t in baca_titik(path):
+        if tr.mulai is None:
+            tr.mulai = t
+        lat.append(a)
+        lon.append(o)
+        detik.append((t - tr.mulai).total_seconds())
+        if len(lat) >= UKURAN_BLOK:
+            tr.blok(lat, lon, detik)
+            lat, lon, detik = [], [], []
+    if lat:
+        tr.blok(lat, lon, detik)
+    return tr.hasil()
+
+
+def daftar_file(paths):
+    for p in paths:
+        if os.path.isdir(p):
+            for nama in sorted(os.listdir(p)):
+                if nama.lower().endswith(EKSTENSI):
+                    yield os.path.join(p, nama)
+        else:
+            yield p
+
+
+def impor(paths, berat, db=None, progres=None, batal=None):
+    # Impor banyak file sekaligus: pace/speed/kalori lewat analisis.hitung_batch,
+    # disimpan ke database dalam satu transaksi. Mengembalikan (tracks, gagal, titik/detik).
+    # batal (threading.Event) diperiksa per file; jika diset tidak ada yang disimpan.
+    mulai = time.perf_counter()
+    tracks, gagal = [], []
+    files = list(daftar_file(paths))
+    for i, path in enumerate(files):
+        if batal is not None and batal.is_set():
+            return [], gagal, 0.0
+        try:
+            tr = baca_track(path)
+            if tr["jarak"] <= 0 or tr["waktu"] <= 0 or tr["mulai"] is None:
+                raise ValueError("track tanpa jarak atau waktu")
+        except (ValueError, SyntaxError, OSError) as e:  # ParseError turunan SyntaxError
+            gagal.append((path, str(e)))
+        else:
+            tr["file"] = path
+            tracks.append(tr)
+        if progres is not None:
+            progres(i + 1, len(files))
+
+    if tracks:
+        hasil = analisis.hitung_batch([t["jarak"] for t in tracks], [t["waktu"] for t in tracks],
+                                      [berat] * len(tracks))
+        for k in ("pace", "speed", "kal"):
+            for t, v in zip(tracks, hasil[k]):
+                t[k] = float(v)
+        if db is not None:
+            rows = []
+            for t in tracks:
+                lokal = t["mulai"].astimezone()
+                rows.append((lokal.strftime("%Y-%m-%d"), lokal.strftime("%H:%M"),
+                             t["jarak"], t["waktu"], t["pace"], t["speed"], t["kal"], 0.0))
+            db.tambah_banyak(rows)
+
+    durasi = time.perf_counter() - mulai
+    titik = sum(t["titik"] for t in tracks)
+    return tracks, gagal, titik / durasi if durasi > 0 else 0.0
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Impor file GPX/TCX (file atau folder) ke analisis lari")
+    p.add_argument("paths", nargs="+", help="file .gpx/.tcx atau folder berisi file tersebut")
+    p.add_argument("--berat", type=float, required=True, help="berat badan (kg) untuk kalori")
+    p.add_argument("--db", nargs="?", const="", help="simpan ke database riwayat (default: database aplikasi)")
+    args = p.parse_args(argv)
+
+    db = None
+    if args.db is not None:
+        from penyimpanan import RiwayatDB
+        db = RiwayatDB(args.db or None)
+    tracks, gagal, laju = impor(args.paths, args.berat, db)
+    if db is not None:
+        db.close()
+
+    for t in tracks:
+        splits = " ".join(f"{int(s // 60)}:{int(s % 60):02d}" for s in t["splits"])
+        print(f"{os.path.basename(t['file'])}: {t['jarak']:.2f} km, {t['waktu']:.1f} menit bergerak,"
+              f" pace {t['pace']:.2f}, {t['kal']:.0f} kalori | split/km: {splits}")
+    for path, err in gagal:
+        print(f"{path}: gagal ({err})", file=sys.stderr)
+    print(f"{len(tracks)} file, {sum(t['titik'] for t in tracks)} titik, {laju:,.0f} titik/detik",
+          file=sys.stderr)
+    return 0 if tracks or not gagal else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+# Perencana makan pemulihan: pilih porsi makanan agar kalori, protein dan karbohidrat mendekati
+# kebutuhan setelah lari (bounded knapsack, diselesaikan dengan DP). Hasil di-cache (LRU) per
+# bucket kalori/berat badan, jadi analisis lari yang mirip langsung mendapat menu tanpa solver.
+from functools import lru_cache
+
+# (nama, porsi, kkal, protein g, karbo g, maks porsi, keterangan)
+MAKANAN = [
+    ("Dada Ayam", "100g", 165, 31.0, 0.0, 2, "Protein tinggi, rendah lemak"),
+    ("Telur", "2 butir", 155, 13.0, 1.1, 2, "Protein lengkap, mudah dicerna"),
+    ("Salmon", "100g", 208, 25.0, 0.0, 2, "Protein + Omega-3"),
+    ("Tahu", "100g", 76, 8.0, 1.9, 3, "Protein nabati"),
+    ("Nasi Merah", "100g", 111, 2.6, 23.0, 4, "Karbohidrat kompleks"),
+    ("Oatmeal", "50g", 190, 6.5, 30.0, 3, "Serat tinggi, energi tahan lama"),
+    ("Ubi", "100g", 86, 1.6, 20.0, 3, "Vitamin A, karbo sehat"),
+    ("Pisang", "1 buah", 105, 1.3, 27.0, 3, "Kalium, energi cepat"),
+]
+
+# Kebutuhan pemulihan: kalori = kalori terbakar, karbo 60% kalori,
+# protein 25% kalori tapi minimal 0,3 g/kg berat badan
+PORSI_KARBO = 0.60
+PORSI_PROTEIN = 0.25
+PROTEIN_PER_KG = 0.3
+
+BUCKET_KAL = 50  # kkal per bucket cache
+BUCKET_BERAT = 5  # kg per bucket cache
+SATUAN_KAL = 10  # resolusi state DP
+SATUAN_PROTEIN = 2
+BATAS_KAL = 1.2  # menu boleh melebihi kebutuhan kalori sampai 20%
+
+
+def kebutuhan(kkal, berat):
+    # (kkal, protein g, karbo g)
+    return kkal, max(PORSI_PROTEIN * kkal / 4, PROTEIN_PER_KG * berat), PORSI_KARBO * kkal / 4
+
+
+def _galat(total, target):
+    # Jumlah selisih relatif kalori, protein dan karbo; porsi lebih banyak sedikit dihukum
+    k, p, c, porsi = total
+    tk, tp, tc = target
+    return abs(k - tk) / tk + abs(p - tp) / tp + abs(c - tc) / tc + 0.01 * sum(n for _, n in porsi)
+
+
+@lru_cache(maxsize=256)
+def _rencana(bucket_kal, bucket_berat):
+    target = kebutuhan(bucket_kal * BUCKET_KAL, bucket_berat * BUCKET_BERAT)
+    batas = target[0] * BATAS_KAL
+    # state (kkal, protein) terkuantisasi -> (kkal, protein, karbo, ((indeks, porsi), ...));
+    # untuk tiap state disimpan pilihan dengan karbo paling dekat ke target
+    state = {(0, 0): (0.0, 0.0, 0.0, ())}
+    for i, (_, _, kal, protein, karbo, maks, _) in enumerate(MAKANAN):
+        baru = dict(state)
+        for k0, p0, c0, porsi in state.values():
+            for n in range(1, maks + 1):
+                k1 = k0 + n * kal
+                if k1 > batas:
+                    break
+                p1, c1 = p0 + n * protein, c0 + n * karbo
+                kunci = (round(k1 / SATUAN_KAL), round(p1 / SATUAN_PROTEIN))
+                lama = baru.get(kunci)
+                if lama is None or abs(c1 - target[2]) < abs(lama[2] - target[2]):
+                    baru[kunci] = (k1, p1, c1, porsi + ((i, n),))
+        state = baru
+    terbaik = min((s for s in state.values() if s[3]), key=lambda s: _galat(s, target), default=None)
+    if terbaik is None:
+        # Kalori terlalu kecil untuk porsi mana pun di bawah batas: tetap sarankan satu porsi terkecil
+        i = min(range(len(MAKANAN)), key=lambda i: MAKANAN[i][2])
+        _, _, kal, protein, karbo, _, _ = MAKANAN[i]
+        terbaik = (kal, protein, karbo, ((i, 1),))
+    return terbaik, target
+
+
+def rencana(kkal, berat):
+    # Menu untuk kalori terbakar dan berat badan tertentu:
+    # {"menu": [(nama, porsi, jumlah, kkal, protein, karbo, keterangan)], "total": (kkal, protein, karbo),
+    #  "target": (kkal, protein, karbo)}
+    (k, p, c, porsi), target = _rencana(max(round(kkal / BUCKET_KAL), 1), max(round(berat / BUCKET_BERAT), 1))
+    menu = []
+    for i, n in porsi:
+        nama, ukuran, kal, protein, karbo, _, ket = MAKANAN[i]
+        menu.append((nama, ukuran, n, n * kal, n * protein, n * karbo, ket))
+    return {"menu": menu, "total": (k, p, c), "target": target}
@@ -0,0 +1,122 @@
+# Pelaksana pekerjaan latar belakang agar mainloop Tk tidak pernah terblokir.
+# Thread pool untuk I/O (baca file, database), process pool untuk hitungan berat per potongan.
+# Hasil, progres dan error dikirim lewat antrian yang dibaca UI thread dengan after().
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, CancelledError, wait, FIRST_COMPLETED
+
+
+class Dibatalkan(Exception):
+    pass
+
+
+class Pekerjaan:
+    def __init__(self, nama, antrian, on_selesai=None, on_progres=None, on_gagal=None):
+        self.nama = nama
+        self.antrian = antrian
+        self.on_selesai = on_selesai
+        self.on_progres = on_progres
+        self.on_gagal = on_gagal
+        self.batal = threading.Event()
+        self.futures = []
+
+    @property
+    def dibatalkan(self):
+        return self.batal.is_set()
+
+    def batalkan(self):
+        self.batal.set()
+        for f in self.futures:
+            f.cancel()
+
+    def cek_batal(self):
+        # Dipanggil fungsi pekerjaan di titik aman untuk berhenti lebih awal
+        if self.batal.is_set():
+            raise Dibatalkan(self.nama)
+
+    def progres(self, selesai, total, pesan=""):
+        # Aman dipanggil dari thread mana pun; UI menerimanya lewat antrian
+        self.antrian.put(("progres", self, (selesai, total, pesan)))
+
+
+class Pelaksana:
+    def __init__(self, widget, thread=4, proses=None, interval=50):
+        self.widget = widget
+        self.interval = interval
+        self.antrian = queue.Queue()
+        self.threads = ThreadPoolExecutor(max_workers=thread, thread_name_prefix="pekerjaan")
+        self.jumlah_proses = proses or os.cpu_count() or 1
+        self._proses = None  # process pool baru dibuat saat pertama dibutuhkan
+        self.aktif = set()
+        self._poll_id = None
+
+    @property
+    def proses(self):
+        if self._proses is None:
+            # spawn: proses anak tidak ikut menyalin state Tk dari proses utama
+            self._proses = ProcessPoolExecutor(max_workers=self.jumlah_proses,
+                                               mp_context=multiprocessing.get_context("spawn"))
+        return self._proses
+
+    def jalankan(self, nama, fn, *args, on_selesai=None, on_progres=None, on_gagal=None):
+        # fn(*args, job) berjalan di thread pool; callback dipanggil di UI thread
+        job = Pekerjaan(nama, self.antrian, on_selesai, on_progres, on_gagal)
+        self.aktif.add(job)
+        fut = self.threads.submit(fn, *args, job)
+        job.futures.append(fut)
+        fut.add_done_callback(lambda f: self._selesai(job, f))
+        if self._poll_id is None:
+            self._poll()
+        return job
+
+    def peta(self, fn, daftar_args, job):
+        # Sebar potongan ke process pool dari dalam fungsi pekerjaan; hasil dikembalikan berurutan
+        futures = [self.proses.submit(fn, *args) for args in daftar_args]
+        job.futures.extend(futures)
+        sisa, total = set(futures), len(futures)
+        while sisa:
+            job.cek_batal()
+            selesai, sisa = wait(sisa, timeout=0.1, return_when=FIRST_COMPLETED)
+            if selesai:
+                job.progres(total - len(sisa), total)
+        job.cek_batal()
+        return [f.result() for f in futures]
+
+    def _selesai(self, job, fut):
+        try:
+            hasil = fut.result()
+        except (Dibatalkan, CancelledError):
+            self.antrian.put(("batal", job, None))
+        except Exception as e:
+            self.antrian.put(("gagal", job, e))
+        else:
+            self.antrian.put(("selesai", job, hasil))
+
+    def _poll(self):
+        # Kosongkan antrian di UI thread, lalu jadwalkan ulang selama masih ada pekerjaan
+        try:
+            while True:
+                jenis, job, isi = self.antrian.get_nowait()
+                if jenis == "progres":
+                    if job.on_progres and not job.dibatalkan:
+                        job.on_progres(job, *isi)
+                    continue
+                self.aktif.discard(job)
+                if jenis == "selesai" and job.on_selesai:
+                    job.on_selesai(job, isi)
+                elif jenis == "gagal" and job.on_gagal:
+                    job.on_gagal(job, isi)
+                elif jenis == "batal" and job.on_gagal:
+                    job.on_gagal(job, None)
+        except queue.Empty:
+            pass
+        self._poll_id = self.widget.after(self.interval, self._poll) if self.aktif else None
+
+    def tutup(self):
+        for job in list(self.aktif):
+            job.batalkan()
+        self.threads.shutdown(wait=False, cancel_futures=True)
+        if self._proses is not None:
+            self._proses.shutdown(wait=False, cancel_futures=True)
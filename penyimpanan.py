@@ -0,0 +1,152 @@
+# Penyimpanan riwayat lari di SQLite (mode WAL), terindeks per tanggal.
+# Riwayat tidak dimuat saat startup; setiap tab/detail hanya mengambil tanggal yang dibutuhkan.
+import json
+import os
+import sqlite3
+
+DB_DEFAULT = os.path.join(os.path.expanduser("~"), ".run_analyzer_pro.db")
+
+SKEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id      INTEGER PRIMARY KEY,
+    tanggal TEXT NOT NULL,
+    time    TEXT NOT NULL,
+    jarak   REAL NOT NULL,
+    waktu   REAL NOT NULL,
+    pace    REAL NOT NULL,
+    speed   REAL NOT NULL,
+    kal     REAL NOT NULL,
+    target  REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_runs_tanggal ON runs(tanggal);
+CREATE TABLE IF NOT EXISTS harian (
+    tanggal TEXT PRIMARY KEY,
+    total   REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS targets (
+    tanggal TEXT PRIMARY KEY,
+    target  REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS checkpoint (
+    kunci TEXT PRIMARY KEY,
+    nilai TEXT NOT NULL
+);
+"""
+
+KOLOM_RUN = ["time", "jarak", "waktu", "pace", "speed", "kal", "target"]
+
+SQL_INSERT_RUN = ("INSERT INTO runs (tanggal, time, jarak, waktu, pace, speed, kal, target)"
+                  " VALUES (?,?,?,?,?,?,?,?)")
+SQL_TAMBAH_HARIAN = ("INSERT INTO harian VALUES (?,?)"
+                     " ON CONFLICT(tanggal) DO UPDATE SET total = total + excluded.total")
+
+
+def path_db():
+    return os.environ.get("RUN_ANALYZER_DB") or DB_DEFAULT
+
+
+class RiwayatDB:
+    def __init__(self, path=None):
+        self.path = path or path_db()
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SKEMA)
+        self._isi_harian()
+
+    def _isi_harian(self):
+        # Database lama tanpa tabel total harian: isi sekali dari runs
+        with self.conn:
+            if (self.conn.execute("SELECT 1 FROM harian LIMIT 1").fetchone() is None
+                    and not self.kosong()):
+                self.conn.execute(
+                    "INSERT INTO harian SELECT tanggal, SUM(jarak) FROM runs GROUP BY tanggal")
+
+    def close(self):
+        self.conn.close()
+
+    def simpan_lari(self, tanggal, run, target=None):
+        # Satu transaksi per analyze: lari baru + target harian. Mengembalikan id lari.
+        with self.conn:
+            cur = self.conn.execute(SQL_INSERT_RUN, (tanggal, *(run[k] for k in KOLOM_RUN)))
+            self.conn.execute(SQL_TAMBAH_HARIAN, (tanggal, run["jarak"]))
+            if target is not None:
+                self.conn.execute("INSERT OR REPLACE INTO targets VALUES (?,?)", (tanggal, target))
+        return cur.lastrowid
+
+    def tambah_banyak(self, runs, targets=()):
+        # runs: iterable tuple (tanggal, time, jarak, waktu, pace, speed, kal, target)
+        per_hari = {}
+
+        def catat(runs):
+            for r in runs:
+                per_hari[r[0]] = per_hari.get(r[0], 0) + r[2]
+                yield r
+
+        with self.conn:
+            self.conn.executemany(SQL_INSERT_RUN, catat(runs))
+            self.conn.executemany(SQL_TAMBAH_HARIAN, per_hari.items())
+            self.conn.executemany("INSERT OR REPLACE INTO targets VALUES (?,?)", targets)
+
+    def id_terakhir(self):
+        # Id lari terbaru (0 jika kosong): penanda apakah snapshot masih sesuai dengan database
+        return self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM runs").fetchone()[0]
+
+    def kosong(self):
+        return self.conn.execute("SELECT 1 FROM runs LIMIT 1").fetchone() is None
+
+    def lari(self, tanggal):
+        # Kolom mentah lari pada satu tanggal untuk rekaman.LariHarian (pace/speed diturunkan)
+        return self.conn.execute(
+            "SELECT time, jarak, waktu, kal, target FROM runs WHERE tanggal = ? ORDER BY id", (tanggal,))
+
+    def lari_sejak(self, id_lari):
+        # Lari dengan id > id_lari, untuk memutar ulang model setelah checkpoint
+        return self.conn.execute(
+            "SELECT id, tanggal, jarak, waktu, pace FROM runs WHERE id > ? ORDER BY id", (id_lari,))
+
+    def ringkasan_tanggal(self, sebelum=None, sejak=None, n=100):
+        # Satu halaman ringkasan per tanggal (terbaru dulu): paging lewat kunci tanggal,
+        # jumlah lari dihitung dari indeks runs(tanggal) hanya untuk tanggal di halaman ini
+        syarat, param = [], []
+        if sebelum is not None:
+            syarat.append("h.tanggal < ?")
+            param.append(sebelum)
+        if sejak is not None:
+            syarat.append("h.tanggal >= ?")
+            param.append(sejak)
+        where = f"WHERE {' AND '.join(syarat)}" if syarat else ""
+        return self.conn.execute(
+            "SELECT h.tanggal, (SELECT COUNT(*) FROM runs r WHERE r.tanggal = h.tanggal),"
+            " h.total, t.target FROM harian h LEFT JOIN targets t ON t.tanggal = h.tanggal"
+            f" {where} ORDER BY h.tanggal DESC LIMIT ?", (*param, n)).fetchall()
+
+    def total_jarak(self, tanggal):
+        row = self.conn.execute("SELECT total FROM harian WHERE tanggal = ?", (tanggal,)).fetchone()
+        return row[0] if row else 0
+
+    def total_per_tanggal(self):
+        # Satu baris per hari, untuk membangun indeks agregat
+        return self.conn.execute("SELECT tanggal, total FROM harian").fetchall()
+
+    def seri_harian(self):
+        # Total per hari (jarak, waktu, kalori) + target yang diset hari itu, untuk grafik tren
+        return self.conn.execute(
+            "SELECT r.tanggal, SUM(r.jarak), SUM(r.waktu), SUM(r.kal), t.target FROM runs r"
+            " LEFT JOIN targets t ON t.tanggal = r.tanggal GROUP BY r.tanggal ORDER BY r.tanggal")
+
+    def target(self, tanggal):
+        row = self.conn.execute("SELECT target FROM targets WHERE tanggal = ?", (tanggal,)).fetchone()
+        return row[0] if row else None
+
+    def target_terakhir(self):
+        row = self.conn.execute("SELECT target FROM targets ORDER BY tanggal DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def baca_checkpoint(self, kunci):
+        row = self.conn.execute("SELECT nilai FROM checkpoint WHERE kunci = ?", (kunci,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def simpan_checkpoint(self, kunci, nilai):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO checkpoint VALUES (?,?)", (kunci, json.dumps(nilai)))
@@ -0,0 +1,161 @@
+# Instrumentasi jalur panas: durasi per pemanggilan (histogram), jumlah widget dibuat/dihancurkan,
+# overlay p50/p95 (F12) dan trace JSON format Chrome (chrome://tracing / Perfetto).
+#   RUN_ANALYZER_PROFILE=1         aktifkan pengukuran
+#   RUN_ANALYZER_TRACE=trace.json  aktifkan + tulis trace saat aplikasi keluar
+# Jika tidak aktif, diukur() mengembalikan fungsi aslinya sehingga tidak ada biaya sama sekali.
+import atexit
+import functools
+import json
+import math
+import os
+import threading
+import time
+
+PATH_TRACE = os.environ.get("RUN_ANALYZER_TRACE")
+AKTIF = bool(os.environ.get("RUN_ANALYZER_PROFILE") or PATH_TRACE)
+
+
+class Histogram:
+    # Bucket logaritmik (lebar 10%) dari 1 mikrodetik: kuantil dengan galat relatif <= 10%
+    MIN = 1e-6
+    FAKTOR = 1.1
+
+    def __init__(self):
+        self.bucket = {}
+        self.n = 0
+        self.total = 0.0
+        self.maks = 0.0
+
+    def catat(self, detik):
+        i = int(math.log(max(detik, self.MIN) / self.MIN, self.FAKTOR))
+        self.bucket[i] = self.bucket.get(i, 0) + 1
+        self.n += 1
+        self.total += detik
+        self.maks = max(self.maks, detik)
+
+    def kuantil(self, q):
+        if not self.n:
+            return 0.0
+        batas, jalan = q * self.n, 0
+        for i in sorted(self.bucket):
+            jalan += self.bucket[i]
+            if jalan >= batas:
+                return min(self.MIN * self.FAKTOR ** (i + 1), self.maks)
+        return self.maks
+
+
+class Statistik:
+    def __init__(self):
+        self.waktu = Histogram()
+        self.dibuat = 0
+        self.dihancurkan = 0
+
+
+statistik = {}  # nama -> Statistik
+_widget = [0, 0]  # total widget dibuat, dihancurkan
+_trace = []
+_mulai = time.perf_counter()
+
+
+def catat(nama, t0, durasi, dibuat=0, dihancurkan=0):
+    s = statistik.get(nama)
+    if s is None:
+        s = statistik[nama] = Statistik()
+    s.waktu.catat(durasi)
+    s.dibuat += dibuat
+    s.dihancurkan += dihancurkan
+    if PATH_TRACE:
+        _trace.append({"name": nama, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+                       "ts": (t0 - _mulai) * 1e6, "dur": durasi * 1e6,
+                       "args": {"widget_dibuat": dibuat, "widget_dihancurkan": dihancurkan}})
+
+
+def diukur(nama=None):
+    def dekor(fn):
+        if not AKTIF:
+            return fn
+        label = nama or fn.__qualname__
+
+        @functools.wraps(fn)
+        def bungkus(*args, **kwargs):
+            dibuat, dihancurkan = _widget
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                catat(label, t0, time.perf_counter() - t0,
+                      _widget[0] - dibuat, _widget[1] - dihancurkan)
+        return bungkus
+    return dekor
+
+
+def ringkasan():
+    # [(nama, n, p50, p95, maks, widget dibuat, widget dihancurkan)], detik
+    return [(nama, s.waktu.n, s.waktu.kuantil(0.5), s.waktu.kuantil(0.95), s.waktu.maks,
+             s.dibuat, s.dihancurkan) for nama, s in sorted(statistik.items())]
+
+
+def tulis_trace(path=None):
+    path = path or PATH_TRACE
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": _trace, "displayTimeUnit": "ms"}, f)
+
+
+def _pasang_hitung_widget():
+    # Hitung widget lewat BaseWidget (dasar semua widget tk dan ttk)
+    import tkinter as tk
+    init, destroy = tk.BaseWidget.__init__, tk.BaseWidget.destroy
+
+    def __init__(self, *args, **kwargs):
+        _widget[0] += 1
+        init(self, *args, **kwargs)
+
+    def _destroy(self):
+        _widget[1] += 1
+        destroy(self)
+
+    tk.BaseWidget.__init__ = __init__
+    tk.BaseWidget.destroy = _destroy
+
+
+if AKTIF:
+    _pasang_hitung_widget()
+    if PATH_TRACE:
+        atexit.register(tulis_trace)
+
+
+def overlay(root):
+    # Jendela debug berisi p50/p95 tiap titik ukur, diperbarui setiap 500 ms
+    import tkinter as tk
+    from tkinter import ttk, messagebox
+
+    if not AKTIF:
+        return messagebox.showinfo("Performa", "Jalankan dengan RUN_ANALYZER_PROFILE=1 untuk mengaktifkan pengukuran")
+    win = getattr(root, "_overlay_profil", None)
+    if win is not None and win.winfo_exists():
+        return win.lift()
+
+    win = root._overlay_profil = tk.Toplevel(root)
+    win.title("Performa")
+    win.geometry("640x300")
+    kolom = [("nama", "Titik Ukur", 200), ("n", "n", 50), ("p50", "p50 (ms)", 80),
+             ("p95", "p95 (ms)", 80), ("maks", "maks (ms)", 80), ("widget", "Widget +/-", 100)]
+    tree = ttk.Treeview(win, columns=[k for k, _, _ in kolom], show="headings")
+    for key, judul, lebar in kolom:
+        tree.heading(key, text=judul)
+        tree.column(key, width=lebar, anchor="w" if key == "nama" else "e")
+    tree.pack(fill="both", expand=True)
+
+    def segarkan():
+        if not win.winfo_exists():
+            return
+        for nama, n, p50, p95, maks, dibuat, dihancurkan in ringkasan():
+            values = (nama, n, f"{p50 * 1e3:.2f}", f"{p95 * 1e3:.2f}", f"{maks * 1e3:.2f}",
+                      f"+{dibuat}/-{dihancurkan}")
+            if tree.exists(nama):
+                tree.item(nama, values=values)
+            else:
+                tree.insert("", "end", iid=nama, values=values)
+        win.after(500, segarkan)
+
+    segarkan()
@@ -0,0 +1,181 @@
+# Representasi riwayat lari yang ringkas di memori: satu set kolom array untuk semua tanggal yang
+# sudah dimuat, dan per tanggal hanya (ordinal, offset, jumlah) di tiga array terurut.
+# Jam disimpan sebagai menit sejak tengah malam; pace, kecepatan dan total harian dihitung saat dibaca.
+from array import array
+from bisect import bisect_left
+from datetime import date
+from itertools import accumulate, islice
+
+KOLOM = ("menit", "jarak", "waktu", "kal", "target")
+
+
+def ke_menit(jam):
+    # "HH:MM" (atau "HH:MM:SS", detik diabaikan) -> menit sejak tengah malam
+    h, m = jam.split(":")[:2]
+    h, m = int(h), int(m)
+    if not (0 <= h < 24 and 0 <= m < 60):
+        raise ValueError(f"jam tidak valid: {jam}")
+    return h * 60 + m
+
+
+def ke_jam(menit):
+    return f"{menit // 60:02d}:{menit % 60:02d}"
+
+
+class Lari:
+    # Tampilan satu lari (dibuat saat iterasi, tidak disimpan).
+    # item["time"] tetap didukung agar kode yang memakai bentuk dict lama tetap jalan.
+    __slots__ = ("menit", "jarak", "waktu", "kal", "target", "total_jarak_harian")
+
+    def __init__(self, menit, jarak, waktu, kal, target, total_jarak_harian):
+        self.menit = menit
+        self.jarak = jarak
+        self.waktu = waktu
+        self.kal = kal
+        self.target = target
+        self.total_jarak_harian = total_jarak_harian
+
+    @property
+    def time(self):
+        return ke_jam(self.menit)
+
+    @property
+    def pace(self):
+        return self.waktu / self.jarak
+
+    @property
+    def speed(self):
+        return (self.jarak / self.waktu) * 60
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+
+class LariHarian:
+    # Tampilan lari satu tanggal di kolom Riwayat (dibuat saat diakses, tidak disimpan)
+    __slots__ = ("riwayat", "ordinal")
+
+    def __init__(self, riwayat, ordinal):
+        self.riwayat = riwayat
+        self.ordinal = ordinal
+
+    def __len__(self):
+        return self.riwayat.rentang(self.ordinal)[1]
+
+    def total(self):
+        awal, n = self.riwayat.rentang(self.ordinal)
+        return sum(self.riwayat.jarak[awal:awal + n])
+
+    def tambah(self, time, jarak, waktu, kal, target=0.0):
+        self.riwayat.tambah_ordinal(self.ordinal, time, jarak, waktu, kal, target)
+
+    def baris(self, mulai=0, n=None):
+        # Iterasi Lari untuk indeks [mulai, mulai+n); total harian dihitung kumulatif
+        r = self.riwayat
+        awal, jumlah = r.rentang(self.ordinal)
+        akhir = awal + (jumlah if n is None else min(mulai + n, jumlah))
+        mulai += awal
+        jarak = r.jarak[mulai:akhir]
+        total = islice(accumulate(jarak, initial=sum(r.jarak[awal:mulai])), 1, None)
+        return map(Lari, r.menit[mulai:akhir], jarak, r.waktu[mulai:akhir],
+                   r.kal[mulai:akhir], r.target[mulai:akhir], total)
+
+    def __iter__(self):
+        return self.baris()
+
+
+class Riwayat:
+    # Lari per tanggal yang dimuat dari database saat pertama diakses. Lari satu tanggal menempati
+    # blok baris berurutan di kolom global; ~36 byte per lari + 12 byte per tanggal.
+    def __init__(self, muat):
+        self.muat = muat  # muat(tanggal) -> iterable (time, jarak, waktu, kal, target)
+        self.buang()
+
+    def _indeks(self, ordinal):
+        i = bisect_left(self.tanggal, ordinal)
+        return i if i < len(self.tanggal) and self.tanggal[i] == ordinal else -1
+
+    def rentang(self, ordinal):
+        # (offset baris pertama, jumlah lari) untuk tanggal yang sudah dimuat
+        i = self._indeks(ordinal)
+        return (self.awal[i], self.jumlah[i]) if i >= 0 else (0, 0)
+
+    def __getitem__(self, tanggal):
+        ordinal = date.fromisoformat(tanggal).toordinal()
+        if self._indeks(ordinal) < 0:
+            awal = len(self.jarak)
+            for row in self.muat(tanggal):
+                self._tulis(*row)
+            i = bisect_left(self.tanggal, ordinal)
+            self.tanggal.insert(i, ordinal)
+            self.awal.insert(i, awal)
+            self.jumlah.insert(i, len(self.jarak) - awal)
+        return LariHarian(self, ordinal)
+
+    def __contains__(self, tanggal):
+        return self._indeks(date.fromisoformat(tanggal).toordinal()) >= 0
+
+    def __len__(self):
+        # Jumlah lari yang sedang dimuat
+        return len(self.jarak) - self.sampah
+
+    def _tulis(self, menit, jarak, waktu, kal, target=0.0):
+        if isinstance(menit, str):
+            menit = ke_menit(menit)
+        self.menit.append(menit)
+        self.jarak.append(jarak)
+        self.waktu.append(waktu)
+        self.kal.append(kal)
+        self.target.append(target or 0.0)
+
+    def tambah(self, tanggal, time, jarak, waktu, kal, target=0.0):
+        self.tambah_ordinal(date.fromisoformat(tanggal).toordinal(), time, jarak, waktu, kal, target)
+
+    def tambah_ordinal(self, ordinal, time, jarak, waktu, kal, target=0.0):
+        i = self._indeks(ordinal)
+        if i < 0:
+            raise KeyError(date.fromordinal(ordinal).isoformat())
+        awal, n = self.awal[i], self.jumlah[i]
+        if awal + n != len(self.jarak):
+            # Blok tanggal ini tidak di ujung kolom: salin ke ujung, blok lama jadi sampah
+            for k in KOLOM:
+                kolom = getattr(self, k)
+                kolom.extend(kolom[awal:awal + n])
+            self.awal[i] = len(self.jarak) - n
+            self.sampah += n
+        self._tulis(time, jarak, waktu, kal, target)
+        self.jumlah[i] += 1
+        if self.sampah > len(self.jarak) // 2:
+            self._padatkan()
+
+    def _padatkan(self):
+        # Susun ulang kolom tanpa baris sampah, blok mengikuti urutan tanggal
+        baru = {k: array(getattr(self, k).typecode) for k in KOLOM}
+        for i, (awal, n) in enumerate(zip(self.awal, self.jumlah)):
+            self.awal[i] = len(baru["jarak"])
+            for k in KOLOM:
+                baru[k].extend(getattr(self, k)[awal:awal + n])
+        for k in KOLOM:
+            setattr(self, k, baru[k])
+        self.sampah = 0
+
+    def buang(self, tanggal=None):
+        # Lupakan cache (mis. setelah impor massal langsung ke database)
+        if tanggal is None:
+            self.menit = array("I")
+            self.jarak = array("d")
+            self.waktu = array("d")
+            self.kal = array("d")
+            self.target = array("d")
+            self.tanggal = array("i")  # ordinal tanggal yang dimuat, terurut
+            self.awal = array("I")
+            self.jumlah = array("I")
+            self.sampah = 0  # baris milik blok yang sudah dipindah/dibuang
+            return
+        i = self._indeks(date.fromisoformat(tanggal).toordinal())
+        if i >= 0:
+            self.sampah += self.jumlah[i]
+            for kolom in (self.tanggal, self.awal, self.jumlah):
+                del kolom[i]
+            if self.sampah > len(self.jarak) // 2:
+                self._padatkan()
@@ -0,0 +1,161 @@
+# Indeks rekor pribadi dan persentil tanpa memindai riwayat.
+# - Rekor per kategori jarak: heap berukuran tetap berisi waktu tercepat (estimasi dari pace)
+# - Pace terbaik per bulan
+# - Sketsa kuantil KLL (bisa digabung) untuk pace dan kecepatan
+import heapq
+import math
+import random
+
+from agregat import ke_tanggal
+
+# (label, km) - lari dihitung untuk kategori jika jaraknya minimal sejauh itu
+KATEGORI = [("1 km", 1.0), ("5 km", 5.0), ("10 km", 10.0),
+            ("Half Marathon", 21.0975), ("Marathon", 42.195)]
+TOP_K = 5
+
+
+class KLL:
+    # Sketsa kuantil KLL (Karnin-Lang-Liberty): memori O(k log(n/k)), galat rank ~ 1/k,
+    # dan dua sketsa bisa digabung (mis. dari beberapa atlet/perangkat).
+    C = 2 / 3
+
+    def __init__(self, k=200, seed=None):
+        self.k = k
+        self.n = 0
+        self.level = [[]]
+        self.rnd = random.Random(seed)
+        self._maks = self._kapasitas(0)
+
+    def _kapasitas(self, h):
+        tinggi = len(self.level) - h - 1
+        return int(math.ceil(self.C ** tinggi * self.k)) + 1
+
+    def _ukuran(self):
+        return sum(len(x) for x in self.level)
+
+    def tambah(self, x):
+        self.level[0].append(x)
+        self.n += 1
+        if self._ukuran() >= self._maks:
+            self._kompres()
+
+    def _kompres(self):
+        for h in range(len(self.level)):
+            if len(self.level[h]) >= self._kapasitas(h):
+                if h + 1 >= len(self.level):
+                    self.level.append([])
+                    self._maks = sum(self._kapasitas(i) for i in range(len(self.level)))
+                # Urutkan, ambil setiap elemen kedua (offset acak) ke level atas dengan bobot ganda
+                isi = sorted(self.level[h])
+                sisa = [isi.pop()] if len(isi) % 2 else []
+                self.level[h + 1].extend(isi[self.rnd.random() < 0.5::2])
+                self.level[h] = sisa
+                if self._ukuran() < self._maks:
+                    break
+
+    def gabung(self, lain):
+        while len(self.level) < len(lain.level):
+            self.level.append([])
+        for h, isi in enumerate(lain.level):
+            self.level[h].extend(isi)
+        self.n += lain.n
+        self._maks = sum(self._kapasitas(i) for i in range(len(self.level)))
+        while self._ukuran() >= self._maks:
+            self._kompres()
+
+    def rank(self, x):
+        # Perkiraan fraksi nilai <= x
+        if not self.n:
+            return 0.0
+        total = sum((1 << h) for h, isi in enumerate(self.level) for v in isi if v <= x)
+        return total / self.n
+
+    def kuantil(self, q):
+        berbobot = sorted((v, 1 << h) for h, isi in enumerate(self.level) for v in isi)
+        if not berbobot:
+            return None
+        batas, jalan = q * sum(w for _, w in berbobot), 0
+        for v, w in berbobot:
+            jalan += w
+            if jalan >= batas:
+                return v
+        return berbobot[-1][0]
+
+    def ke_dict(self):
+        return {"k": self.k, "n": self.n, "level": self.level}
+
+    @classmethod
+    def dari_dict(cls, d):
+        s = cls(d["k"])
+        s.n, s.level = d["n"], [list(x) for x in d["level"]]
+        s._maks = sum(s._kapasitas(i) for i in range(len(s.level)))
+        return s
+
+
+class IndeksRekor:
+    def __init__(self):
+        self.id_terakhir = 0
+        self.pb = {label: [] for label, _ in KATEGORI}  # heap (-detik, tanggal): TOP_K tercepat
+        self.bulan = {}  # "YYYY-MM" -> [pace terbaik, tanggal]
+        self.pace = KLL()
+        self.speed = KLL()
+
+    def tambah(self, tanggal, jarak, waktu, id_lari=None):
+        pace = waktu / jarak
+        for label, km in KATEGORI:
+            if jarak < km:
+                break
+            heap = self.pb[label]
+            item = (-pace * km * 60, tanggal)
+            if len(heap) < TOP_K:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+        bulan = tanggal[:7]
+        terbaik = self.bulan.get(bulan)
+        if terbaik is None or pace < terbaik[0]:
+            self.bulan[bulan] = [pace, tanggal]
+        self.pace.tambah(pace)
+        self.speed.tambah((jarak / waktu) * 60)
+        if id_lari is not None:
+            self.id_terakhir = max(self.id_terakhir, id_lari)
+
+    def perbarui_dari_db(self, db):
+        # Putar ulang hanya lari yang tersimpan setelah checkpoint
+        for id_lari, tanggal, jarak, waktu, _ in db.lari_sejak(self.id_terakhir):
+            self.tambah(tanggal, jarak, waktu, id_lari)
+
+    def tercepat(self, label):
+        # [(detik, tanggal)] tercepat dulu
+        return sorted((-d, t) for d, t in self.pb[label])
+
+    def terbaik_bulan(self, tanggal):
+        return self.bulan.get(str(ke_tanggal(tanggal))[:7])
+
+    def persentil_pace(self, pace):
+        # Persen lari yang lebih lambat dari pace ini (pace kecil = lebih cepat)
+        return 100 * (1 - self.pace.rank(pace)) if self.pace.n else 0.0
+
+    def persentil_speed(self, speed):
+        return 100 * self.speed.rank(speed) if self.speed.n else 0.0
+
+    def ke_dict(self):
+        return {"id_terakhir": self.id_terakhir, "pb": self.pb, "bulan": self.bulan,
+                "pace": self.pace.ke_dict(), "speed": self.speed.ke_dict()}
+
+    @classmethod
+    def dari_dict(cls, d):
+        r = cls()
+        if d:
+            r.id_terakhir = d["id_terakhir"]
+            r.pb = {k: [tuple(x) for x in v] for k, v in d["pb"].items()}
+            r.bulan = d["bulan"]
+            r.pace, r.speed = KLL.dari_dict(d["pace"]), KLL.dari_dict(d["speed"])
+        return r
+
+
+def format_durasi(detik):
+    detik = int(round(detik))
+    jam, sisa = divmod(detik, 3600)
+    menit, detik = divmod(sisa, 60)
+    return f"{jam}:{menit:02d}:{detik:02d}" if jam else f"{menit}:{detik:02d}"
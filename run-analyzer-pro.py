@@ -1,474 +1,556 @@
+import sqlite3
+import time
+T_MULAI = time.perf_counter()
+
+import sys
 import tkinter as tk 
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from datetime import datetime, date
 
-THEME = {
-    "dark": {"bg":"#1e1e2e","frame":"#2d3047","card":"#3d405b","fg":"white"},
-    "light":{"bg":"#f4f4f4","frame":"#ffffff","card":"#e6e6e6","fg":"black"}
-}
+# Modul berat (analisis/numpy, nutrisi, impor_gps, pekerjaan) diimpor di dalam method yang memakainya
+# dan dipanaskan setelah frame pertama, bukan saat startup
+import profil
+import snapshot
+from penyimpanan import RiwayatDB
+from agregat import IndeksJarak
+from rekaman import Riwayat
+from beban import ModelBeban, kondisi
+from rekor import IndeksRekor, KATEGORI, format_durasi
+from grafik import SeriHarian
+from tampilan import THEME, Tema, TabHasil, TabGizi, TabJadwal, TabTren, TabHistory, DaftarVirtual
+
+ATLET = "default"
+TAB_LAIN = ["Hasil", "Gizi", "Jadwal", "Tren", "History"]
+ANGGARAN_FRAME_PERTAMA = 0.5  # detik dari proses mulai sampai tab Input bisa dipakai
 
 class RunningApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, t_mulai=None):
         super().__init__()
+        self.t_mulai = t_mulai or time.perf_counter()
         self.title("Run Analyzer Pro")
         self.geometry("700x750")
         self.mode = "dark"
         self.vars = {x: tk.StringVar() for x in ["jarak","waktu","berat","target_jarak"]}
-        self.history = {}
-        self.daily_targets = {}  # Menyimpan target harian per tanggal
-        self.daily_distances = {}  # Menyimpan total jarak harian per tanggal
+        # Riwayat, target dan jarak harian disimpan di SQLite, dibaca per tanggal saat dibutuhkan
+        self.db = RiwayatDB()
+        # Cache riwayat per tanggal dalam bentuk kolom array (dimuat saat tanggal dibuka)
+        self.history = Riwayat(self.db.lari)
+        # Indeks jarak per tanggal dan seri harian grafik dari snapshot biner (mmap) jika masih
+        # sesuai dengan database; jika tidak, indeks dibangun dari tabel harian dan seri menunggu tab Tren.
+        # id_agregat = id lari terakhir yang sudah masuk agregat, dipakai sebagai cap snapshot saat tutup
+        self.id_agregat = self.db.id_terakhir()
+        snap = snapshot.baca(snapshot.path_snapshot(self.db.path), self.id_agregat)
+        if snap is not None:
+            self.indeks, self.seri, target_terakhir = snap["indeks"], snap["seri"], snap["target"]
+        else:
+            self.indeks, self.seri = IndeksJarak(self.db.total_per_tanggal()), None
+            target_terakhir = self.db.target_terakhir()
+        if target_terakhir is not None:
+            self.target_jarak = target_terakhir
+        # Model beban/rekor, tab selain Input dan pool pekerjaan disiapkan setelah frame pertama
+        self.siap = False
+        self.history_basi = False  # tab History perlu dimuat ulang dari awal (setelah impor)
+        self._jobs = None
+        self.job = None
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        # F12: overlay latensi p50/p95 (aktif dengan RUN_ANALYZER_PROFILE=1)
+        self.bind("<F12>", lambda e: profil.overlay(self))
         self.make_gui()
         self.apply_theme()
+        self.after_idle(self.frame_pertama)
+
+    def frame_pertama(self):
+        durasi = time.perf_counter() - self.t_mulai
+        if profil.AKTIF:
+            profil.catat("startup/frame_pertama", self.t_mulai, durasi)
+        if durasi > ANGGARAN_FRAME_PERTAMA:
+            print(f"Peringatan: frame pertama {durasi * 1e3:.0f} ms"
+                  f" (anggaran {ANGGARAN_FRAME_PERTAMA * 1e3:.0f} ms)", file=sys.stderr)
+        # Beri kesempatan event input diproses dulu sebelum pekerjaan startup sisanya
+        self.after(1, self.selesaikan_startup)
+
+    @profil.diukur()
+    def selesaikan_startup(self):
+        # Idempoten: dipanggil setelah frame pertama, atau lebih awal oleh aksi yang membutuhkannya
+        if self.siap:
+            return
+        self.siap = True
+        # Model beban latihan dari checkpoint; hanya lari setelah checkpoint yang diputar ulang
+        self.beban = ModelBeban.dari_dict(self.db.baca_checkpoint("beban"))
+        self.beban.perbarui_dari_db(self.db, ATLET)
+        # Rekor pribadi dan sketsa persentil, juga dari checkpoint
+        self.rekor = IndeksRekor.dari_dict(self.db.baca_checkpoint("rekor"))
+        self.rekor.perbarui_dari_db(self.db)
+        self.make_tabs()
+        # Panaskan impor agar klik Analisis pertama tidak menunggu numpy
+        import analisis, nutrisi
+
+    @property
+    def jobs(self):
+        # Pekerjaan berat (impor, analisis batch) berjalan di thread/process pool, dibuat saat pertama dipakai
+        if self._jobs is None:
+            from pekerjaan import Pelaksana
+            self._jobs = Pelaksana(self)
+        return self._jobs
 
     def make_gui(self):
-        self.title_lbl = tk.Label(self, text="RUN ANALYZER PRO", font=("Arial",18,"bold"))
+        # Semua widget berwarna didaftarkan ke Tema agar toggle cukup configure massal
+        self.tema = Tema(self.mode)
+        self.title_lbl = self.tema.buat(tk.Label, self, text="RUN ANALYZER PRO", font=("Arial",18,"bold"),
+                                        bg="bg", fg="fg")
         self.title_lbl.pack(pady=20)
 
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(expand=True, fill="both", padx=20, pady=10)
         
-        self.tabs = {}
-        for name in ["Input","Hasil","Gizi","Jadwal","History"]:
+        # Hanya tab Input yang dibuat sebelum frame pertama; tab lain menyusul di make_tabs()
+        self.tabs = {"Input": ttk.Frame(self.notebook)}
+        self.notebook.add(self.tabs["Input"], text="Input")
+        self.views = {}
+        self.renderers = {}
+        # Tab kotor dirender ulang hanya saat terlihat; riwayat tersimpan bisa langsung dibuka
+        self.dirty = {"History", "Tren"}
+        self.notebook.bind("<<NotebookTabChanged>>", lambda e: self.render_visible())
+
+        self.make_input_tab()
+        self.toggle_btn = tk.Button(self, text="Toggle Theme", command=self.toggle_theme)
+        self.toggle_btn.pack(pady=5)
+
+        # Indikator progres pekerjaan latar belakang (disembunyikan jika tidak ada)
+        self.progres_frame = self.tema.buat(tk.Frame, self, bg="bg")
+        self.progres_bar = ttk.Progressbar(self.progres_frame, mode="determinate")
+        self.progres_bar.pack(side="left", fill="x", expand=True)
+        self.progres_lbl = self.tema.buat(tk.Label, self.progres_frame, bg="bg", fg="fg", font=("Arial",9))
+        self.progres_lbl.pack(side="left", padx=10)
+        tk.Button(self.progres_frame, text="Batal", command=lambda: self.job and self.job.batalkan()).pack(side="right")
+
+    def make_tabs(self):
+        for name in TAB_LAIN:
             self.tabs[name] = ttk.Frame(self.notebook)
             self.notebook.add(self.tabs[name], text=name)
 
-        self.make_input_tab()
-        tk.Button(self, text="Toggle Theme", command=self.toggle_theme).pack(pady=5)
+        # Tab hasil dibangun sekali saat pertama ditampilkan, lalu hanya diperbarui.
+        # Setiap tab punya Tema sendiri agar ganti tema juga bisa ditunda sampai tab terlihat.
+        self.views = {
+            "Hasil": TabHasil(self.tabs["Hasil"], Tema(self.mode)),
+            "Gizi": TabGizi(self.tabs["Gizi"], Tema(self.mode)),
+            "Jadwal": TabJadwal(self.tabs["Jadwal"], Tema(self.mode)),
+            "Tren": TabTren(self.tabs["Tren"], Tema(self.mode)),
+            "History": TabHistory(self.tabs["History"], Tema(self.mode))
+        }
+        self.renderers = {
+            "Hasil": self.show_hasil,
+            "Gizi": self.show_gizi,
+            "Jadwal": self.show_jadwal,
+            "Tren": self.show_tren,
+            "History": self.show_history
+        }
 
+    @profil.diukur()
     def apply_theme(self):
-        t = THEME[self.mode]
-        self.configure(bg=t["bg"])
-        self.title_lbl.configure(bg=t["bg"], fg=t["fg"])
-        for tab in self.tabs.values():
-            for widget in tab.winfo_children(): 
-                widget.destroy()
-        self.make_input_tab()
-        if hasattr(self, "pace"): 
-            self.show_all()
+        self.configure(bg=THEME[self.mode]["bg"])
+        self.tema.terapkan(self.mode)
+        # Tab lain menyusul saat ditampilkan (mode Tema-nya berbeda = kotor)
+        self.render_visible()
+
+    @profil.diukur()
+    def render_visible(self):
+        name = self.notebook.tab(self.notebook.select(), "text")
+        view = self.views.get(name)
+        if view is None:
+            return
+        if view.tema.mode != self.mode:
+            view.tema.terapkan(self.mode)
+        if name in self.dirty:
+            # Tanda kotor baru dibuang setelah render berhasil, agar tab yang gagal dicoba lagi
+            self.renderers[name]()
+            self.dirty.discard(name)
+
+    def on_close(self):
+        if self._jobs is not None:
+            self._jobs.tutup()
+        if self.siap:
+            self.simpan_checkpoint()
+        # Snapshot agregat untuk startup berikutnya, dicap dengan id lari yang benar-benar tercakup;
+        # lari yang ditulis proses lain membuat cap ini tertinggal sehingga snapshot ditolak
+        try:
+            snapshot.tulis(snapshot.path_snapshot(self.db.path), self.id_agregat, self.indeks,
+                           self.seri, getattr(self, "target_jarak", None))
+        except OSError as e:
+            print(f"Snapshot tidak tersimpan: {e}", file=sys.stderr)
+        self.db.close()
+        self.destroy()
+
+    def simpan_checkpoint(self):
+        self.db.simpan_checkpoint("beban", self.beban.ke_dict())
+        self.db.simpan_checkpoint("rekor", self.rekor.ke_dict())
 
     def toggle_theme(self):
         self.mode = "light" if self.mode=="dark" else "dark"
         self.apply_theme()
 
+    @profil.diukur()
     def make_input_tab(self):
-        t = THEME[self.mode]
-        f = tk.Frame(self.tabs["Input"], bg=t["frame"], padx=25, pady=25)
+        b = self.tema.buat
+        f = b(tk.Frame, self.tabs["Input"], bg="frame", padx=25, pady=25)
         f.pack(expand=True, fill="both")
 
         labels = ["Jarak (km)", "Waktu (menit)", "Berat (kg)", "Target Jarak Harian (km)"]
         keys = ["jarak", "waktu", "berat", "target_jarak"]
         
         for label, key in zip(labels, keys):
-            tk.Label(f, text=label, bg=t["frame"], fg=t["fg"]).pack(anchor="w", pady=(5,0))
-            tk.Entry(f, textvariable=self.vars[key], font=("Arial",12),
-                     bg=t["card"], fg=t["fg"]).pack(fill="x", pady=3)
+            b(tk.Label, f, text=label, bg="frame", fg="fg").pack(anchor="w", pady=(5,0))
+            b(tk.Entry, f, textvariable=self.vars[key], font=("Arial",12),
+              bg="card", fg="fg").pack(fill="x", pady=3)
 
         tk.Button(f, text="Analisis", command=self.analyze,
                   bg="#ff6b6b", fg="white", font=("Arial",11,"bold"),
                   pady=8).pack(fill="x", pady=20)
 
+        tk.Button(f, text="Impor Data (CSV/GPX/TCX/JSONL/RAC)", command=self.impor_data,
+                  font=("Arial",10), pady=4).pack(fill="x")
+
+        tk.Button(f, text="Ekspor Riwayat (CSV/JSONL/RAC)", command=self.ekspor_data,
+                  font=("Arial",10), pady=4).pack(fill="x", pady=(5,0))
+
+    @profil.diukur()
     def analyze(self):
+        import analisis
+        self.selesaikan_startup()
         try:
-            j = float(self.vars["jarak"].get())
-            w = float(self.vars["waktu"].get())
-            b = float(self.vars["berat"].get())
-            t = float(self.vars["target_jarak"].get()) if self.vars["target_jarak"].get().strip() else None
-            if min(j,w,b) <= 0: raise ValueError
-            if t is not None and t <= 0: raise ValueError
+            j, w, b, t = analisis.validasi(*(self.vars[k].get() for k in ["jarak","waktu","berat","target_jarak"]))
         except:
             return messagebox.showerror("Error","Input tidak valid!")
+        if self.job is not None and self.job.nama == "Impor":
+            # Impor menulis ke database dalam transaksi panjang di koneksinya sendiri; menulis dari
+            # UI thread sekarang akan menunggu kunci database dan membekukan jendela
+            return messagebox.showinfo("Analisis", "Impor masih berjalan, analisis setelah impor selesai")
         
         today = date.today().strftime("%Y-%m-%d")
-        self.pace = w/j
-        self.speed = (j/w)*60
-        self.kal = j*b*1.036
-        
-        # Simpan target harian jika ada input target
-        if t is not None:
-            self.daily_targets[today] = t
-            self.target_jarak = t
-        else:
-            # Gunakan target terakhir jika ada, atau gunakan target saat ini
-            if today in self.daily_targets:
-                self.target_jarak = self.daily_targets[today]
-            elif hasattr(self, 'target_jarak'):
-                self.daily_targets[today] = self.target_jarak
-            else:
-                self.target_jarak = 0
-        
-        # Akumulasi jarak harian
-        if today not in self.daily_distances:
-            self.daily_distances[today] = 0
-        self.daily_distances[today] += j
-        
-        # Hitung total jarak hari ini
-        total_jarak_hari_ini = self.daily_distances[today]
+        pace, speed, kal = analisis.hitung(j, w, b)
+        jam = datetime.now().strftime("%H:%M")
         
-        if today not in self.history:
-            self.history[today] = []
+        # Target baru, target yang sudah tersimpan hari ini, atau target terakhir
+        target_jarak, target_harian = analisis.pilih_target(
+            t, self.db.target(today), getattr(self, "target_jarak", None))
         
-        self.history[today].append({
-            "time": datetime.now().strftime("%H:%M"),
-            "jarak": j,
-            "waktu": w,
-            "pace": self.pace,
-            "speed": self.speed,
-            "kal": self.kal,
-            "target": self.target_jarak,
-            "total_jarak_harian": total_jarak_hari_ini
-        })
+        # Satu transaksi: lari baru + target harian (total harian dihitung dari indeks tanggal)
+        try:
+            id_lari = self.db.simpan_lari(today, {
+                "time": jam,
+                "jarak": j,
+                "waktu": w,
+                "pace": pace,
+                "speed": speed,
+                "kal": kal,
+                "target": target_jarak
+            }, target_harian)
+        except sqlite3.OperationalError as e:
+            # Mis. database dikunci proses lain (analisis.py/impor_gps.py --db): lari tidak tersimpan
+            # dan state aplikasi tidak diubah, pengguna bisa menekan Analisis lagi
+            return messagebox.showerror("Error", f"Lari tidak tersimpan: {e}")
+        # State diubah setelah lari tersimpan. Input lari ini disimpan: tab yang dirender belakangan
+        # tidak membaca ulang Entry yang mungkin sudah diubah atau dikosongkan
+        self.pace, self.speed, self.kal = pace, speed, kal
+        self.jarak, self.berat, self.jam = j, b, jam
+        self.target_jarak = target_jarak
+        if id_lari != self.id_agregat + 1:
+            # Ada lari yang ditulis proses lain (analisis.py/impor_gps.py --db) sejak agregat dibangun:
+            # bangun ulang dari database, lari ini sudah termasuk
+            self.bangun_ulang_agregat()
+        else:
+            self.id_agregat = id_lari
+            self.indeks.tambah(today, j)
+            self.beban.tambah(ATLET, today, w, self.pace, id_lari)
+            self.rekor.tambah(today, j, w, id_lari)
+            # Cache hanya ditambah jika tanggal ini sudah dimuat; jika belum, dimuat lengkap saat dibuka
+            if today in self.history:
+                self.history.tambah(today, jam, j, w, self.kal, self.target_jarak)
+            if self.seri is not None:
+                self.seri.tambah(today, j, w, self.kal, self.target_jarak)
         
         self.show_all()
-        self.notebook.select(1)
+
+    def bangun_ulang_agregat(self):
+        # Id dibaca sebelum membangun: cap snapshot tidak pernah melebihi isi agregat (jika ada lari
+        # baru di antaranya, snapshot hanya akan ditolak dan dibangun ulang saat startup)
+        self.id_agregat = self.db.id_terakhir()
+        self.indeks = IndeksJarak(self.db.total_per_tanggal())
+        self.history.buang()
+        self.seri = None
+        self.beban.perbarui_dari_db(self.db, ATLET)
+        self.rekor.perbarui_dari_db(self.db)
+
+    def impor_data(self):
+        self.selesaikan_startup()
+        if self.job is not None:
+            return messagebox.showinfo("Impor", "Impor lain masih berjalan")
+        paths = filedialog.askopenfilenames(
+            parent=self, title="Pilih data lari",
+            filetypes=[("Data lari", "*.csv *.gpx *.tcx *.jsonl *.rac"), ("Semua file", "*.*")])
+        if not paths:
+            return
+        berat = None
+        if any(p.lower().endswith((".gpx", ".tcx")) for p in paths):
+            # GPX/TCX tidak memuat berat badan, ambil dari tab Input untuk hitung kalori
+            try:
+                berat = float(self.vars["berat"].get())
+                if berat <= 0: raise ValueError
+            except ValueError:
+                return messagebox.showerror("Error","Isi berat badan di tab Input untuk impor GPX/TCX")
+
+        self.job = self.jobs.jalankan("Impor", self.impor_berkas, list(paths), berat,
+                                      on_selesai=self.impor_selesai, on_progres=self.impor_progres,
+                                      on_gagal=self.impor_gagal)
+        self.tampilkan_progres("Mengimpor...")
+
+    def tampilkan_progres(self, pesan):
+        self.progres_bar.configure(value=0, maximum=1)
+        self.progres_lbl.configure(text=pesan)
+        self.progres_frame.pack(fill="x", padx=20, before=self.toggle_btn)
+
+    def impor_berkas(self, paths, berat, job):
+        # Berjalan di thread pekerjaan: hanya boleh menyentuh file dan database, bukan widget Tk
+        import analisis, ekspor, impor_gps
+        jumlah = 0
+        # Hasil ekspor aplikasi ini (CSV ekspor, JSONL, RAC) sudah berisi pace/kalori: impor massal langsung
+        hasil_ekspor = [p for p in paths if ekspor.cocok(p)]
+        if hasil_ekspor:
+            db = RiwayatDB(self.db.path)
+            try:
+                for path in hasil_ekspor:
+                    jumlah += ekspor.impor(path, db, progres=job.progres, batal=job.batal)
+                    job.cek_batal()
+            finally:
+                db.close()
+        paths = [p for p in paths if p not in hasil_ekspor]
+
+        for path in paths:
+            if not path.lower().endswith(".csv"):
+                continue
+            # CSV dibagi per rentang byte; parsing + hitungan tiap potongan di process pool
+            header, potongan = analisis.potong_csv(path, self.jobs.jumlah_proses * 4)
+            if not potongan:
+                continue
+            bagian = self.jobs.peta(analisis.analisis_potongan,
+                                    [(path, header, a, b) for a, b in potongan], job)
+            data = analisis.gabung([b[0] for b in bagian])
+            hasil = analisis.gabung([b[1] for b in bagian])
+            harian = analisis.total_harian(data["tanggal"], data["jarak"], data["target"])
+            job.cek_batal()
+            analisis.simpan_db(self.db.path, data, hasil, harian)
+            jumlah += len(data["jarak"])
+
+        gps = [p for p in paths if not p.lower().endswith(".csv")]
+        if gps:
+            db = RiwayatDB(self.db.path)
+            try:
+                tracks, _, _ = impor_gps.impor(gps, berat, db, progres=job.progres, batal=job.batal)
+            finally:
+                db.close()
+            job.cek_batal()
+            jumlah += len(tracks)
+        return jumlah
+
+    def impor_progres(self, job, selesai, total, pesan=""):
+        self.progres_bar.configure(maximum=total, value=selesai)
+        self.progres_lbl.configure(text=pesan or f"{selesai}/{total}")
+
+    def impor_selesai(self, job, jumlah):
+        self.impor_akhir()
+        self.muat_ulang_riwayat()
+        messagebox.showinfo("Impor", f"{jumlah} lari berhasil diimpor")
+
+    def impor_gagal(self, job, err):
+        self.impor_akhir()
+        # Berkas yang selesai sebelum batal/galat sudah tersimpan di database
+        self.muat_ulang_riwayat()
+        if err is None:
+            messagebox.showinfo("Impor", "Impor dibatalkan")
+        else:
+            messagebox.showerror("Error", f"Impor gagal: {err}")
+
+    def muat_ulang_riwayat(self):
+        # Data baru masuk langsung ke database: bangun ulang indeks dan kosongkan cache
+        self.bangun_ulang_agregat()
+        self.simpan_checkpoint()
+        target_terakhir = self.db.target_terakhir()
+        if target_terakhir is not None:
+            self.target_jarak = target_terakhir
+        # Tanggal impor bisa lebih lama dari baris teratas History: daftar dimuat ulang dari awal
+        self.history_basi = True
+        self.dirty.update(self.views if hasattr(self, "pace") else ["History", "Tren"])
+        self.render_visible()
+
+    def ekspor_data(self):
+        if self.job is not None:
+            return messagebox.showinfo("Ekspor", "Pekerjaan lain masih berjalan")
+        path = filedialog.asksaveasfilename(
+            parent=self, title="Ekspor riwayat", defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl"), ("Kolom biner", "*.rac")])
+        if not path:
+            return
+        self.job = self.jobs.jalankan("Ekspor", self.ekspor_berkas, path,
+                                      on_selesai=self.ekspor_selesai, on_progres=self.impor_progres,
+                                      on_gagal=self.ekspor_gagal)
+        self.tampilkan_progres("Mengekspor...")
+
+    def ekspor_berkas(self, path, job):
+        # Thread pekerjaan: koneksi sendiri, data dialirkan per potongan ke file
+        import ekspor
+        db = RiwayatDB(self.db.path)
+        try:
+            jumlah = ekspor.ekspor(db, path, progres=job.progres, batal=job.batal)
+        finally:
+            db.close()
+        job.cek_batal()
+        return path, jumlah
+
+    def ekspor_selesai(self, job, hasil):
+        self.impor_akhir()
+        path, jumlah = hasil
+        messagebox.showinfo("Ekspor", f"{jumlah} lari diekspor ke {path}")
+
+    def ekspor_gagal(self, job, err):
+        self.impor_akhir()
+        if err is None:
+            messagebox.showinfo("Ekspor", "Ekspor dibatalkan")
+        else:
+            messagebox.showerror("Error", f"Ekspor gagal: {err}")
+
+    def impor_akhir(self):
+        self.job = None
+        self.progres_frame.pack_forget()
 
     def show_all(self):
-        self.show_hasil()
-        self.show_gizi()
-        self.show_jadwal()
-        self.show_history()
+        # Semua tab hasil ditandai kotor, tapi hanya tab Hasil yang langsung dirender
+        self.dirty.update(self.views)
+        self.notebook.select(1)
+        self.render_visible()
 
+    @profil.diukur()
     def show_hasil(self):
-        t = THEME[self.mode]
-        tab = self.tabs["Hasil"]
-        for w in tab.winfo_children(): w.destroy()
-        
-        f = tk.Frame(tab, bg=t["frame"], padx=25, pady=25)
-        f.pack(fill="both", expand=True)
-        
-        tk.Label(f, text="HASIL ANALISIS", bg=t["frame"],
-                 fg="#ffd166", font=("Arial",14,"bold")).pack(pady=(0,20))
-        
-        data = [
-            ("Pace", f"{self.pace:.2f} menit/km"),
-            ("Kecepatan", f"{self.speed:.1f} km/jam"),
-            ("Kalori Terbakar", f"{self.kal:.0f} kalori")
+        # Semua dari indeks rekor dan sketsa: tidak ada pemindaian riwayat
+        terbaik = self.rekor.terbaik_bulan(date.today())
+        rekor = [
+            ("Persentil Pace", f"lebih cepat dari {self.rekor.persentil_pace(self.pace):.0f}% lari"),
+            ("Persentil Kecepatan", f"P{self.rekor.persentil_speed(self.speed):.0f}"),
+            ("Pace Terbaik Bulan Ini", f"{terbaik[0]:.2f} menit/km ({terbaik[1]})" if terbaik else "-"),
         ]
-        
-        for label, value in data:
-            frame = tk.Frame(f, bg=t["card"], padx=15, pady=10)
-            frame.pack(fill="x", pady=5)
-            tk.Label(frame, text=label, bg=t["card"], fg=t["fg"],
-                     font=("Arial",11)).pack(side="left")
-            tk.Label(frame, text=value, bg=t["card"], fg="#4ecdc4",
-                     font=("Arial",11,"bold")).pack(side="right")
+        for label, _ in KATEGORI:
+            tercepat = self.rekor.tercepat(label)
+            rekor.append((f"Tercepat {label}",
+                          f"{format_durasi(tercepat[0][0])} ({tercepat[0][1]})" if tercepat else "-"))
+        self.views["Hasil"].update(self.pace, self.speed, self.kal, rekor)
 
+    @profil.diukur()
     def show_gizi(self):
-        t = THEME[self.mode]
-        tab = self.tabs["Gizi"]
-        for w in tab.winfo_children(): w.destroy()
-        
-        # Buat main frame dengan scrollbar
-        main_frame = tk.Frame(tab, bg=t["frame"])
-        main_frame.pack(fill="both", expand=True)
-        
-        # Buat canvas untuk scroll dengan width yang cukup
-        canvas = tk.Canvas(main_frame, bg=t["frame"], highlightthickness=0)
-        scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg=t["frame"], width=650)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        # Pack canvas dan scrollbar
-        canvas.pack(side="left", fill="both", expand=True, padx=(25,0), pady=25)
-        scrollbar.pack(side="right", fill="y", pady=25)
-        
-        # Bind mouse wheel untuk scroll
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
-        
-        # Kontainer utama untuk konten di tengah
-        container = tk.Frame(scrollable_frame, bg=t["frame"])
-        container.pack(expand=True, fill="both", padx=20, pady=10)
-        
-        # Judul di tengah
-        tk.Label(container, text="PROGRES & NUTRISI", bg=t["frame"],
-                 fg="#ffd166", font=("Arial",14,"bold")).pack(pady=(0,25))
-        
-        if hasattr(self, 'target_jarak') and self.target_jarak > 0:
-            today = date.today().strftime("%Y-%m-%d")
-            
-            # Gunakan target terbaru untuk hari ini
-            current_target = self.daily_targets.get(today, self.target_jarak)
-            
-            # Hitung total jarak hari ini
-            total_jarak_hari_ini = self.daily_distances.get(today, 0)
-            
-            # Ambil data dari input terbaru
-            jarak_sekarang = float(self.vars["jarak"].get())
-            
-            # Hitung progress berdasarkan akumulasi
-            sisa_jarak = current_target - total_jarak_hari_ini
-            persentase = (total_jarak_hari_ini / current_target) * 100 if current_target > 0 else 0
-            
-            # Container untuk progres target (di tengah)
-            progress_container = tk.Frame(container, bg=t["frame"])
-            progress_container.pack(fill="x", pady=(0,20))
-            
-            # Judul progres di tengah
-            tk.Label(progress_container, text="PROGRES TARGET LARI HARIAN", bg=t["frame"],
-                     fg=t["fg"], font=("Arial",12,"bold")).pack(pady=(0,15))
-            
-            # Data progres dengan layout terpusat
-            data_progres = [
-                ("Target Harian", f"{current_target:.1f} km"),
-                ("Jarak Hari Ini", f"{total_jarak_hari_ini:.1f} km"),
-                ("Sisa Jarak", f"{abs(sisa_jarak):.2f} km"),
-                ("Persentase", f"{persentase:.1f}%")
-            ]
-            
-            # Frame untuk grid data progres
-            progress_grid = tk.Frame(progress_container, bg=t["frame"])
-            progress_grid.pack()
-            
-            for i, (label, value) in enumerate(data_progres):
-                row_frame = tk.Frame(progress_grid, bg=t["card"], padx=25, pady=12)
-                row_frame.grid(row=i, column=0, sticky="ew", pady=3, padx=50)
-                
-                # Label
-                tk.Label(row_frame, text=label, bg=t["card"], fg=t["fg"],
-                         font=("Arial",11), width=20, anchor="center").pack(side="left", expand=True)
-                
-                # Separator
-                tk.Label(row_frame, text=":", bg=t["card"], fg=t["fg"],
-                         font=("Arial",11), padx=10).pack(side="left")
-                
-                # Value
-                tk.Label(row_frame, text=value, bg=t["card"], fg="#4ecdc4",
-                         font=("Arial",11,"bold"), width=15, anchor="center").pack(side="left", expand=True)
-            
-            # Status target di tengah
-            status_container = tk.Frame(container, bg=t["card"], padx=30, pady=15)
-            status_container.pack(fill="x", pady=15, padx=80)
-            
-            if sisa_jarak <= 0:
-                tk.Label(status_container, text="🎯 TARGET HARIAN TERCAPAI!", bg=t["card"], fg="#4ecdc4",
-                         font=("Arial",12,"bold")).pack()
-                tk.Label(status_container, text=f"Total lari hari ini: {total_jarak_hari_ini:.1f} km (Target: {current_target:.1f} km)", 
-                         bg=t["card"], fg="#4ecdc4", font=("Arial",10)).pack(pady=(5,0))
-                
-                # Pesan khusus jika melebihi target
-                if total_jarak_hari_ini > current_target:
-                    excess = total_jarak_hari_ini - current_target
-                    tk.Label(status_container, text=f"⭐ Anda telah melewati target harian sebesar {excess:.1f} km!",
-                             bg=t["card"], fg="#ffd166", font=("Arial",10, "bold")).pack(pady=(5,0))
-            else:
-                tk.Label(status_container, text="📊 BELUM TERCAPAI", bg=t["card"], fg="#ff6b6b",
-                         font=("Arial",12,"bold")).pack()
-                tk.Label(status_container, text=f"Kurang {sisa_jarak:.2f} km untuk capai target harian", 
-                         bg=t["card"], fg="#ff6b6b", font=("Arial",10)).pack(pady=(5,0))
-                tk.Label(status_container, text=f"Progress: {persentase:.1f}% dari {current_target:.1f} km",
-                         bg=t["card"], fg="#888", font=("Arial",9)).pack(pady=(2,0))
-            
-            # Kalori terbakar di tengah
-            tk.Label(container, text="KALORI TERBAKAR", bg=t["frame"],
-                     fg=t["fg"], font=("Arial",12,"bold")).pack(pady=(20,10))
-            
-            kal_container = tk.Frame(container, bg=t["card"], padx=30, pady=15)
-            kal_container.pack(fill="x", pady=5, padx=150)
-            tk.Label(kal_container, text=f"{self.kal:.0f} kalori", bg=t["card"], fg="#ff6b6b",
-                     font=("Arial",14,"bold")).pack()
-            
-            # Informasi input terbaru
-            info_frame = tk.Frame(container, bg=t["card"], padx=15, pady=10)
-            info_frame.pack(fill="x", pady=10, padx=80)
-            tk.Label(info_frame, text=f"Input terbaru: {jarak_sekarang:.1f} km pada {datetime.now().strftime('%H:%M')}",
-                     bg=t["card"], fg="#888", font=("Arial",9)).pack()
-            
-            # Rekomendasi makanan fokus protein & karbohidrat
-            tk.Label(container, text="REKOMENDASI NUTRISI", bg=t["frame"],
-                     fg=t["fg"], font=("Arial",12,"bold")).pack(pady=(25,15))
-            
-            makanan = [
-                ("Dada Ayam (100g)", "31g protein", "Protein tinggi, rendah lemak"),
-                ("Telur (2 butir)", "13g protein", "Protein lengkap, mudah dicerna"),
-                ("Salmon (100g)", "25g protein", "Protein + Omega-3"),
-                ("Tahu (100g)", "8g protein", "Protein nabati"),
-                ("Nasi Merah (100g)", "23g karbo", "Karbohidrat kompleks"),
-                ("Oatmeal (50g)", "30g karbo", "Serat tinggi, energi tahan lama"),
-                ("Ubi (100g)", "20g karbo", "Vitamin A, karbo sehat"),
-                ("Pisang (1 buah)", "27g karbo", "Kalium, energi cepat")
-            ]
-            
-            # Frame untuk makanan yang terpusat
-            makanan_container = tk.Frame(container, bg=t["frame"])
-            makanan_container.pack(fill="x", padx=50)
-            
-            for i, (nama, nutrisi, desc) in enumerate(makanan):
-                frame = tk.Frame(makanan_container, bg=t["card"], padx=15, pady=10)
-                frame.pack(fill="x", pady=4)
-                
-                # Container untuk konten makanan
-                content_frame = tk.Frame(frame, bg=t["card"])
-                content_frame.pack(expand=True)
-                
-                # Nama makanan (di tengah)
-                tk.Label(content_frame, text=nama, bg=t["card"], fg=t["fg"],
-                         font=("Arial",10,"bold"), width=25).pack(pady=(0,5))
-                
-                # Nutrisi dan deskripsi
-                nutrisi_frame = tk.Frame(content_frame, bg=t["card"])
-                nutrisi_frame.pack()
-                
-                tk.Label(nutrisi_frame, text=nutrisi, bg=t["card"], fg="#ff6b6b",
-                         font=("Arial",9,"bold"), width=20).pack(side="left", padx=(0,10))
-                
-                tk.Label(nutrisi_frame, text=desc, bg=t["card"], fg="#888",
-                         font=("Arial",9), wraplength=200, justify="center").pack(side="left")
-            
-            # Tips nutrisi singkat
-            tk.Label(container, text="TIPS CEPAT", bg=t["frame"],
-                     fg=t["fg"], font=("Arial",12,"bold")).pack(pady=(25,10))
-            
-            tips = [
-                "Protein dalam 30 menit setelah lari",
-                "Minum air 500ml setiap 30 menit lari",
-                "Karbohidrat kompleks sebelum lari",
-                "Hindari makanan berat 2 jam sebelum lari"
-            ]
-            
-            tips_container = tk.Frame(container, bg=t["frame"])
-            tips_container.pack(fill="x", padx=100)
-            
-            for tip in tips:
-                frame = tk.Frame(tips_container, bg=t["card"], padx=15, pady=8)
-                frame.pack(fill="x", pady=3)
-                tk.Label(frame, text=f"✓ {tip}", bg=t["card"], fg="#4ecdc4",
-                         font=("Arial",9)).pack(anchor="center")
-        else:
+        import analisis, nutrisi
+        if not (hasattr(self, 'target_jarak') and self.target_jarak > 0):
             # Pesan jika tidak ada target
-            message_frame = tk.Frame(container, bg=t["frame"], padx=20, pady=40)
-            message_frame.pack(expand=True, fill="both")
-            tk.Label(message_frame, text="Masukkan target jarak harian di tab Input", 
-                     bg=t["frame"], fg=t["fg"], font=("Arial",11)).pack(expand=True)
-            tk.Label(message_frame, text="Target akan digunakan untuk menghitung progres harian", 
-                     bg=t["frame"], fg="#888", font=("Arial",9)).pack()
-
-    def show_jadwal(self):
-        t = THEME[self.mode]
-        tab = self.tabs["Jadwal"]
-        for w in tab.winfo_children(): w.destroy()
+            return self.views["Gizi"].update(None)
         
-        f = tk.Frame(tab, bg=t["frame"], padx=25, pady=25)
-        f.pack(fill="both", expand=True)
-        
-        tk.Label(f, text="JADWAL LATIHAN", bg=t["frame"],
-                 fg="#ffd166", font=("Arial",14,"bold")).pack(pady=(0,20))
+        today = date.today().strftime("%Y-%m-%d")
         
-        hari = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
-        jadwal = [
-            ("Lari Ringan", "30 menit", "Pemanasan"),
-            ("Interval Run", "45 menit", "Kecepatan"),
-            ("Recovery", "20 menit", "Pemulihan"),
-            ("Long Run", "60 menit", "Daya tahan"),
-            ("Cross Training", "40 menit", "Variasi"),
-            ("Tempo Run", "50 menit", "Konsistensi"),
-            ("Rest Day", "-", "Pemulihan total")
-        ]
+        # Gunakan target terbaru untuk hari ini
+        current_target = self.db.target(today) or self.target_jarak
         
-        for i, (latihan, durasi, tipe) in enumerate(jadwal):
-            frame = tk.Frame(f, bg=t["card"], padx=15, pady=10)
-            frame.pack(fill="x", pady=4)
-            
-            # Hari
-            tk.Label(frame, text=hari[i], bg=t["card"], fg=t["fg"],
-                     font=("Arial",11,"bold"), width=8).pack(side="left", padx=(0,10))
-            
-            # Latihan
-            tk.Label(frame, text=latihan, bg=t["card"], fg="#4ecdc4",
-                     font=("Arial",11,"bold"), width=15).pack(side="left", padx=(0,10))
-            
-            # Durasi & Tipe
-            tk.Label(frame, text=f"{durasi} | {tipe}", bg=t["card"], fg=t["fg"],
-                     font=("Arial",10)).pack(side="left")
-            
-            # Indikator
-            color = "#ff6b6b" if i % 3 == 0 else "#4ecdc4" if i % 3 == 1 else "#ffd166"
-            tk.Label(frame, text="●", bg=t["card"], fg=color,
-                     font=("Arial",12)).pack(side="right")
-
-    def show_history(self):
-        t = THEME[self.mode]
-        tab = self.tabs["History"]
-        for w in tab.winfo_children(): w.destroy()
-
-        f = tk.Frame(tab, bg=t["frame"], padx=25, pady=25)
-        f.pack(fill="both", expand=True)
+        # Hitung total jarak hari ini
+        total_jarak_hari_ini = self.db.total_jarak(today)
         
-        tk.Label(f, text="Riwayat Analisis", bg=t["frame"],
-                 fg="#ffd166", font=("Arial",14,"bold")).pack(pady=(0,20))
+        # Hitung progress berdasarkan akumulasi
+        sisa_jarak, persentase = analisis.progres(total_jarak_hari_ini, current_target)
         
-        if not self.history:
-            tk.Label(f, text="Belum ada riwayat", fg=t["fg"], bg=t["frame"]).pack()
-            return
-
-        dates_frame = tk.Frame(f, bg=t["frame"])
-        dates_frame.pack(anchor="center")
+        self.views["Gizi"].update({
+            "target": current_target,
+            "total": total_jarak_hari_ini,
+            "sisa": sisa_jarak,
+            "persen": persentase,
+            # Rekap jarak dari indeks agregat (tanpa membaca ulang riwayat)
+            "rekap": {
+                "7": self.indeks.rolling(7),
+                "28": self.indeks.rolling(28),
+                "365": self.indeks.rolling(365),
+                "bulan": self.indeks.bulan_berjalan()
+            },
+            "kal": self.kal,
+            # Menu pemulihan: solver hanya jalan untuk bucket kalori/berat yang belum di-cache
+            "menu": nutrisi.rencana(self.kal, self.berat),
+            "jarak_sekarang": self.jarak,
+            "jam": self.jam
+        })
 
-        row_frame = None
-        for i, tanggal in enumerate(sorted(self.history.keys(), reverse=True)):
-            if i % 3 == 0:
-                row_frame = tk.Frame(dates_frame, bg=t["frame"])
-                row_frame.pack(anchor="center", pady=6)
+    @profil.diukur()
+    def show_jadwal(self):
+        atl, ctl, tsb = self.beban.status(ATLET)
+        status = f"Beban akut (ATL) {atl:.0f} | Beban kronis (CTL) {ctl:.0f} | Form (TSB) {tsb:+.0f} - {kondisi(tsb)[0]}"
+        self.views["Jadwal"].update(self.beban.rencana(ATLET), status)
 
-            btn = tk.Button(
-                row_frame, text=tanggal,
-                command=lambda tgl=tanggal: self.show_date_detail(tgl),
-                bg=t["card"], fg=t["fg"], font=("Arial",10),
-                relief="flat", padx=18, pady=8, cursor="hand2"
-            )
-            btn.pack(side="left", padx=6)
+    @profil.diukur()
+    def show_tren(self):
+        if self.seri is None:
+            self.seri = SeriHarian(self.db.seri_harian())
+        self.views["Tren"].update(self.seri)
 
-            btn.bind("<Enter>", lambda e, b=btn: b.config(bg="#444444" if self.mode=="dark" else "#dddddd"))
-            btn.bind("<Leave>", lambda e, b=btn: b.config(bg=t["card"]))
+    @profil.diukur()
+    def show_history(self):
+        self.views["History"].update(self.db.ringkasan_tanggal, self.show_date_detail, ulang=self.history_basi)
+        self.history_basi = False
 
+    @profil.diukur()
     def show_date_detail(self, tanggal):
         detail = tk.Toplevel(self)
         detail.title(f"Detail {tanggal}")
         detail.geometry("600x450")
-        t = THEME[self.mode]
-        detail.configure(bg=t["bg"])
+        b = self.tema.buat
+        detail.configure(bg=THEME[self.mode]["bg"])
 
         # Frame utama untuk center
-        main_frame = tk.Frame(detail, bg=t["bg"])
+        main_frame = b(tk.Frame, detail, bg="bg")
         main_frame.pack(expand=True, fill="both")
 
         # Title di tengah
-        tk.Label(main_frame, text=f"Detail Tanggal {tanggal}", bg=t["bg"], fg="#ffd166",
-                 font=("Arial",14,"bold")).pack(pady=15)
-
-        # Frame untuk konten history yang di-center
-        center_frame = tk.Frame(main_frame, bg=t["bg"])
-        center_frame.pack(expand=True)
+        b(tk.Label, main_frame, text=f"Detail Tanggal {tanggal}", bg="bg", fg="#ffd166",
+          font=("Arial",14,"bold")).pack(pady=15)
 
         # Container untuk data history
-        container = tk.Frame(center_frame, bg=t["frame"], padx=20, pady=20)
-        container.pack()
+        container = b(tk.Frame, main_frame, bg="frame", padx=20, pady=20)
+        container.pack(expand=True, fill="both", padx=20, pady=(0,20))
 
         # Tampilkan target harian untuk tanggal tersebut
-        target_harian = self.daily_targets.get(tanggal, "Tidak ada target")
-        total_jarak = self.daily_distances.get(tanggal, 0)
+        target_harian = self.db.target(tanggal) or "Tidak ada target"
+        total_jarak = self.db.total_jarak(tanggal)
         
-        target_frame = tk.Frame(container, bg=t["card"], padx=10, pady=8)
+        target_frame = b(tk.Frame, container, bg="card", padx=10, pady=8)
         target_frame.pack(fill="x", pady=5)
-        tk.Label(target_frame, text=f"Target Harian: {target_harian} km | Total Jarak: {total_jarak:.1f} km", 
-                 bg=t["card"], fg=t["fg"], font=("Arial",10, "bold")).pack()
+        b(tk.Label, target_frame, text=f"Target Harian: {target_harian} km | Total Jarak: {total_jarak:.1f} km", 
+          bg="card", fg="fg", font=("Arial",10, "bold")).pack()
         
-        for item in self.history[tanggal]:
-            row_frame = tk.Frame(container, bg=t["card"], padx=10, pady=8)
-            row_frame.pack(fill="x", pady=4)
+        # Daftar lari dimuat per halaman saat digulir, berapa pun jumlah lari hari itu
+        hari = self.history[tanggal]
+
+        def muat(kursor, n):
+            mulai = kursor or 0
+            baris = [(mulai + i, (item['time'], f"{item['jarak']}km", f"{item['waktu']}m",
+                                  f"{item['pace']:.2f}", f"{item['kal']:.0f} cal"))
+                     for i, item in enumerate(hari.baris(mulai, n))]
+            return baris, mulai + len(baris)
 
-            info = f"{item['time']} | {item['jarak']}km | {item['waktu']}m | Pace {item['pace']:.2f} | {item['kal']:.0f} cal"
-            
-            label = tk.Label(row_frame, text=info, bg=t["card"], fg=t["fg"],
-                     font=("Arial",10))
-            label.pack(expand=True)
+        kolom = [("time", ("Jam", 70)), ("jarak", ("Jarak", 100)), ("waktu", ("Waktu", 100)),
+                 ("pace", ("Pace", 90)), ("kal", ("Kalori", 100))]
+        style = self.tema.style("Detail.Treeview", background="card", fieldbackground="card", foreground="fg")
+        DaftarVirtual(container, self.tema, kolom, muat, style=style).frame.pack(fill="both", expand=True, pady=4)
 
-RunningApp().mainloop()
\ No newline at end of file
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="Run Analyzer Pro")
+    p.add_argument("--server", action="store_true", help="jalankan API HTTP/JSON lokal, tanpa GUI")
+    p.add_argument("--host", default="127.0.0.1", help="alamat server (default 127.0.0.1)")
+    p.add_argument("--port", type=int, default=8765, help="port server, 0 = pilih bebas (default 8765)")
+    p.add_argument("--data", help="folder database per atlet (default ~/.run_analyzer_pro)")
+    args = p.parse_args()
+    if args.server:
+        import server
+        server.jalankan(args.host, args.port, args.data)
+    else:
+        RunningApp(T_MULAI).mainloop()
\ No newline at end of file
@@ -0,0 +1,262 @@
+# Mode server: API HTTP/JSON lokal (asyncio, satu thread) di atas mesin analisis yang sama dengan GUI.
+#   python run-analyzer-pro.py --server --port 8765
+#
+#   POST /atlet/<id>/lari        {"jarak", "waktu", "berat", "target"?, "tanggal"?}  -> hasil analisis
+#   POST /atlet/<id>/lari/batch  [{...}, ...]                                      -> [hasil, ...]
+#   GET  /atlet/<id>/riwayat?sebelum=YYYY-MM-DD&n=100                              -> ringkasan per tanggal
+#   GET  /atlet/<id>/progres?tanggal=YYYY-MM-DD                                    -> progres target harian
+#
+# Setiap atlet punya file SQLite sendiri (skema sama dengan GUI). Kiriman lari dari semua koneksi
+# dikumpulkan sebentar lalu ditulis per atlet dalam satu transaksi (group commit); respons baru
+# dikirim setelah transaksinya selesai.
+import asyncio
+import json
+import os
+import re
+import sys
+from datetime import date, datetime
+from urllib.parse import urlsplit, parse_qs
+
+import analisis
+from penyimpanan import RiwayatDB
+
+DIR_DEFAULT = os.path.join(os.path.expanduser("~"), ".run_analyzer_pro")
+JEDA_TULIS = 0.002  # detik menunggu kiriman lain sebelum transaksi ditulis
+MAKS_ANTRIAN = 5000  # tulis langsung jika antrian sudah sebanyak ini
+MAKS_BODY = 4 * 1024 * 1024
+MAKS_HALAMAN = 1000
+
+RUTE = re.compile(r"^/atlet/([A-Za-z0-9_-][A-Za-z0-9_.-]{0,63})/(lari|lari/batch|riwayat|progres)$")
+STATUS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+          413: "Payload Too Large", 431: "Request Header Fields Too Large", 500: "Internal Server Error"}
+
+
+class GalatHTTP(Exception):
+    def __init__(self, status, pesan):
+        super().__init__(pesan)
+        self.status = status
+
+
+def respons(status, isi, tetap=True):
+    body = json.dumps(isi).encode()
+    return (f"HTTP/1.1 {status} {STATUS[status]}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if tetap else 'close'}\r\n\r\n").encode() + body
+
+
+class Server:
+    def __init__(self, folder=None):
+        self.folder = folder or os.environ.get("RUN_ANALYZER_DATA") or DIR_DEFAULT
+        os.makedirs(self.folder, exist_ok=True)
+        self.db_atlet = {}  # atlet -> RiwayatDB, dibuka saat pertama dipakai
+        self.target_atlet = {}  # atlet -> target terakhir (seperti RunningApp.target_jarak)
+        self.antrian = []  # [(atlet, run, target_harian, future)]
+        self._tulis = None
+
+    def db(self, atlet):
+        db = self.db_atlet.get(atlet)
+        if db is None:
+            db = self.db_atlet[atlet] = RiwayatDB(os.path.join(self.folder, f"{atlet}.db"))
+            self.target_atlet[atlet] = db.target_terakhir()
+        return db
+
+    def tutup(self):
+        self.tulis()
+        for db in self.db_atlet.values():
+            db.close()
+
+    # --- penulisan berkelompok ---
+
+    def kirim(self, atlet, run, target):
+        fut = asyncio.get_running_loop().create_future()
+        self.antrian.append((atlet, run, target, fut))
+        if len(self.antrian) >= MAKS_ANTRIAN:
+            self.tulis()
+        elif self._tulis is None:
+            self._tulis = asyncio.get_running_loop().call_later(JEDA_TULIS, self.tulis)
+        return fut
+
+    def tulis(self):
+        if self._tulis is not None:
+            self._tulis.cancel()
+            self._tulis = None
+        antrian, self.antrian = self.antrian, []
+        per_atlet = {}
+        for item in antrian:
+            per_atlet.setdefault(item[0], []).append(item)
+        for atlet, items in per_atlet.items():
+            try:
+                self._simpan(atlet, items)
+            except Exception:
+                # Satu kiriman buruk tidak boleh menggagalkan kiriman lain di kelompoknya:
+                # transaksi kelompok sudah di-rollback, tulis ulang satu per satu
+                for item in items:
+                    try:
+                        self._simpan(atlet, [item])
+                    except Exception as e:
+                        self._selesai([item], e)
+                    else:
+                        self._selesai([item])
+            else:
+                self._selesai(items)
+
+    def _simpan(self, atlet, items):
+        self.db(atlet).tambah_banyak([run for _, run, _, _ in items],
+                                     [(run[0], t) for _, run, t, _ in items if t is not None])
+
+    @staticmethod
+    def _selesai(items, galat=None):
+        for *_, fut in items:
+            if fut.done():
+                continue
+            if galat is None:
+                fut.set_result(None)
+            else:
+                fut.set_exception(galat)
+
+    # --- endpoint ---
+
+    def analisis(self, atlet, data, target_terakhir, tersimpan):
+        # Sama seperti RunningApp.analyze: validasi, hitung, lalu target harian. State atlet tidak
+        # diubah di sini: tersimpan (tanggal -> target) mencatat target yang akan ditulis batch ini
+        if not isinstance(data, dict):
+            raise GalatHTTP(400, "lari harus berupa objek JSON")
+        try:
+            j, w, b, t = analisis.validasi(data.get("jarak"), data.get("waktu"), data.get("berat"),
+                                           data.get("target"))
+            tanggal = date.fromisoformat(data.get("tanggal") or date.today().isoformat()).isoformat()
+            # Jam dinormalkan ke HH:MM; ekspor dan cache riwayat menyimpannya sebagai menit
+            jam = (datetime.strptime(data["time"], "%H:%M") if data.get("time") else datetime.now())
+            jam = jam.strftime("%H:%M")
+        except (TypeError, ValueError) as e:
+            raise GalatHTTP(400, f"input tidak valid: {e}")
+        pace, speed, kal = analisis.hitung(j, w, b)
+
+        target_hari = tersimpan[tanggal] if tanggal in tersimpan else self.db(atlet).target(tanggal)
+        target, target_harian = analisis.pilih_target(t, target_hari, target_terakhir)
+        if target_harian is not None:
+            tersimpan[tanggal] = target_harian
+        run = (tanggal, jam, j, w, pace, speed, kal, target)
+        return run, target_harian, {"tanggal": tanggal, "time": jam, "jarak": j, "waktu": w,
+                                    "pace": pace, "speed": speed, "kal": kal, "target": target}
+
+    def progres(self, atlet, tanggal):
+        db = self.db(atlet)
+        target = db.target(tanggal) or self.target_atlet[atlet] or 0
+        total = db.total_jarak(tanggal)
+        sisa, persen = analisis.progres(total, target)
+        return {"tanggal": tanggal, "target": target, "total": total, "sisa": sisa, "persen": persen}
+
+    async def lari(self, atlet, daftar):
+        # Seluruh batch divalidasi dan dianalisis dulu; target terakhir atlet baru diubah setelah
+        # semua lari tersimpan, jadi batch yang ditolak tidak mewariskan targetnya ke lari berikutnya
+        self.db(atlet)
+        target, tersimpan, hasil = self.target_atlet[atlet], {}, []
+        for data in daftar:
+            hasil.append(self.analisis(atlet, data, target, tersimpan))
+            target = hasil[-1][2]["target"]
+        await asyncio.gather(*(self.kirim(atlet, run, t) for run, t, _ in hasil))
+        self.target_atlet[atlet] = target
+        for _, _, isi in hasil:
+            isi["progres"] = self.progres(atlet, isi["tanggal"])
+        return [isi for _, _, isi in hasil]
+
+    async def rute(self, metode, url, body):
+        bagian = urlsplit(url)
+        cocok = RUTE.match(bagian.path)
+        if cocok is None:
+            raise GalatHTTP(404, "rute tidak dikenal")
+        atlet, aksi = cocok.groups()
+        query = {k: v[-1] for k, v in parse_qs(bagian.query).items()}
+
+        if aksi.startswith("lari"):
+            if metode != "POST":
+                raise GalatHTTP(405, "gunakan POST")
+            try:
+                data = json.loads(body)
+            except ValueError:
+                raise GalatHTTP(400, "body bukan JSON")
+            if aksi == "lari":
+                return (await self.lari(atlet, [data]))[0]
+            if not isinstance(data, list):
+                raise GalatHTTP(400, "batch harus berupa array JSON")
+            return await self.lari(atlet, data)
+
+        if metode != "GET":
+            raise GalatHTTP(405, "gunakan GET")
+        try:
+            if aksi == "riwayat":
+                n = min(int(query.get("n", 100)), MAKS_HALAMAN)
+                baris = self.db(atlet).ringkasan_tanggal(sebelum=query.get("sebelum"), n=n)
+                return [{"tanggal": t, "lari": c, "total": total, "target": target}
+                        for t, c, total, target in baris]
+            tanggal = date.fromisoformat(query.get("tanggal") or date.today().isoformat()).isoformat()
+        except ValueError as e:
+            raise GalatHTTP(400, f"parameter tidak valid: {e}")
+        return self.progres(atlet, tanggal)
+
+    async def layani(self, reader, writer):
+        # Satu koneksi HTTP/1.1 keep-alive; permintaan diproses berurutan (pipelining juga jalan)
+        try:
+            while True:
+                try:
+                    kepala = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.LimitOverrunError:
+                    writer.write(respons(431, {"error": "header terlalu besar"}, False))
+                    break
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                baris = kepala.decode("latin-1").split("\r\n")
+                try:
+                    metode, url, versi = baris[0].split(" ", 2)
+                    header = {k.strip().lower(): v.strip()
+                              for k, v in (b.split(":", 1) for b in baris[1:] if ":" in b)}
+                    panjang = int(header.get("content-length", 0))
+                except ValueError:
+                    writer.write(respons(400, {"error": "permintaan tidak valid"}, False))
+                    break
+                if panjang < 0:
+                    writer.write(respons(400, {"error": "Content-Length tidak valid"}, False))
+                    break
+                if panjang > MAKS_BODY:
+                    writer.write(respons(413, {"error": "body terlalu besar"}, False))
+                    break
+                body = await reader.readexactly(panjang) if panjang else b""
+                tetap = versi == "HTTP/1.1" and header.get("connection", "").lower() != "close"
+                try:
+                    status, isi = 200, await self.rute(metode, url, body)
+                except GalatHTTP as e:
+                    status, isi = e.status, {"error": str(e)}
+                except Exception as e:
+                    status, isi = 500, {"error": str(e)}
+                writer.write(respons(status, isi, tetap))
+                if not tetap:
+                    break
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _utama(host, port, folder, siap=None):
+    app = Server(folder)
+    server = await asyncio.start_server(app.layani, host, port, backlog=1024)
+    alamat = server.sockets[0].getsockname()
+    print(f"Run Analyzer Pro API di http://{alamat[0]}:{alamat[1]} (data: {app.folder})", file=sys.stderr)
+    if siap is not None:
+        siap(alamat)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        app.tutup()
+
+
+def jalankan(host="127.0.0.1", port=8765, folder=None, siap=None):
+    # port=0 memilih port bebas (berguna untuk uji di localhost); siap(alamat) dipanggil saat listen
+    try:
+        asyncio.run(_utama(host, port, folder, siap))
+    except KeyboardInterrupt:
+        pass
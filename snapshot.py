@@ -0,0 +1,75 @@
+# Snapshot biner state agregat: ditulis saat aplikasi ditutup, dibaca lewat mmap saat startup,
+# sehingga waktu sampai frame pertama tidak ikut tumbuh bersama ukuran riwayat.
+# Format (little-endian): header tetap, lalu kolom float64 berurutan tanpa pemisah
+#   header: MAGIC | versi | id lari terakhir | awal indeks | n indeks | n seri | target terakhir
+#   kolom : indeks.nilai[n] | indeks.pohon[n+1] | seri x, jarak, waktu, kal, target [n seri]
+# Snapshot hanya dipakai jika id lari terakhir di database masih sama; jika tidak, aplikasi
+# membangun ulang dari SQLite seperti biasa.
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from agregat import IndeksJarak
+from grafik import SeriHarian
+
+MAGIC = b"RAPSNAP\0"
+VERSI = 1
+HEADER = struct.Struct("<8sIqqqqd")
+TIDAK_ADA = -1
+
+
+def path_snapshot(path_db):
+    return path_db + ".snap"
+
+
+def _tulis_kolom(f, kolom):
+    if sys.byteorder != "little":
+        kolom = array("d", kolom)
+        kolom.byteswap()
+    kolom.tofile(f)
+
+
+def tulis(path, id_terakhir, indeks, seri=None, target=None):
+    # Ditulis ke file sementara lalu di-rename, jadi snapshot tidak pernah setengah jadi
+    sementara = path + ".tmp"
+    with open(sementara, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSI, id_terakhir,
+                            TIDAK_ADA if indeks.awal is None else indeks.awal, len(indeks.nilai),
+                            TIDAK_ADA if seri is None else len(seri),
+                            math.nan if target is None else target))
+        _tulis_kolom(f, indeks.nilai)
+        _tulis_kolom(f, indeks.pohon)
+        if seri is not None:
+            for kolom in (seri.x, seri.jarak, seri.waktu, seri.kal, seri.target):
+                _tulis_kolom(f, kolom)
+    os.replace(sementara, path)
+
+
+def baca(path, id_terakhir):
+    # {"indeks", "seri" (None jika tidak disimpan), "target"}; None jika tidak ada, rusak atau basi
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic, versi, id_snap, awal, n, n_seri, target = HEADER.unpack_from(mm)
+            if magic != MAGIC or versi != VERSI or id_snap != id_terakhir:
+                return None
+            jumlah = 2 * n + 1 + 5 * max(n_seri, 0)
+            if len(mm) != HEADER.size + 8 * jumlah:
+                return None
+            kolom = []
+            with memoryview(mm) as mv:
+                pos = HEADER.size
+                for k in [n, n + 1] + [n_seri] * (5 if n_seri >= 0 else 0):
+                    a = array("d")
+                    a.frombytes(mv[pos:pos + 8 * k])
+                    if sys.byteorder != "little":
+                        a.byteswap()
+                    kolom.append(a)
+                    pos += 8 * k
+    except (OSError, ValueError, struct.error):
+        return None
+    return {"indeks": IndeksJarak.dari_array(None if awal == TIDAK_ADA else awal, kolom[0], kolom[1]),
+            "seri": SeriHarian.dari_kolom(*kolom[2:]) if n_seri >= 0 else None,
+            "target": None if math.isnan(target) else target}
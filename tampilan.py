@@ -0,0 +1,559 @@
+# Lapisan tampilan retained-mode: setiap tab dibangun sekali, lalu hanya teks/warna yang diubah.
+import tkinter as tk
+from tkinter import ttk
+
+from grafik import Grafik
+
+THEME = {
+    "dark": {"bg":"#1e1e2e","frame":"#2d3047","card":"#3d405b","fg":"white","hover":"#444444"},
+    "light":{"bg":"#f4f4f4","frame":"#ffffff","card":"#e6e6e6","fg":"black","hover":"#dddddd"}
+}
+
+# Opsi warna yang boleh diisi nama peran tema ("frame", "card", "fg", ...)
+OPSI_WARNA = ("bg", "fg", "activebackground", "insertbackground")
+
+
+class Tema:
+    def __init__(self, mode="dark"):
+        self.mode = mode
+        self.widgets = {}  # widget -> {opsi: peran}
+        self.gaya = {}  # nama style ttk -> {opsi: peran}
+
+    @property
+    def warna(self):
+        return THEME[self.mode]
+
+    def buat(self, kelas, parent, **opsi):
+        # Buat widget; opsi warna berisi nama peran dicatat agar bisa diganti massal saat toggle
+        t = self.warna
+        peran = {k: v for k, v in opsi.items() if k in OPSI_WARNA and v in t}
+        w = kelas(parent, **{**opsi, **{k: t[v] for k, v in peran.items()}})
+        if peran:
+            self.widgets[w] = peran
+        return w
+
+    def style(self, nama, **peran):
+        # Style ttk (mis. Treeview) ikut berganti bersama tema
+        self.gaya[nama] = peran
+        ttk.Style().configure(nama, **{k: self.warna[v] for k, v in peran.items()})
+        return nama
+
+    def terapkan(self, mode):
+        # Ganti tema = satu lintasan configure atas widget yang sudah ada
+        self.mode = mode
+        t = self.warna
+        for nama, peran in self.gaya.items():
+            ttk.Style().configure(nama, **{k: t[v] for k, v in peran.items()})
+        for w, peran in list(self.widgets.items()):
+            try:
+                w.configure(**{k: t[v] for k, v in peran.items()})
+            except tk.TclError:
+                del self.widgets[w]  # widget sudah dihancurkan
+
+
+class Tab:
+    def __init__(self, tab, tema):
+        self.tab = tab
+        self.tema = tema
+        self.frame = None
+
+    def siap(self):
+        # Dibangun saat pertama kali ditampilkan, setelah itu hanya diperbarui
+        if self.frame is None:
+            self.build()
+
+    def build(self):
+        raise NotImplementedError
+
+
+class TabHasil(Tab):
+    def build(self):
+        b = self.tema.buat
+        self.frame = f = b(tk.Frame, self.tab, bg="frame", padx=25, pady=25)
+        f.pack(fill="both", expand=True)
+
+        b(tk.Label, f, text="HASIL ANALISIS", bg="frame",
+          fg="#ffd166", font=("Arial",14,"bold")).pack(pady=(0,20))
+
+        self.vars = {}
+        for key, label in [("pace", "Pace"), ("speed", "Kecepatan"), ("kal", "Kalori Terbakar")]:
+            self.vars[key] = tk.StringVar(self.tab)
+            frame = b(tk.Frame, f, bg="card", padx=15, pady=10)
+            frame.pack(fill="x", pady=5)
+            b(tk.Label, frame, text=label, bg="card", fg="fg",
+              font=("Arial",11)).pack(side="left")
+            b(tk.Label, frame, textvariable=self.vars[key], bg="card", fg="#4ecdc4",
+              font=("Arial",11,"bold")).pack(side="right")
+
+        b(tk.Label, f, text="REKOR & PERSENTIL", bg="frame",
+          fg="#ffd166", font=("Arial",12,"bold")).pack(pady=(20,10))
+        self.rekor = b(tk.Frame, f, bg="frame")
+        self.rekor.pack(fill="x")
+        self.rekor_vars = {}
+
+    def update(self, pace, speed, kal, rekor=()):
+        self.siap()
+        self.vars["pace"].set(f"{pace:.2f} menit/km")
+        self.vars["speed"].set(f"{speed:.1f} km/jam")
+        self.vars["kal"].set(f"{kal:.0f} kalori")
+        # Baris rekor dibuat sekali per label, selanjutnya hanya nilainya yang diganti
+        b = self.tema.buat
+        for label, nilai in rekor:
+            var = self.rekor_vars.get(label)
+            if var is None:
+                var = self.rekor_vars[label] = tk.StringVar(self.tab)
+                frame = b(tk.Frame, self.rekor, bg="card", padx=15, pady=6)
+                frame.pack(fill="x", pady=3)
+                b(tk.Label, frame, text=label, bg="card", fg="fg",
+                  font=("Arial",10)).pack(side="left")
+                b(tk.Label, frame, textvariable=var, bg="card", fg="#4ecdc4",
+                  font=("Arial",10,"bold")).pack(side="right")
+            var.set(nilai)
+
+
+TIPS = [
+    "Protein dalam 30 menit setelah lari",
+    "Minum air 500ml setiap 30 menit lari",
+    "Karbohidrat kompleks sebelum lari",
+    "Hindari makanan berat 2 jam sebelum lari"
+]
+
+
+class TabGizi(Tab):
+    def build(self):
+        b = self.tema.buat
+
+        # Buat main frame dengan scrollbar
+        self.frame = main_frame = b(tk.Frame, self.tab, bg="frame")
+        main_frame.pack(fill="both", expand=True)
+
+        # Buat canvas untuk scroll dengan width yang cukup
+        canvas = b(tk.Canvas, main_frame, bg="frame", highlightthickness=0)
+        scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
+        scrollable_frame = b(tk.Frame, canvas, bg="frame", width=650)
+
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+
+        # Pack canvas dan scrollbar
+        canvas.pack(side="left", fill="both", expand=True, padx=(25,0), pady=25)
+        scrollbar.pack(side="right", fill="y", pady=25)
+
+        # Bind mouse wheel untuk scroll
+        def _on_mousewheel(event):
+            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+
+        canvas.bind_all("<MouseWheel>", _on_mousewheel)
+
+        # Kontainer utama untuk konten di tengah
+        container = b(tk.Frame, scrollable_frame, bg="frame")
+        container.pack(expand=True, fill="both", padx=20, pady=10)
+
+        # Judul di tengah
+        b(tk.Label, container, text="PROGRES & NUTRISI", bg="frame",
+          fg="#ffd166", font=("Arial",14,"bold")).pack(pady=(0,25))
+
+        self.isi = b(tk.Frame, container, bg="frame")
+        self.build_isi(self.isi)
+
+        # Pesan jika tidak ada target
+        self.pesan = b(tk.Frame, container, bg="frame", padx=20, pady=40)
+        b(tk.Label, self.pesan, text="Masukkan target jarak harian di tab Input",
+          bg="frame", fg="fg", font=("Arial",11)).pack(expand=True)
+        b(tk.Label, self.pesan, text="Target akan digunakan untuk menghitung progres harian",
+          bg="frame", fg="#888", font=("Arial",9)).pack()
+
+    def build_isi(self, container):
+        b = self.tema.buat
+        self.vars = {k: tk.StringVar(self.tab) for k in
+                     ["target", "jarak", "sisa", "persen", "total", "excess", "kurang",
+                      "progress", "kal", "info", "7", "28", "365", "bulan"]}
+
+        # Container untuk progres target (di tengah)
+        progress_container = b(tk.Frame, container, bg="frame")
+        progress_container.pack(fill="x", pady=(0,20))
+
+        # Judul progres di tengah
+        b(tk.Label, progress_container, text="PROGRES TARGET LARI HARIAN", bg="frame",
+          fg="fg", font=("Arial",12,"bold")).pack(pady=(0,15))
+
+        # Frame untuk grid data progres
+        progress_grid = b(tk.Frame, progress_container, bg="frame")
+        progress_grid.pack()
+
+        data_progres = [("Target Harian", "target"), ("Jarak Hari Ini", "jarak"),
+                        ("Sisa Jarak", "sisa"), ("Persentase", "persen")]
+        for i, (label, key) in enumerate(data_progres):
+            row_frame = b(tk.Frame, progress_grid, bg="card", padx=25, pady=12)
+            row_frame.grid(row=i, column=0, sticky="ew", pady=3, padx=50)
+
+            # Label
+            b(tk.Label, row_frame, text=label, bg="card", fg="fg",
+              font=("Arial",11), width=20, anchor="center").pack(side="left", expand=True)
+
+            # Separator
+            b(tk.Label, row_frame, text=":", bg="card", fg="fg",
+              font=("Arial",11), padx=10).pack(side="left")
+
+            # Value
+            b(tk.Label, row_frame, textvariable=self.vars[key], bg="card", fg="#4ecdc4",
+              font=("Arial",11,"bold"), width=15, anchor="center").pack(side="left", expand=True)
+
+        # Status target di tengah: kedua varian dibangun sekali, yang aktif saja yang di-pack
+        status_container = b(tk.Frame, container, bg="card", padx=30, pady=15)
+        status_container.pack(fill="x", pady=15, padx=80)
+
+        self.tercapai = b(tk.Frame, status_container, bg="card")
+        b(tk.Label, self.tercapai, text="🎯 TARGET HARIAN TERCAPAI!", bg="card", fg="#4ecdc4",
+          font=("Arial",12,"bold")).pack()
+        b(tk.Label, self.tercapai, textvariable=self.vars["total"],
+          bg="card", fg="#4ecdc4", font=("Arial",10)).pack(pady=(5,0))
+        # Pesan khusus jika melebihi target
+        self.excess_lbl = b(tk.Label, self.tercapai, textvariable=self.vars["excess"],
+                            bg="card", fg="#ffd166", font=("Arial",10, "bold"))
+
+        self.belum = b(tk.Frame, status_container, bg="card")
+        b(tk.Label, self.belum, text="📊 BELUM TERCAPAI", bg="card", fg="#ff6b6b",
+          font=("Arial",12,"bold")).pack()
+        b(tk.Label, self.belum, textvariable=self.vars["kurang"],
+          bg="card", fg="#ff6b6b", font=("Arial",10)).pack(pady=(5,0))
+        b(tk.Label, self.belum, textvariable=self.vars["progress"],
+          bg="card", fg="#888", font=("Arial",9)).pack(pady=(2,0))
+
+        # Rekap jarak dari indeks agregat (tanpa membaca ulang riwayat)
+        b(tk.Label, container, text="REKAP JARAK", bg="frame",
+          fg="fg", font=("Arial",12,"bold")).pack(pady=(20,10))
+
+        rekap_grid = b(tk.Frame, container, bg="frame")
+        rekap_grid.pack()
+
+        rekap = [("7 Hari Terakhir", "7"), ("28 Hari Terakhir", "28"),
+                 ("365 Hari Terakhir", "365"), ("Bulan Ini", "bulan")]
+        for i, (label, key) in enumerate(rekap):
+            row_frame = b(tk.Frame, rekap_grid, bg="card", padx=25, pady=8)
+            row_frame.grid(row=i, column=0, sticky="ew", pady=3, padx=50)
+            b(tk.Label, row_frame, text=label, bg="card", fg="fg",
+              font=("Arial",11), width=20, anchor="center").pack(side="left", expand=True)
+            b(tk.Label, row_frame, textvariable=self.vars[key], bg="card", fg="#4ecdc4",
+              font=("Arial",11,"bold"), width=15, anchor="center").pack(side="left", expand=True)
+
+        # Kalori terbakar di tengah
+        b(tk.Label, container, text="KALORI TERBAKAR", bg="frame",
+          fg="fg", font=("Arial",12,"bold")).pack(pady=(20,10))
+
+        kal_container = b(tk.Frame, container, bg="card", padx=30, pady=15)
+        kal_container.pack(fill="x", pady=5, padx=150)
+        b(tk.Label, kal_container, textvariable=self.vars["kal"], bg="card", fg="#ff6b6b",
+          font=("Arial",14,"bold")).pack()
+
+        # Informasi input terbaru
+        info_frame = b(tk.Frame, container, bg="card", padx=15, pady=10)
+        info_frame.pack(fill="x", pady=10, padx=80)
+        b(tk.Label, info_frame, textvariable=self.vars["info"],
+          bg="card", fg="#888", font=("Arial",9)).pack()
+
+        # Menu pemulihan dari perencana nutrisi (porsi menyesuaikan kalori terbakar)
+        b(tk.Label, container, text="REKOMENDASI NUTRISI", bg="frame",
+          fg="fg", font=("Arial",12,"bold")).pack(pady=(25,5))
+        self.vars["menu"] = tk.StringVar(self.tab)
+        b(tk.Label, container, textvariable=self.vars["menu"], bg="frame", fg="#888",
+          font=("Arial",9), justify="center").pack(pady=(0,10))
+
+        # Frame untuk makanan yang terpusat; baris dibuat saat dibutuhkan lalu dipakai ulang
+        self.makanan_container = b(tk.Frame, container, bg="frame")
+        self.makanan_container.pack(fill="x", padx=50)
+        self.makanan = []
+
+        # Tips nutrisi singkat
+        b(tk.Label, container, text="TIPS CEPAT", bg="frame",
+          fg="fg", font=("Arial",12,"bold")).pack(pady=(25,10))
+
+        tips_container = b(tk.Frame, container, bg="frame")
+        tips_container.pack(fill="x", padx=100)
+
+        for tip in TIPS:
+            frame = b(tk.Frame, tips_container, bg="card", padx=15, pady=8)
+            frame.pack(fill="x", pady=3)
+            b(tk.Label, frame, text=f"✓ {tip}", bg="card", fg="#4ecdc4",
+              font=("Arial",9)).pack(anchor="center")
+
+    def baris_makanan(self):
+        b = self.tema.buat
+        frame = b(tk.Frame, self.makanan_container, bg="card", padx=15, pady=10)
+
+        # Container untuk konten makanan
+        content_frame = b(tk.Frame, frame, bg="card")
+        content_frame.pack(expand=True)
+
+        # Nama makanan dan porsi (di tengah)
+        nama, nutrisi, desc = (tk.StringVar(self.tab) for _ in range(3))
+        b(tk.Label, content_frame, textvariable=nama, bg="card", fg="fg",
+          font=("Arial",10,"bold"), width=25).pack(pady=(0,5))
+
+        # Nutrisi dan deskripsi
+        nutrisi_frame = b(tk.Frame, content_frame, bg="card")
+        nutrisi_frame.pack()
+
+        b(tk.Label, nutrisi_frame, textvariable=nutrisi, bg="card", fg="#ff6b6b",
+          font=("Arial",9,"bold"), width=28).pack(side="left", padx=(0,10))
+
+        b(tk.Label, nutrisi_frame, textvariable=desc, bg="card", fg="#888",
+          font=("Arial",9), wraplength=200, justify="center").pack(side="left")
+        return frame, (nama, nutrisi, desc)
+
+    def update_menu(self, rencana):
+        # rencana: hasil nutrisi.rencana(); baris lebih disembunyikan, bukan dihancurkan
+        while len(self.makanan) < len(rencana["menu"]):
+            self.makanan.append(self.baris_makanan())
+        for i, (frame, (nama, nutrisi, desc)) in enumerate(self.makanan):
+            if i >= len(rencana["menu"]):
+                frame.pack_forget()
+                continue
+            m, porsi, n, kal, protein, karbo, ket = rencana["menu"][i]
+            nama.set(f"{m} ({porsi}) x{n}")
+            nutrisi.set(f"{kal:.0f} kkal | {protein:.0f}g protein | {karbo:.0f}g karbo")
+            desc.set(ket)
+            frame.pack(fill="x", pady=4)
+        total, target = rencana["total"], rencana["target"]
+        self.vars["menu"].set("Menu {:.0f} kkal, {:.0f}g protein, {:.0f}g karbo\n".format(*total)
+                              + "(kebutuhan ~{:.0f} kkal, {:.0f}g protein, {:.0f}g karbo)".format(*target))
+
+    def update(self, data):
+        # data None = belum ada target; selain itu dict angka progres
+        self.siap()
+        if data is None:
+            self.isi.pack_forget()
+            self.pesan.pack(expand=True, fill="both")
+            return
+        self.pesan.pack_forget()
+        self.isi.pack(fill="x")
+
+        v, target, total = self.vars, data["target"], data["total"]
+        v["target"].set(f"{target:.1f} km")
+        v["jarak"].set(f"{total:.1f} km")
+        v["sisa"].set(f"{abs(data['sisa']):.2f} km")
+        v["persen"].set(f"{data['persen']:.1f}%")
+
+        if data["sisa"] <= 0:
+            self.belum.pack_forget()
+            self.tercapai.pack()
+            v["total"].set(f"Total lari hari ini: {total:.1f} km (Target: {target:.1f} km)")
+            if total > target:
+                v["excess"].set(f"⭐ Anda telah melewati target harian sebesar {total - target:.1f} km!")
+                self.excess_lbl.pack(pady=(5,0))
+            else:
+                self.excess_lbl.pack_forget()
+        else:
+            self.tercapai.pack_forget()
+            self.belum.pack()
+            v["kurang"].set(f"Kurang {data['sisa']:.2f} km untuk capai target harian")
+            v["progress"].set(f"Progress: {data['persen']:.1f}% dari {target:.1f} km")
+
+        for key in ["7", "28", "365", "bulan"]:
+            v[key].set(f"{data['rekap'][key]:.1f} km")
+        v["kal"].set(f"{data['kal']:.0f} kalori")
+        v["info"].set(f"Input terbaru: {data['jarak_sekarang']:.1f} km pada {data['jam']}")
+        self.update_menu(data["menu"])
+
+
+HARI = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
+
+
+class TabJadwal(Tab):
+    def build(self):
+        b = self.tema.buat
+        self.frame = f = b(tk.Frame, self.tab, bg="frame", padx=25, pady=25)
+        f.pack(fill="both", expand=True)
+
+        b(tk.Label, f, text="JADWAL LATIHAN", bg="frame",
+          fg="#ffd166", font=("Arial",14,"bold")).pack(pady=(0,5))
+
+        # Ringkasan beban latihan (ATL/CTL/TSB) yang menjadi dasar jadwal
+        self.status = tk.StringVar(self.tab)
+        b(tk.Label, f, textvariable=self.status, bg="frame", fg="#888",
+          font=("Arial",9)).pack(pady=(0,15))
+
+        self.baris = []
+        for i, hari in enumerate(HARI):
+            frame = b(tk.Frame, f, bg="card", padx=15, pady=10)
+            frame.pack(fill="x", pady=4)
+            latihan, detail = tk.StringVar(self.tab), tk.StringVar(self.tab)
+            self.baris.append((latihan, detail))
+
+            # Hari
+            b(tk.Label, frame, text=hari, bg="card", fg="fg",
+              font=("Arial",11,"bold"), width=8).pack(side="left", padx=(0,10))
+
+            # Latihan
+            b(tk.Label, frame, textvariable=latihan, bg="card", fg="#4ecdc4",
+              font=("Arial",11,"bold"), width=15).pack(side="left", padx=(0,10))
+
+            # Durasi & Tipe
+            b(tk.Label, frame, textvariable=detail, bg="card", fg="fg",
+              font=("Arial",10)).pack(side="left")
+
+            # Indikator
+            color = "#ff6b6b" if i % 3 == 0 else "#4ecdc4" if i % 3 == 1 else "#ffd166"
+            b(tk.Label, frame, text="●", bg="card", fg=color,
+              font=("Arial",12)).pack(side="right")
+
+    def update(self, jadwal, status):
+        # jadwal: 7 x (latihan, durasi, tipe) Senin-Minggu; status: teks ringkasan beban
+        self.siap()
+        self.status.set(status)
+        for (latihan, detail), (nama, durasi, tipe) in zip(self.baris, jadwal):
+            latihan.set(nama)
+            detail.set(f"{durasi} | {tipe}")
+
+
+class TabTren(Tab):
+    # (kunci, judul, satuan, [(seri, warna)])
+    GRAFIK = [
+        ("pace", "Pace", "menit/km", [("pace", "#4ecdc4")]),
+        ("jarak", "Jarak Harian vs Target", "km", [("target", "#ffd166"), ("jarak", "#4ecdc4")]),
+        ("kal", "Kalori", "kkal", [("kal", "#ff6b6b")]),
+    ]
+
+    def build(self):
+        b = self.tema.buat
+        self.frame = f = b(tk.Frame, self.tab, bg="frame", padx=25, pady=15)
+        f.pack(fill="both", expand=True)
+
+        b(tk.Label, f, text="TREN", bg="frame",
+          fg="#ffd166", font=("Arial",14,"bold")).pack(pady=(0,2))
+        b(tk.Label, f, text="Roda mouse: zoom | Seret: geser | Klik ganda: semua", bg="frame",
+          fg="#888", font=("Arial",9)).pack(pady=(0,8))
+        self.kosong = b(tk.Label, f, text="Belum ada riwayat", fg="fg", bg="frame")
+
+        # Zoom/geser di satu grafik diikuti grafik lain
+        self.grafik = {}
+        for kunci, judul, satuan, _ in self.GRAFIK:
+            g = self.grafik[kunci] = Grafik(f, self.tema, judul, satuan, on_rentang=self.samakan)
+            g.canvas.pack(fill="both", expand=True, pady=4)
+
+    def samakan(self, x0, x1):
+        for g in self.grafik.values():
+            if g.rentang != (x0, x1):
+                g.atur_rentang(x0, x1, sebar=False)
+
+    def update(self, seri):
+        # seri: grafik.SeriHarian; yang digambar hanya hasil piramida + LTTB
+        self.siap()
+        if not len(seri):
+            self.kosong.pack(before=self.grafik["pace"].canvas)
+            return
+        self.kosong.pack_forget()
+        piramida = seri.piramida()
+        batas = (seri.x[0], seri.x[-1])
+        for kunci, _, _, garis in self.GRAFIK:
+            self.grafik[kunci].isi([(piramida[s], warna) for s, warna in garis], batas)
+
+
+class DaftarVirtual:
+    # Treeview yang diisi per halaman saat digulir ke bawah (infinite scroll).
+    # muat(kursor, n) -> (baris, kursor_berikut); baris = [(iid, values), ...]
+    UKURAN_HALAMAN = 100
+
+    def __init__(self, parent, tema, kolom, muat, style="Treeview", height=15):
+        self.muat = muat
+        self.frame = tema.buat(tk.Frame, parent, bg="frame")
+        self.tree = ttk.Treeview(self.frame, columns=[k for k, _ in kolom], show="headings",
+                                 height=height, style=style)
+        for key, (judul, lebar) in kolom:
+            self.tree.heading(key, text=judul)
+            self.tree.column(key, width=lebar, anchor="center")
+        self.scroll = ttk.Scrollbar(self.frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.on_scroll)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scroll.pack(side="right", fill="y")
+        self.reset()
+
+    def reset(self):
+        self.tree.delete(*self.tree.get_children())
+        self.kursor = None
+        self.habis = False
+        self.memuat = False
+        self.halaman_berikut()
+
+    def halaman_berikut(self):
+        self.memuat = False
+        if self.habis:
+            return
+        baris, self.kursor = self.muat(self.kursor, self.UKURAN_HALAMAN)
+        for iid, values in baris:
+            self.tree.insert("", "end", iid=iid, values=values)
+        self.habis = len(baris) < self.UKURAN_HALAMAN
+
+    def on_scroll(self, first, last):
+        self.scroll.set(first, last)
+        # Mendekati ujung bawah: ambil halaman berikutnya setelah Tk selesai menggambar
+        if float(last) > 0.9 and not self.habis and not self.memuat:
+            self.memuat = True
+            self.tree.after_idle(self.halaman_berikut)
+
+    def perbarui(self, iid, values, index=0):
+        # Ubah satu baris di tempat, atau sisipkan jika belum ada
+        if self.tree.exists(iid):
+            self.tree.item(iid, values=values)
+        else:
+            self.tree.insert("", index, iid=iid, values=values)
+
+
+class TabHistory(Tab):
+    KOLOM = [("tanggal", ("Tanggal", 140)), ("lari", ("Jumlah Lari", 100)),
+             ("jarak", ("Total Jarak", 120)), ("target", ("Target", 100))]
+
+    def build(self):
+        b = self.tema.buat
+        self.frame = f = b(tk.Frame, self.tab, bg="frame", padx=25, pady=25)
+        f.pack(fill="both", expand=True)
+
+        b(tk.Label, f, text="Riwayat Analisis", bg="frame",
+          fg="#ffd166", font=("Arial",14,"bold")).pack(pady=(0,20))
+
+        self.kosong = b(tk.Label, f, text="Belum ada riwayat", fg="fg", bg="frame")
+        self.style = self.tema.style("Riwayat.Treeview", background="card",
+                                     fieldbackground="card", foreground="fg")
+        self.daftar = None
+
+    @staticmethod
+    def values(baris):
+        tanggal, lari, total, target = baris
+        return (tanggal, lari, f"{total:.1f} km", f"{target:.1f} km" if target else "-")
+
+    def update(self, sumber, on_click, ulang=False):
+        # sumber(sebelum=None, sejak=None, n) -> ringkasan per tanggal, terbaru dulu.
+        # Hanya satu halaman yang dimuat; setelah itu cukup baris terbaru yang diperbarui.
+        # ulang=True memuat dari awal, untuk perubahan yang bisa mengenai tanggal lama (impor).
+        self.siap()
+        if self.daftar is None:
+            def muat(kursor, n):
+                baris = sumber(sebelum=kursor, n=n)
+                return [(r[0], self.values(r)) for r in baris], (baris[-1][0] if baris else kursor)
+
+            self.daftar = DaftarVirtual(self.frame, self.tema, self.KOLOM, muat, style=self.style)
+            self.on_click = on_click
+            self.daftar.tree.bind("<ButtonRelease-1>", self.klik)
+        elif ulang or not self.daftar.tree.get_children():
+            self.daftar.reset()
+        else:
+            teratas = self.daftar.tree.get_children()[0]
+            for r in reversed(sumber(sejak=teratas, n=DaftarVirtual.UKURAN_HALAMAN)):
+                self.daftar.perbarui(r[0], self.values(r))
+
+        if self.daftar.tree.get_children():
+            self.kosong.pack_forget()
+            self.daftar.frame.pack(fill="both", expand=True)
+        else:
+            self.daftar.frame.pack_forget()
+            self.kosong.pack()
+
+    def klik(self, event):
+        iid = self.daftar.tree.identify_row(event.y)
+        if iid:
+            self.on_click(iid)
@@ -0,0 +1,54 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from agregat import IndeksJarak
+
+AWAL = date(2023, 1, 1)
+
+
+def naif(data, dari, sampai):
+    return sum(km for t, km in data if dari <= t <= sampai)
+
+
+def test_kosong():
+    indeks = IndeksJarak()
+    assert indeks.jumlah("2024-01-01", "2024-12-31") == 0.0
+    assert indeks.rolling(7, "2024-01-07") == 0.0
+
+
+def test_jumlah_sama_dengan_naif():
+    rng = random.Random(3)
+    data = [(AWAL + timedelta(rng.randrange(400)), rng.uniform(1, 20)) for _ in range(500)]
+    indeks = IndeksJarak((t.isoformat(), km) for t, km in data[:250])
+    for t, km in data[250:]:
+        indeks.tambah(t, km)
+    for _ in range(200):
+        a = AWAL + timedelta(rng.randrange(-10, 420))
+        b = a + timedelta(rng.randrange(60))
+        assert indeks.jumlah(a, b) == pytest.approx(naif(data, a, b))
+
+
+def test_tambah_tanggal_lebih_lama_dan_jauh_ke_depan():
+    indeks = IndeksJarak([("2024-03-10", 5.0)])
+    indeks.tambah("2024-01-01", 2.0)
+    indeks.tambah("2025-06-01", 7.0)
+    assert indeks.jumlah("2024-01-01", "2024-01-01") == 2.0
+    assert indeks.jumlah("2023-01-01", "2025-12-31") == 14.0
+    assert indeks.tahun_berjalan("2025-06-30") == 7.0
+    assert indeks.bulan_berjalan("2024-03-31") == 5.0
+
+
+def test_rolling():
+    indeks = IndeksJarak([((AWAL + timedelta(i)).isoformat(), 1.0) for i in range(30)])
+    assert indeks.rolling(7, AWAL + timedelta(29)) == 7.0
+    assert indeks.rolling(7, AWAL + timedelta(2)) == 3.0
+
+
+def test_dari_array_memakai_pohon_yang_sama():
+    indeks = IndeksJarak([("2024-01-01", 3.0), ("2024-01-05", 4.0)])
+    salinan = IndeksJarak.dari_array(indeks.awal, indeks.nilai, indeks.pohon)
+    assert salinan.jumlah("2024-01-01", "2024-01-31") == 7.0
+    salinan.tambah("2024-01-06", 1.0)
+    assert salinan.rolling(2, "2024-01-06") == 5.0
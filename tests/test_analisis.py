@@ -0,0 +1,112 @@
+import csv
+import math
+from datetime import date
+
+import pytest
+
+import analisis
+from agregat import IndeksJarak
+from penyimpanan import RiwayatDB
+
+
+def test_validasi_angka_biasa():
+    assert analisis.validasi("5", "30", "60", "") == (5.0, 30.0, 60.0, None)
+    assert analisis.validasi("5", "30", "60", "10") == (5.0, 30.0, 60.0, 10.0)
+
+
+@pytest.mark.parametrize("nilai", [("nan", "30", "60", None), ("5", "inf", "60", None),
+                                   ("5", "30", "-inf", None), ("5", "30", "60", "nan"),
+                                   ("0", "30", "60", None), ("5", "30", "60", "-1")])
+def test_validasi_menolak(nilai):
+    with pytest.raises(ValueError):
+        analisis.validasi(*nilai)
+
+
+def test_hitung():
+    pace, speed, kal = analisis.hitung(5.0, 30.0, 60.0)
+    assert pace == 6.0
+    assert speed == 10.0
+    assert kal == pytest.approx(5 * 60 * analisis.FAKTOR_KALORI)
+
+
+def test_cli_melewati_baris_nan(tmp_path):
+    masuk = tmp_path / "lari.csv"
+    with open(masuk, "w", newline="") as f:
+        csv.writer(f).writerows([["tanggal", "jarak", "waktu", "berat", "target"],
+                                 ["2024-01-01", "5", "30", "60", "10"],
+                                 ["2024-01-01", "nan", "30", "60", ""],
+                                 ["2024-01-02", "3", "inf", "60", ""],
+                                 ["2024-01-02", "4", "24", "60", "nan"],
+                                 ["2024-01-02", "4", "24", "60", ""]])
+    keluar, db_path = tmp_path / "hasil.csv", str(tmp_path / "riwayat.db")
+    assert analisis.main([str(masuk), "-o", str(keluar), "--db", db_path]) == 0
+
+    with open(keluar, newline="") as f:
+        baris = list(csv.DictReader(f))
+    assert [b["jarak"] for b in baris] == ["5.0", "4.0"]
+    assert all(math.isfinite(float(b[k])) for b in baris for k in ("pace", "speed", "kal"))
+
+    db = RiwayatDB(db_path)
+    try:
+        assert db.total_jarak("2024-01-01") == 5.0
+        assert db.total_jarak("2024-01-02") == 4.0
+        assert db.target("2024-01-02") == 10.0
+    finally:
+        db.close()
+
+
+def test_cli_target_0_berarti_tanpa_target(tmp_path):
+    # Bentuk data_sintetis di benchmark: target hanya diisi sesekali, sisanya 0
+    masuk = tmp_path / "lari.csv"
+    with open(masuk, "w", newline="") as f:
+        csv.writer(f).writerows([["tanggal", "jarak", "waktu", "berat", "target"],
+                                 ["2024-01-01", "5", "30", "60", "10.0"],
+                                 ["2024-01-01", "3", "18", "60", "0.0"],
+                                 ["2024-01-02", "4", "24", "60", "0"],
+                                 ["2024-01-03", "4", "24", "60", "-5"]])
+    harian, db_path = tmp_path / "harian.csv", str(tmp_path / "riwayat.db")
+    assert analisis.main([str(masuk), "--harian", str(harian), "--db", db_path]) == 0
+
+    with open(harian, newline="") as f:
+        baris = list(csv.DictReader(f))
+    assert [(b["tanggal"], float(b["total"]), float(b["target"])) for b in baris] == [
+        ("2024-01-01", 8.0, 10.0), ("2024-01-02", 4.0, 10.0)]
+
+    db = RiwayatDB(db_path)
+    try:
+        assert db.total_jarak("2024-01-01") == 8.0
+        assert db.target("2024-01-02") == 10.0
+        assert db.total_jarak("2024-01-03") == 0
+    finally:
+        db.close()
+
+
+def test_cli_satu_baris_target_0(tmp_path):
+    masuk = tmp_path / "lari.csv"
+    masuk.write_text("tanggal,jarak,waktu,berat,target\n2024-01-01,5,30,60,0\n")
+    data, dilewati = analisis.baca_csv(str(masuk))
+    assert dilewati == 0
+    assert list(data["jarak"]) == [5.0]
+    assert list(data["target"]) == [0.0]
+
+
+def test_cli_melewati_tanggal_tidak_valid(tmp_path):
+    masuk = tmp_path / "lari.csv"
+    with open(masuk, "w", newline="") as f:
+        csv.writer(f).writerows([["tanggal", "jarak", "waktu", "berat"],
+                                 ["01/02/2024", "5", "30", "60"],
+                                 ["", "5", "30", "60"],
+                                 ["2024-02-30", "5", "30", "60"],
+                                 [" 2024-01-02 ", "4", "24", "60"]])
+    data, dilewati = analisis.baca_csv(str(masuk))
+    assert dilewati == 3
+    assert data["tanggal"] == ["2024-01-02"]
+
+    db_path = str(tmp_path / "riwayat.db")
+    assert analisis.main([str(masuk), "--db", db_path]) == 0
+    db = RiwayatDB(db_path)
+    try:
+        # Sama seperti RunningApp.__init__: semua tanggal di database harus bisa dibaca
+        assert IndeksJarak(db.total_per_tanggal()).jumlah(date(2024, 1, 2), date(2024, 1, 2)) == 4.0
+    finally:
+        db.close()
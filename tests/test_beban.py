@@ -0,0 +1,96 @@
+from datetime import date, timedelta
+
+import pytest
+
+import beban
+from beban import ModelBeban, kondisi, skor_beban
+from penyimpanan import RiwayatDB
+
+HARI = date(2024, 3, 4)  # Senin
+
+
+def menit(baris):
+    return int(baris[1].split()[0])
+
+
+def test_skor_beban_satu_jam_di_ambang():
+    assert skor_beban(60, beban.PACE_AMBANG) == pytest.approx(100)
+    assert skor_beban(60, beban.PACE_AMBANG * 2) == pytest.approx(25)
+
+
+def test_peluruhan():
+    model = ModelBeban()
+    model.tambah("ani", HARI, 60, beban.PACE_AMBANG)
+    atl, ctl, tsb = model.status("ani", HARI)
+    assert atl == pytest.approx(100 * (1 - beban.K_ATL))
+    assert ctl == pytest.approx(100 * (1 - beban.K_CTL))
+    assert tsb == pytest.approx(ctl - atl)
+
+    atl10, ctl10, _ = model.status("ani", HARI + timedelta(10))
+    assert atl10 == pytest.approx(atl * beban.K_ATL ** 10)
+    assert ctl10 == pytest.approx(ctl * beban.K_CTL ** 10)
+    # status() tidak mengubah model, tanggal sebelum status tidak meluruhkan
+    assert model.status("ani", HARI - timedelta(3)) == (atl, ctl, tsb)
+    assert model.status("budi") == (0.0, 0.0, 0.0)
+
+
+def test_impor_mundur_sama_dengan_urutan_kronologis():
+    lari = [(HARI + timedelta(i * 3 % 17), 30 + i, 5.0 + i % 3 * 0.5) for i in range(20)]
+    urut, acak = ModelBeban(), ModelBeban()
+    for t, w, p in sorted(lari):
+        urut.tambah("ani", t, w, p)
+    for t, w, p in lari:
+        acak.tambah("ani", t, w, p)
+    sampai = HARI + timedelta(30)
+    assert acak.status("ani", sampai) == pytest.approx(urut.status("ani", sampai))
+
+
+def test_checkpoint_hanya_memutar_lari_baru(tmp_path):
+    db = RiwayatDB(str(tmp_path / "riwayat.db"))
+    try:
+        def simpan(i):
+            t = (HARI + timedelta(i)).isoformat()
+            return db.simpan_lari(t, {"time": "07:00", "jarak": 5.0, "waktu": 30.0 + i, "pace": 6.0,
+                                      "speed": 10.0, "kal": 300.0, "target": 0.0})
+
+        for i in range(10):
+            simpan(i)
+        model = ModelBeban()
+        model.perbarui_dari_db(db, "ani")
+        assert model.id_terakhir == db.id_terakhir()
+
+        # Checkpoint (seperti snapshot) lalu lari baru: hanya lari baru yang diputar ulang
+        checkpoint = ModelBeban.dari_dict(model.ke_dict())
+        for i in range(10, 15):
+            simpan(i)
+        checkpoint.perbarui_dari_db(db, "ani")
+        checkpoint.perbarui_dari_db(db, "ani")  # tanpa lari baru: tidak berubah
+
+        penuh = ModelBeban()
+        penuh.perbarui_dari_db(db, "ani")
+        assert checkpoint.id_terakhir == penuh.id_terakhir == db.id_terakhir()
+        assert checkpoint.status("ani", HARI + timedelta(20)) == pytest.approx(
+            penuh.status("ani", HARI + timedelta(20)))
+    finally:
+        db.close()
+
+
+def test_rencana_dasar_saat_riwayat_sedikit():
+    assert ModelBeban().rencana("ani", HARI) == beban.JADWAL_DASAR
+
+
+@pytest.mark.parametrize("ctl", [20.0, 60.0, 120.0])
+def test_rencana_kelelahan_tidak_lebih_lama(ctl):
+    o = HARI.toordinal()
+    lelah = ModelBeban({"ani": [o, ctl + 40, ctl]})
+    optimal = ModelBeban({"ani": [o, ctl, ctl]})
+    assert kondisi(lelah.status("ani", HARI)[2])[0] == "Kelelahan"
+    assert kondisi(optimal.status("ani", HARI)[2])[0] == "Optimal"
+
+    rencana = lelah.rencana("ani", HARI)
+    biasa = optimal.rencana("ani", HARI)
+    assert [r[0] for r in rencana] == ["Lari Ringan", "Lari Ringan", "Recovery", "Long Run",
+                                       "Cross Training", "Lari Ringan", "Rest Day"]
+    assert rencana[1][2] == rencana[5][2] == "Pemulihan aktif"
+    for r, b in zip(rencana[:-1], biasa[:-1]):
+        assert menit(r) <= menit(b), (r, b)
@@ -0,0 +1,146 @@
+import math
+import threading
+
+import pytest
+
+import ekspor
+import rekaman
+from penyimpanan import RiwayatDB
+
+RUNS = [
+    ("2024-01-01", "06:30", 5.0, 30.0, 6.0, 10.0, 350.0, 10.0),
+    ("2024-01-02", "07:00", 3.0, 21.0, 7.0, 8.571428571428571, 210.0, 10.0),
+    ("2024-01-02", "18:45", 4.0, 22.0, 5.5, 10.909090909090908, 280.0, 10.0),
+    ("2024-01-03", "06:00", 8.0, 44.0, 5.5, 10.909090909090908, 560.0, 10.0),
+    ("2024-01-04", "06:00", 2.0, 14.0, 7.0, 8.571428571428571, 140.0, 0.0),
+    ("2023-12-31", "23:59", 1.5, 9.0, 6.0, 10.0, 105.0, 12.5),
+]
+
+
+@pytest.fixture
+def sumber(tmp_path):
+    db = RiwayatDB(str(tmp_path / "sumber.db"))
+    db.tambah_banyak(RUNS, [("2024-01-01", 10.0), ("2024-01-02", 10.0), ("2024-01-03", 10.0),
+                            ("2023-12-31", 12.5)])
+    yield db
+    db.close()
+
+
+def isi(db):
+    runs = db.conn.execute("SELECT tanggal, time, jarak, waktu, pace, speed, kal, target"
+                           " FROM runs ORDER BY id").fetchall()
+    return (runs, db.conn.execute("SELECT * FROM harian ORDER BY tanggal").fetchall(),
+            db.conn.execute("SELECT * FROM targets ORDER BY tanggal").fetchall())
+
+
+@pytest.mark.parametrize("akhiran", [".csv", ".jsonl", ".rac"])
+def test_round_trip(tmp_path, sumber, akhiran):
+    path = str(tmp_path / f"riwayat{akhiran}")
+    assert ekspor.ekspor(sumber, path, potongan=2) == len(RUNS)
+    assert ekspor.cocok(path)
+    tujuan = RiwayatDB(str(tmp_path / "tujuan.db"))
+    try:
+        assert ekspor.impor(path, tujuan, potongan=4) == len(RUNS)
+        assert isi(tujuan) == isi(sumber)
+        # target per hari tidak hilang walau nilainya sama dengan hari sebelumnya
+        assert [tujuan.target(t) for t in ("2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04")] == \
+            [10.0, 10.0, 10.0, None]
+    finally:
+        tujuan.close()
+
+
+def test_kolom_bisa_dibaca_langsung(tmp_path, sumber):
+    path = str(tmp_path / "riwayat.rac")
+    ekspor.ekspor(sumber, path)
+    kolom = ekspor.baca_kolom(path)
+    assert list(kolom) == ekspor.KOLOM_LARI
+    assert list(kolom["jarak"]) == [r[2] for r in RUNS]
+    assert kolom["time"][1] == 7 * 60
+
+
+def test_ekspor_harian(tmp_path, sumber):
+    path = str(tmp_path / "harian.rac")
+    assert ekspor.ekspor(sumber, path, "harian") == 5
+    kolom = ekspor.baca_kolom(path)
+    assert list(kolom["total"]) == [1.5, 5.0, 7.0, 8.0, 2.0]
+    assert math.isnan(kolom["target"][-1])
+
+
+def test_csv_input_analisis_bukan_hasil_ekspor(tmp_path):
+    path = tmp_path / "input.csv"
+    path.write_text("tanggal,jarak,waktu,berat\n2024-01-01,5,30,60\n")
+    assert not ekspor.cocok(str(path))
+
+
+def test_batal_tidak_meninggalkan_apa_pun(tmp_path, sumber):
+    batal = threading.Event()
+    batal.set()
+    path = str(tmp_path / "riwayat.csv")
+    assert ekspor.ekspor(sumber, path, batal=batal) == 0
+    assert not (tmp_path / "riwayat.csv").exists()
+
+    ekspor.ekspor(sumber, path)
+    tujuan = RiwayatDB(str(tmp_path / "tujuan.db"))
+    try:
+        assert ekspor.impor(path, tujuan, batal=batal) == 0
+        assert tujuan.kosong()
+        assert tujuan.target_terakhir() is None
+    finally:
+        tujuan.close()
+
+
+def test_csv_spreadsheet_dinormalkan(tmp_path):
+    # Disimpan ulang lewat spreadsheet: jam jadi HH:MM:SS, spasi di tanggal, target kosong
+    path = tmp_path / "riwayat.csv"
+    path.write_text(",".join(ekspor.KOLOM_LARI) + "\n"
+                    "2024-01-02 ,07:00:00,5,30,6,10,300,10\n"
+                    "2024-01-02,7:05,3,18,6,10,180,\n")
+    tujuan = RiwayatDB(str(tmp_path / "tujuan.db"))
+    try:
+        assert ekspor.impor(str(path), tujuan) == 2
+        assert [r[:3] for r in isi(tujuan)[0]] == [("2024-01-02", "07:00", 5.0), ("2024-01-02", "07:05", 3.0)]
+        # Cache riwayat GUI bisa memuat tanggal ini
+        riwayat = rekaman.Riwayat(tujuan.lari)
+        assert [(x.time, x.target) for x in riwayat["2024-01-02"]] == [("07:00", 10.0), ("07:05", 0.0)]
+    finally:
+        tujuan.close()
+
+
+@pytest.mark.parametrize("baris", ["1/2/2024,07:00,5,30,6,10,300,10", ",07:00,5,30,6,10,300,10",
+                                   "2024-01-02,25:00,5,30,6,10,300,10", "2024-01-02,07:00,nan,30,6,10,300,10",
+                                   "2024-01-02,07:00,5,0,6,10,300,10", "2024-01-02,07:00,5,30,6,10,300",
+                                   "2024-01-02,07:00,5,30,6,10,300,-1"])
+def test_csv_baris_tidak_valid_ditolak(tmp_path, baris):
+    path = tmp_path / "riwayat.csv"
+    path.write_text(",".join(ekspor.KOLOM_LARI) + "\n2024-01-01,06:00,5,30,6,10,300,10\n" + baris + "\n")
+    tujuan = RiwayatDB(str(tmp_path / "tujuan.db"))
+    try:
+        with pytest.raises(ValueError, match="baris 3"):
+            ekspor.impor(str(path), tujuan)
+        # satu transaksi: baris yang valid juga tidak tersimpan
+        assert tujuan.kosong()
+    finally:
+        tujuan.close()
+
+
+def test_jsonl_target_null_dan_baris_kosong(tmp_path):
+    path = tmp_path / "riwayat.jsonl"
+    path.write_text('{"tanggal": "2024-01-02", "time": "07:00:30", "jarak": 5, "waktu": 30, "pace": 6,'
+                    ' "speed": 10, "kal": 300, "target": null}\n\n')
+    tujuan = RiwayatDB(str(tmp_path / "tujuan.db"))
+    try:
+        assert ekspor.impor(str(path), tujuan) == 1
+        assert isi(tujuan)[0] == [("2024-01-02", "07:00", 5.0, 30.0, 6.0, 10.0, 300.0, 0.0)]
+        path.write_text('{"tanggal": "2024-01-02", "time": "07:00"}\n')
+        with pytest.raises(ValueError, match="baris 1"):
+            ekspor.impor(str(path), tujuan)
+    finally:
+        tujuan.close()
+
+
+def test_ke_menit_sama_dengan_ekspor():
+    assert rekaman.ke_menit("07:05") == rekaman.ke_menit("07:05:59") == 425
+    assert rekaman.ke_jam(425) == "07:05"
+    for jam in ("24:00", "07:60", "7", "07:-1"):
+        with pytest.raises(ValueError):
+            rekaman.ke_menit(jam)
@@ -0,0 +1,46 @@
+import math
+import random
+
+from grafik import MAKS_LEVEL, Piramida, SeriHarian, lttb
+
+
+def test_lttb_menjaga_ujung_dan_puncak():
+    x = list(range(1000))
+    y = [math.sin(i / 50) for i in x]
+    y[500] = 10.0
+    hx, hy = lttb(x, y, 50)
+    assert len(hx) == len(hy) == 50
+    assert (hx[0], hx[-1]) == (0, 999)
+    assert hx == sorted(hx)
+    assert 10.0 in hy
+
+
+def test_lttb_tanpa_penipisan():
+    assert lttb([1, 2, 3], [4, 5, 6], 10) == ([1, 2, 3], [4, 5, 6])
+
+
+def test_piramida_memilih_level_sesuai_rentang():
+    rng = random.Random(1)
+    n = 10_000
+    x = [float(i) for i in range(n)]
+    y = [rng.random() for _ in range(n)]
+    p = Piramida(x, y)
+    assert len(p.level[-1][0]) <= MAKS_LEVEL
+    semua_x, _ = p.ambil(0, n, 300)
+    assert len(semua_x) == 300
+    # rentang sempit dijawab dari level asli
+    dekat_x, dekat_y = p.ambil(100, 150, 300)
+    assert dekat_x[1:-1] == x[100:151]
+    assert dekat_y[1:-1] == y[100:151]
+
+
+def test_seri_harian_target_berlaku_dan_tambah():
+    seri = SeriHarian([("2024-01-01", 5.0, 30.0, 300.0, 10.0),
+                       ("2024-01-03", 3.0, 20.0, 200.0, None),
+                       ("2024-01-05", 4.0, 24.0, 250.0, 12.0)])
+    assert list(seri.target) == [10.0, 10.0, 12.0]
+    seri.tambah("2024-01-03", 2.0, 10.0, 100.0, 10.0)
+    seri.tambah("2024-01-02", 1.0, 6.0, 60.0, 10.0)
+    assert len(seri) == 4
+    assert list(seri.jarak) == [5.0, 1.0, 5.0, 4.0]
+    assert seri.piramida()["pace"].ambil(0, 10**7)[1][0] == 6.0
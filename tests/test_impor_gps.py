@@ -0,0 +1,114 @@
+import math
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import analisis
+import impor_gps
+from penyimpanan import RiwayatDB
+
+MULAI = datetime(2024, 3, 1, 6, 0, tzinfo=timezone.utc)
+DERAJAT = impor_gps.R_BUMI * math.pi / 180  # meter per derajat lintang
+
+
+@pytest.fixture(params=["numpy", "tanpa-numpy"])
+def np_mode(request, monkeypatch):
+    if request.param == "numpy":
+        if impor_gps.np is None:
+            pytest.skip("numpy tidak terpasang")
+    else:
+        monkeypatch.setattr(impor_gps, "np", None)
+        monkeypatch.setattr(analisis, "np", None)
+    return request.param
+
+
+def lintasan():
+    # Garis lurus ke utara: 10 m tiap 5 detik (2 m/s), berhenti 60 detik di meter 500, total 3.5 km
+    titik, t = [], 0
+    for i in range(351):
+        titik.append((i * 10 / DERAJAT, 0.0, t))
+        if i == 50:
+            t += 60
+            titik.append((i * 10 / DERAJAT, 0.0, t))
+        t += 5
+    return titik
+
+
+def jam(detik):
+    return (MULAI + timedelta(seconds=detik)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def tulis_gpx(path, titik):
+    isi = "".join(f'<trkpt lat="{a!r}" lon="{o!r}"><ele>5</ele><time>{jam(t)}</time></trkpt>'
+                  for a, o, t in titik)
+    path.write_text('<?xml version="1.0"?><gpx xmlns="http://www.topografix.com/GPX/1/1" version="1.1">'
+                    f"<trk><trkseg>{isi}</trkseg></trk></gpx>")
+    return str(path)
+
+
+def tulis_tcx(path, titik):
+    isi = "".join(f"<Trackpoint><Time>{jam(t)}</Time><Position><LatitudeDegrees>{a!r}</LatitudeDegrees>"
+                  f"<LongitudeDegrees>{o!r}</LongitudeDegrees></Position></Trackpoint>"
+                  for a, o, t in titik)
+    path.write_text('<?xml version="1.0"?><TrainingCenterDatabase'
+                    ' xmlns="http://www.garmin.com/xmlschemas/TrainingCenterDatabase/v2">'
+                    f"<Activities><Activity><Lap><Track>{isi}</Track></Lap></Activity></Activities>"
+                    "</TrainingCenterDatabase>")
+    return str(path)
+
+
+def test_haversine(np_mode):
+    d = impor_gps.haversine([0.0, 0.0, 10.0], [0.0, 0.0, 20.0], [1.0, 0.0, 10.0], [0.0, 90.0, 20.0])
+    assert list(d) == pytest.approx([DERAJAT, impor_gps.R_BUMI * math.pi / 2, 0.0])
+
+
+@pytest.mark.parametrize("blok", [2, 3, 7, 100, 8192])
+def test_track_lintas_blok(tmp_path, monkeypatch, np_mode, blok):
+    # Blok kecil memaksa titik terakhir disambung ke blok berikutnya dan split km melintasi batas blok
+    monkeypatch.setattr(impor_gps, "UKURAN_BLOK", blok)
+    titik = lintasan()
+    tr = impor_gps.baca_track(tulis_gpx(tmp_path / "lari.gpx", titik))
+    assert tr["titik"] == len(titik)
+    assert tr["jarak"] == pytest.approx(3.5)
+    # berhenti 60 detik tidak dihitung sebagai moving time
+    assert tr["waktu"] == pytest.approx(3500 / 2 / 60)
+    assert tr["splits"] == pytest.approx([560, 500, 500])
+    assert tr["mulai"] == MULAI
+
+
+def test_gpx_dan_tcx_sama(tmp_path, np_mode):
+    titik = lintasan()
+    gpx = impor_gps.baca_track(tulis_gpx(tmp_path / "lari.gpx", titik))
+    tcx = impor_gps.baca_track(tulis_tcx(tmp_path / "lari.tcx", titik))
+    assert tcx.pop("mulai") == gpx.pop("mulai") == MULAI
+    assert tcx == pytest.approx(gpx)
+    kedua = list(impor_gps.baca_titik(str(tmp_path / "lari.tcx")))[1]
+    assert kedua == (10 / DERAJAT, 0.0, MULAI + timedelta(seconds=5))
+
+
+def test_impor_folder_ke_db(tmp_path, np_mode):
+    folder = tmp_path / "gps"
+    folder.mkdir()
+    titik = lintasan()
+    tulis_gpx(folder / "a.gpx", titik)
+    tulis_tcx(folder / "b.tcx", titik[:101])
+    tulis_gpx(folder / "kosong.gpx", [])
+    (folder / "rusak.gpx").write_text("<gpx><trk>")
+    (folder / "catatan.txt").write_text("bukan track")
+
+    db = RiwayatDB(str(tmp_path / "riwayat.db"))
+    try:
+        tracks, gagal, _ = impor_gps.impor([str(folder)], 60.0, db)
+        assert [t["jarak"] for t in tracks] == pytest.approx([3.5, 0.99])
+        assert sorted(os.path.basename(p) for p, _ in gagal) == ["kosong.gpx", "rusak.gpx"]
+        a = tracks[0]
+        assert a["pace"] == pytest.approx(a["waktu"] / 3.5)
+        assert a["kal"] == pytest.approx(3.5 * 60 * analisis.FAKTOR_KALORI)
+
+        lokal = MULAI.astimezone()
+        rows = db.lari(lokal.strftime("%Y-%m-%d")).fetchall()
+        assert len(rows) == 2
+        assert rows[0][0] == lokal.strftime("%H:%M")
+    finally:
+        db.close()
@@ -0,0 +1,33 @@
+import pytest
+
+import nutrisi
+
+
+def test_menu_mendekati_kebutuhan():
+    hasil = nutrisi.rencana(600, 70)
+    kkal, protein, karbo = hasil["total"]
+    target = hasil["target"]
+    assert target == nutrisi.kebutuhan(600, 70)
+    assert target[0] * 0.8 <= kkal <= target[0] * nutrisi.BATAS_KAL
+    assert abs(karbo - target[2]) / target[2] < 0.3
+    assert abs(protein - target[1]) / target[1] < 0.3
+    assert sum(m[3] for m in hasil["menu"]) == pytest.approx(kkal)
+    for nama, _, jumlah, *_ in hasil["menu"]:
+        maks = next(m[5] for m in nutrisi.MAKANAN if m[0] == nama)
+        assert 1 <= jumlah <= maks
+
+
+@pytest.mark.parametrize("kkal", [1, 50, 60])
+def test_pembakaran_kecil_tetap_ada_menu(kkal):
+    menu = nutrisi.rencana(kkal, 70)["menu"]
+    assert len(menu) == 1
+    terkecil = min(nutrisi.MAKANAN, key=lambda m: m[2])
+    assert (menu[0][0], menu[0][2]) == (terkecil[0], 1)
+
+
+def test_cache_per_bucket():
+    nutrisi._rencana.cache_clear()
+    nutrisi.rencana(612, 71)
+    nutrisi.rencana(590, 69)
+    info = nutrisi._rencana.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
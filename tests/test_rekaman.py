@@ -0,0 +1,75 @@
+from penyimpanan import RiwayatDB
+from rekaman import Riwayat, ke_jam, ke_menit
+
+
+def isi(tmp_path):
+    db = RiwayatDB(str(tmp_path / "riwayat.db"))
+    db.tambah_banyak([
+        ("2024-01-01", "06:30", 5.0, 30.0, 6.0, 10.0, 350.0, 10.0),
+        ("2024-01-01", "18:00", 3.0, 21.0, 7.0, 8.6, 210.0, 10.0),
+        ("2024-01-02", "07:15", 10.0, 55.0, 5.5, 10.9, 700.0, 0.0),
+    ])
+    return db
+
+
+def test_jam():
+    assert ke_menit("07:05") == 425
+    assert ke_jam(425) == "07:05"
+
+
+def test_muat_per_tanggal(tmp_path):
+    db = isi(tmp_path)
+    riwayat = Riwayat(db.lari)
+    assert "2024-01-01" not in riwayat
+    hari = riwayat["2024-01-01"]
+    assert "2024-01-01" in riwayat
+    assert len(hari) == 2
+    assert hari.total() == 8.0
+    baris = list(hari)
+    assert [b.time for b in baris] == ["06:30", "18:00"]
+    assert [b.total_jarak_harian for b in baris] == [5.0, 8.0]
+    assert baris[1]["pace"] == 7.0
+    assert len(riwayat["2024-01-03"]) == 0
+    db.close()
+
+
+def test_halaman_dan_total_kumulatif(tmp_path):
+    db = isi(tmp_path)
+    hari = Riwayat(db.lari)["2024-01-01"]
+    (kedua,) = hari.baris(1, 10)
+    assert kedua.jarak == 3.0
+    assert kedua.total_jarak_harian == 8.0
+    assert list(hari.baris(2, 10)) == []
+    db.close()
+
+
+def test_tambah_memindah_blok_dan_memadatkan(tmp_path):
+    db = isi(tmp_path)
+    riwayat = Riwayat(db.lari)
+    riwayat["2024-01-01"]
+    riwayat["2024-01-02"]
+    riwayat.tambah("2024-01-01", "20:00", 2.0, 12.0, 100.0, 10.0)
+    assert [b.jarak for b in riwayat["2024-01-01"]] == [5.0, 3.0, 2.0]
+    assert [b.jarak for b in riwayat["2024-01-02"]] == [10.0]
+    for _ in range(5):
+        riwayat.tambah("2024-01-02", "21:00", 1.0, 6.0, 50.0, 0.0)
+        riwayat.tambah("2024-01-01", "21:00", 1.0, 6.0, 50.0, 0.0)
+    assert riwayat["2024-01-01"].total() == 15.0
+    assert riwayat["2024-01-02"].total() == 15.0
+    assert len(riwayat) == 14
+    assert len(riwayat.jarak) <= 2 * len(riwayat)
+    db.close()
+
+
+def test_buang(tmp_path):
+    db = isi(tmp_path)
+    riwayat = Riwayat(db.lari)
+    riwayat["2024-01-01"]
+    riwayat.tambah("2024-01-01", "20:00", 2.0, 12.0, 100.0, 10.0)
+    riwayat.buang("2024-01-01")
+    assert "2024-01-01" not in riwayat
+    # dimuat ulang dari database, yang tidak berisi lari tambahan di atas
+    assert riwayat["2024-01-01"].total() == 8.0
+    riwayat.buang()
+    assert len(riwayat) == 0
+    db.close()
@@ -0,0 +1,84 @@
+import json
+import random
+
+import pytest
+
+from penyimpanan import RiwayatDB
+from rekor import KLL, IndeksRekor, format_durasi
+
+
+def test_kll_rank_dan_kuantil():
+    rng = random.Random(1)
+    data = [rng.gauss(6.0, 0.8) for _ in range(50_000)]
+    sketsa = KLL(seed=2)
+    for x in data:
+        sketsa.tambah(x)
+    urut = sorted(data)
+    assert sketsa._ukuran() < 1000
+    for q in (0.05, 0.25, 0.5, 0.75, 0.95):
+        x = urut[int(q * len(urut))]
+        assert abs(sketsa.rank(x) - q) < 0.02
+        assert abs(urut.index(sketsa.kuantil(q)) / len(urut) - q) < 0.02
+
+
+def test_kll_gabung():
+    rng = random.Random(3)
+    a, b = KLL(seed=4), KLL(seed=5)
+    for _ in range(20_000):
+        a.tambah(rng.uniform(0, 1))
+        b.tambah(rng.uniform(1, 2))
+    a.gabung(b)
+    assert a.n == 40_000
+    assert abs(a.rank(1.0) - 0.5) < 0.02
+    assert abs(a.kuantil(0.75) - 1.5) < 0.05
+
+
+def test_kll_dict_json():
+    sketsa = KLL(seed=6)
+    for i in range(5000):
+        sketsa.tambah(i)
+    salinan = KLL.dari_dict(json.loads(json.dumps(sketsa.ke_dict())))
+    assert salinan.n == sketsa.n
+    assert salinan.rank(2500) == sketsa.rank(2500)
+
+
+def test_rekor_per_kategori_dan_bulan():
+    rekor = IndeksRekor()
+    rekor.tambah("2024-05-01", 5.0, 30.0, 1)   # pace 6
+    rekor.tambah("2024-05-03", 10.0, 50.0, 2)  # pace 5
+    rekor.tambah("2024-05-04", 0.5, 2.0, 3)    # terlalu pendek untuk 1 km
+    assert [t for _, t in rekor.tercepat("1 km")] == ["2024-05-03", "2024-05-01"]
+    assert rekor.tercepat("5 km")[0] == (pytest.approx(25 * 60), "2024-05-03")
+    assert [t for _, t in rekor.tercepat("10 km")] == ["2024-05-03"]
+    assert rekor.tercepat("Marathon") == []
+    assert rekor.terbaik_bulan("2024-05-20") == [4.0, "2024-05-04"]
+    assert rekor.id_terakhir == 3
+
+
+def test_rekor_hanya_menyimpan_top_k():
+    rekor = IndeksRekor()
+    for i in range(20):
+        rekor.tambah(f"2024-01-{i + 1:02d}", 5.0, 20.0 + i)
+    tercepat = rekor.tercepat("5 km")
+    assert len(tercepat) == 5
+    assert tercepat[0][1] == "2024-01-01"
+
+
+def test_rekor_perbarui_dari_db(tmp_path):
+    db = RiwayatDB(str(tmp_path / "riwayat.db"))
+    db.tambah_banyak([("2024-01-01", "07:00", 5.0, 30.0, 6.0, 10.0, 300.0, 0.0),
+                      ("2024-01-02", "07:00", 5.0, 25.0, 5.0, 12.0, 300.0, 0.0)])
+    rekor = IndeksRekor.dari_dict(json.loads(json.dumps(IndeksRekor().ke_dict())))
+    rekor.perbarui_dari_db(db)
+    assert rekor.id_terakhir == 2
+    assert rekor.tercepat("5 km")[0][1] == "2024-01-02"
+    db.tambah_banyak([("2024-01-03", "07:00", 5.0, 20.0, 4.0, 15.0, 300.0, 0.0)])
+    rekor.perbarui_dari_db(db)
+    assert rekor.pace.n == 3
+    assert rekor.persentil_pace(4.5) == pytest.approx(200 / 3)
+    db.close()
+
+
+def test_format_durasi():
+    assert format_durasi(59.6) == "1:00"
+    assert format_durasi(3725) == "1:02:05"
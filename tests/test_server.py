@@ -0,0 +1,155 @@
+import asyncio
+import http.client
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import server
+
+LARI = {"jarak": 5, "waktu": 30, "berat": 60, "tanggal": "2024-03-01", "time": "07:00"}
+
+
+@pytest.fixture
+def api(tmp_path):
+    # Server asli di localhost (port bebas) pada thread sendiri
+    info, siap = {}, threading.Event()
+
+    def jalan():
+        loop = asyncio.new_event_loop()
+        app = server.Server(str(tmp_path))
+        srv = loop.run_until_complete(asyncio.start_server(app.layani, "127.0.0.1", 0))
+        info.update(loop=loop, app=app, port=srv.sockets[0].getsockname()[1])
+        siap.set()
+        loop.run_forever()
+        srv.close()
+        loop.run_until_complete(tutup_koneksi())
+        app.tutup()
+        loop.close()
+
+    async def tutup_koneksi():
+        tugas = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for t in tugas:
+            t.cancel()
+        await asyncio.gather(*tugas, return_exceptions=True)
+
+    t = threading.Thread(target=jalan, daemon=True)
+    t.start()
+    assert siap.wait(5)
+
+    def minta(metode, path, isi=None):
+        conn = http.client.HTTPConnection("127.0.0.1", info["port"], timeout=5)
+        try:
+            body = None if isi is None else (isi if isinstance(isi, str) else json.dumps(isi))
+            conn.request(metode, path, body=body)
+            r = conn.getresponse()
+            return r.status, json.loads(r.read())
+        finally:
+            conn.close()
+
+    minta.port = info["port"]
+    yield minta
+    info["loop"].call_soon_threadsafe(info["loop"].stop)
+    t.join(5)
+
+
+def test_lari_riwayat_dan_progres(api):
+    status, isi = api("POST", "/atlet/ani/lari", {**LARI, "target": 10})
+    assert status == 200
+    assert (isi["pace"], isi["speed"], isi["target"]) == (6.0, 10.0, 10.0)
+    assert isi["progres"]["sisa"] == 5.0
+
+    status, isi = api("POST", "/atlet/ani/lari/batch", [{**LARI, "time": "18:30"},
+                                                        {**LARI, "tanggal": "2024-03-02"}])
+    assert status == 200
+    # target terakhir dibawa ke lari berikutnya dan ke tanggal baru
+    assert [x["target"] for x in isi] == [10.0, 10.0]
+
+    status, isi = api("GET", "/atlet/ani/riwayat?n=10")
+    assert status == 200
+    assert [(x["tanggal"], x["lari"], x["total"], x["target"]) for x in isi] == [
+        ("2024-03-02", 1, 5.0, 10.0), ("2024-03-01", 2, 10.0, 10.0)]
+
+    status, isi = api("GET", "/atlet/ani/progres?tanggal=2024-03-01")
+    assert (status, isi["persen"]) == (200, 100.0)
+
+    # atlet lain memakai database sendiri
+    status, isi = api("GET", "/atlet/budi/riwayat")
+    assert (status, isi) == (200, [])
+
+
+@pytest.mark.parametrize("ubah", [{"jarak": "nan"}, {"waktu": "inf"}, {"berat": -60}, {"target": "nan"},
+                                  {"time": "bukan-jam"}, {"time": "25:00"}, {"time": 700},
+                                  {"tanggal": "2024-13-01"}, {"jarak": None}])
+def test_input_tidak_valid_400(api, ubah):
+    status, isi = api("POST", "/atlet/ani/lari", {**LARI, **ubah})
+    assert status == 400, isi
+    assert api("GET", "/atlet/ani/riwayat")[1] == []
+
+
+def test_batch_ditolak_tidak_mengubah_target(api):
+    status, _ = api("POST", "/atlet/ani/lari/batch", [{**LARI, "target": 20}, {**LARI, "jarak": "nan"}])
+    assert status == 400
+    status, isi = api("POST", "/atlet/ani/lari", {**LARI, "tanggal": "2024-03-02"})
+    assert (status, isi["target"]) == (200, 0)
+    assert api("GET", "/atlet/ani/riwayat")[1] == [
+        {"tanggal": "2024-03-02", "lari": 1, "total": 5.0, "target": None}]
+
+
+def test_batch_target_berurutan(api):
+    # Target hari itu yang ditulis lari sebelumnya di batch yang sama ikut berlaku
+    api("POST", "/atlet/ani/lari", {**LARI, "target": 10})
+    status, isi = api("POST", "/atlet/ani/lari/batch", [{**LARI, "target": 20}, LARI,
+                                                        {**LARI, "tanggal": "2024-03-02"}])
+    assert status == 200
+    assert [x["target"] for x in isi] == [20.0, 20.0, 20.0]
+    assert api("GET", "/atlet/ani/progres?tanggal=2024-03-02")[1]["target"] == 20.0
+
+
+def test_rute_dan_metode(api):
+    assert api("GET", "/atlet/ani/lari")[0] == 405
+    assert api("POST", "/atlet/ani/progres", {})[0] == 405
+    assert api("GET", "/lain")[0] == 404
+    assert api("POST", "/atlet/ani/lari", "{bukan json")[0] == 400
+    assert api("POST", "/atlet/ani/lari/batch", {})[0] == 400
+
+
+def test_content_length_negatif_400(api):
+    conn = http.client.HTTPConnection("127.0.0.1", api.port, timeout=5)
+    try:
+        conn.putrequest("POST", "/atlet/ani/lari")
+        conn.putheader("Content-Length", "-5")
+        conn.endheaders()
+        r = conn.getresponse()
+        assert (r.status, r.getheader("Connection")) == (400, "close")
+    finally:
+        conn.close()
+
+
+def test_kiriman_buruk_tidak_menggagalkan_yang_lain(api):
+    kiriman = [{**LARI, "jarak": 3}, {**LARI, "jarak": "nan"}, {**LARI, "jarak": 4}]
+    with ThreadPoolExecutor(3) as pool:
+        hasil = list(pool.map(lambda k: api("POST", "/atlet/ani/lari", k), kiriman))
+    assert [s for s, _ in hasil] == [200, 400, 200]
+    assert api("GET", "/atlet/ani/progres?tanggal=2024-03-01")[1]["total"] == 7.0
+
+
+def test_tulis_berkelompok_mengulang_per_kiriman(tmp_path):
+    # Kegagalan di tingkat database (lolos validasi) hanya mengenai kiriman itu sendiri
+    baik = ("2024-03-01", "07:00", 5.0, 30.0, 6.0, 10.0, 300.0, 0.0)
+    buruk = ("2024-03-01", "07:00", None, 30.0, 6.0, 10.0, 300.0, 0.0)
+
+    async def uji():
+        app = server.Server(str(tmp_path))
+        try:
+            return await asyncio.gather(app.kirim("ani", baik, 10.0), app.kirim("ani", buruk, None),
+                                        app.kirim("ani", baik, None), return_exceptions=True), \
+                app.db("ani").total_jarak("2024-03-01"), app.db("ani").target("2024-03-01")
+        finally:
+            app.tutup()
+
+    hasil, total, target = asyncio.run(uji())
+    assert hasil[0] is None and hasil[2] is None
+    assert isinstance(hasil[1], Exception)
+    assert (total, target) == (10.0, 10.0)
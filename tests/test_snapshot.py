@@ -0,0 +1,45 @@
+import snapshot
+from agregat import IndeksJarak
+from grafik import SeriHarian
+
+
+def buat(tmp_path, seri=True):
+    path = snapshot.path_snapshot(str(tmp_path / "riwayat.db"))
+    indeks = IndeksJarak([("2024-01-01", 5.0), ("2024-01-03", 7.0)])
+    s = SeriHarian([("2024-01-01", 5.0, 30.0, 300.0, 10.0), ("2024-01-03", 7.0, 40.0, 420.0, None)])
+    snapshot.tulis(path, 42, indeks, s if seri else None, 10.0)
+    return path
+
+
+def test_baca_ulang(tmp_path):
+    data = snapshot.baca(buat(tmp_path), 42)
+    assert data["indeks"].jumlah("2024-01-01", "2024-01-31") == 12.0
+    assert list(data["seri"].jarak) == [5.0, 7.0]
+    assert list(data["seri"].target) == [10.0, 10.0]
+    assert data["target"] == 10.0
+    data["indeks"].tambah("2024-01-04", 1.0)
+    assert data["indeks"].rolling(2, "2024-01-04") == 8.0
+
+
+def test_tanpa_seri(tmp_path):
+    data = snapshot.baca(buat(tmp_path, seri=False), 42)
+    assert data["seri"] is None
+    assert data["indeks"].jumlah("2024-01-01", "2024-01-01") == 5.0
+
+
+def test_ditolak_jika_basi_rusak_atau_tidak_ada(tmp_path):
+    path = buat(tmp_path)
+    # database sudah berisi lari yang tidak tercakup snapshot
+    assert snapshot.baca(path, 43) is None
+    with open(path, "r+b") as f:
+        f.truncate(snapshot.HEADER.size + 8)
+    assert snapshot.baca(path, 42) is None
+    assert snapshot.baca(str(tmp_path / "tidak-ada.snap"), 42) is None
+
+
+def test_indeks_kosong(tmp_path):
+    path = str(tmp_path / "kosong.snap")
+    snapshot.tulis(path, 0, IndeksJarak(), None, None)
+    data = snapshot.baca(path, 0)
+    assert data["target"] is None
+    assert data["indeks"].jumlah("2024-01-01", "2024-12-31") == 0.0